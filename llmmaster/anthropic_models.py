@@ -1,3 +1,5 @@
+import json
+
 from .config import ANTHROPIC_LLM_PARAMS
 from .config import ANTHROPIC_TTT_EP
 from .config import ANTHROPIC_VERSION_HEADER
@@ -49,6 +51,64 @@ class AnthropicLLM(LLMBase):
 
         return body
 
+    def _stream_delta(self, chunk: dict) -> str:
+        """
+        Text delta arrives in content_block_delta events.
+        """
+        if chunk.get("type") != "content_block_delta":
+            return ''
+        delta = chunk.get("delta") or {}
+        if delta.get("type") != "text_delta":
+            return ''
+        return delta.get("text", '')
+
+    def _stream_result(self, chunks: list) -> dict:
+        """
+        Assemble message events into the same form as Messages API:
+          - message_start: message without content
+          - content_block_start/delta: text, thinking and tool input
+          - message_delta: stop_reason and output usage
+        """
+        message = {}
+        blocks = {}
+        partial_json = {}
+
+        for chunk in chunks:
+            event = chunk.get("type")
+
+            if event == "message_start":
+                message = dict(chunk.get("message") or {})
+
+            elif event == "content_block_start":
+                blocks[chunk["index"]] = dict(chunk.get("content_block") or {})
+
+            elif event == "content_block_delta":
+                block = blocks.setdefault(chunk["index"], {})
+                delta = chunk.get("delta") or {}
+                if delta.get("type") == "input_json_delta":
+                    partial_json[chunk["index"]] = (
+                        partial_json.get(chunk["index"], '') +
+                        delta.get("partial_json", '')
+                    )
+                for key in ["text", "thinking", "signature"]:
+                    if key in delta:
+                        block[key] = block.get(key, '') + delta[key]
+
+            elif event == "message_delta":
+                message.update(chunk.get("delta") or {})
+                usage = message.setdefault("usage", {})
+                usage.update(chunk.get("usage") or {})
+
+        for index, buff in partial_json.items():
+            try:
+                blocks[index]["input"] = json.loads(buff) if buff else {}
+            except ValueError:
+                blocks[index]["input"] = buff
+
+        message["content"] = [blocks[index] for index in sorted(blocks)]
+
+        return message
+
     def _verify_arguments(self, **kwargs) -> dict:
         """
         Check required parameters:
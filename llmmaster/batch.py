@@ -0,0 +1,124 @@
+import base64
+import json
+import os
+
+from requests.models import Response
+
+from .config import BATCH_LABEL_FORMAT
+
+
+class JsonlSink:
+    """
+    Write results of LLMMaster.run_batch() to JSON Lines file,
+    one line {"label", "result", "metadata"} per entry in completion
+    order. Each line is flushed at once, so that finished results are
+    kept even if the batch stops halfway.
+    Binary results (e.g. audio) are written in base64.
+    mode: "a" to append to existing file, "w" to overwrite.
+    """
+
+    def __init__(self, path: str = '', mode: str = "a") -> None:
+        self.path = path
+        self._file = open(path, mode, encoding="utf-8")
+
+    def write(self, label: str = '', result: any = None,
+              metadata: dict = None) -> None:
+        line = json.dumps(
+            {"label": label, "result": result, "metadata": metadata},
+            ensure_ascii=False,
+            default=to_jsonable
+        )
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class CallbackSink:
+    """
+    Sink calling function(label, result, metadata) for each entry.
+    """
+
+    def __init__(self, function: any = None) -> None:
+        self.function = function
+
+    def write(self, label: str = '', result: any = None,
+              metadata: dict = None) -> None:
+        self.function(label, result, metadata)
+
+    def close(self) -> None:
+        pass
+
+
+def open_sink(sink: any = None) -> any:
+    """
+    Sink of run_batch() from one of:
+      - path to JSON Lines file: JsonlSink in append mode
+      - function(label, result, metadata): CallbackSink
+      - object with write(label, result, metadata) and close()
+      - None: results are dropped, e.g. when on_complete is enough
+    """
+    if sink is None:
+        return CallbackSink(lambda *args: None)
+    if isinstance(sink, (str, os.PathLike)):
+        return JsonlSink(sink)
+    if hasattr(sink, "write"):
+        return sink
+    if callable(sink):
+        return CallbackSink(sink)
+    raise ValueError(f"Unsupported sink: {sink}")
+
+
+def iter_entries(entries: any = None) -> any:
+    """
+    Yield (label, parameters) lazily from one of:
+      - path to JSON Lines file, one entry per line such as
+        {"label": "q1", "provider": "groq", "prompt": "..."}
+      - dictionary of label and parameters, same as summon()
+      - iterable of (label, parameters) or parameters with "label"
+    Entries without label are numbered, see BATCH_LABEL_FORMAT.
+    """
+    if isinstance(entries, (str, os.PathLike)):
+        yield from _iter_jsonl(entries)
+        return
+
+    if isinstance(entries, dict):
+        entries = entries.items()
+
+    for count, entry in enumerate(entries):
+        if isinstance(entry, tuple):
+            label, parameters = entry
+        else:
+            parameters = dict(entry)
+            label = parameters.pop("label", None)
+        yield (label if label else BATCH_LABEL_FORMAT.format(count),
+               parameters)
+
+
+def to_jsonable(value: any = None) -> any:
+    """
+    Convert result values unknown to json module.
+    """
+    if isinstance(value, Response):
+        try:
+            return value.json()
+        except ValueError:
+            value = value.content
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+def _iter_jsonl(path: str = '') -> any:
+    with open(path, "r", encoding="utf-8") as file:
+        count = 0
+        for line in file:
+            if not line.strip():
+                continue
+            parameters = json.loads(line)
+            label = parameters.pop("label", None)
+            yield (label if label else BATCH_LABEL_FORMAT.format(count),
+                   parameters)
+            count += 1
@@ -0,0 +1,288 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlparse
+from urllib.parse import urlunparse
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from .config import CACHE_MAX_BYTES
+from .config import CACHE_MAX_ENTRIES
+from .config import CACHE_TTL
+from .config import SECRET_HEADERS
+from .config import SECRET_QUERY_KEYS
+
+
+class ResponseCache:
+    """
+    Cache of successful responses keyed by canonical request hash,
+    so that identical calls (e.g. rerun of eval suites) need no network.
+    Two tiers:
+      - memory: LRU of max_entries responses
+      - disk: one file per response under path, None for memory only
+    Arguments:
+      - path: directory of disk tier
+      - max_entries: responses kept in memory
+      - max_bytes: total size of disk tier, oldest used files go first
+      - ttl: seconds a response stays valid, 0 for no limit
+    Entries are cached when deterministic (temperature 0 or fixed seed),
+    see is_deterministic(). Entry option `cache` True/False overrides it.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries if max_entries > 0 else 0
+        self.max_bytes = max_bytes if max_bytes > 0 else CACHE_MAX_BYTES
+        self.ttl = ttl if ttl > 0 else 0.0
+        self._memory = OrderedDict()
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+
+    def get(self, key: str = '') -> Response:
+        """
+        Return cached response of key, or None.
+        """
+        with self._lock:
+            record = self._memory.get(key)
+            if record is not None:
+                self._memory.move_to_end(key)
+
+        if record is None:
+            record = self._load(key)
+            if record is not None:
+                self._remember(key, record)
+
+        if record is None:
+            return None
+
+        if self._expired(record):
+            self.delete(key)
+            return None
+
+        return to_response(record)
+
+    def put(self, key: str = '', response: Response = None) -> None:
+        """
+        Store response of key in both tiers.
+        """
+        record = {"stored_at": time.time(), **to_record(response)}
+        self._remember(key, record)
+        self._save(key, record)
+
+    def delete(self, key: str = '') -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            if self.path:
+                self._remove(self._file(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            for name in self._files():
+                self._remove(os.path.join(self.path, name))
+            self._disk_bytes = 0 if self.path else None
+
+    def _remember(self, key: str, record: dict) -> None:
+        with self._lock:
+            self._memory[key] = record
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _expired(self, record: dict) -> bool:
+        if not self.ttl:
+            return False
+        return time.time() - record.get("stored_at", 0.0) > self.ttl
+
+    def _load(self, key: str) -> dict:
+        if not self.path:
+            return None
+
+        file = self._file(key)
+        try:
+            with open(file, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            # access time for eviction, not all file systems keep atime
+            os.utime(file)
+        except (OSError, ValueError):
+            return None
+
+        return record
+
+    def _save(self, key: str, record: dict) -> None:
+        """
+        Write record atomically, then evict oldest used files
+        while the disk tier exceeds max_bytes.
+        """
+        if not self.path:
+            return
+
+        data = json.dumps(record).encode("utf-8")
+        file = self._file(key)
+        temp = f"{file}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan()[1]
+            try:
+                old = os.path.getsize(file)
+            except OSError:
+                old = 0
+            try:
+                with open(temp, "wb") as f:
+                    f.write(data)
+                os.replace(temp, file)
+            except OSError:
+                self._remove(temp)
+                return
+            self._disk_bytes += len(data) - old
+
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Rescan disk tier, since other processes may share it.
+        """
+        files, self._disk_bytes = self._scan()
+        for mtime, size, file in sorted(files):
+            if self._disk_bytes <= self.max_bytes:
+                break
+            self._remove(file)
+            self._disk_bytes -= size
+
+    def _scan(self) -> tuple:
+        files = []
+        total = 0
+        for name in self._files():
+            file = os.path.join(self.path, name)
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+            total += stat.st_size
+        return files, total
+
+    def _files(self) -> list:
+        if not self.path:
+            return []
+        return [n for n in os.listdir(self.path) if n.endswith(".json")]
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def _remove(self, file: str) -> None:
+        try:
+            os.remove(file)
+        except OSError:
+            pass
+
+
+def cache_key(
+    provider: str = '',
+    method: str = "POST",
+    url: str = '',
+    payload: dict = None
+) -> str:
+    """
+    SHA-256 of the canonical request: provider, method, url and headers
+    without secrets, and JSON body with sorted keys.
+    Model is part of the body or url of every provider.
+    Return None if the body cannot be canonicalized (e.g. files).
+    """
+    payload = payload if payload else {}
+    if payload.get("files") or "json" not in payload and payload.get("data"):
+        return None
+
+    headers = {
+        k.lower(): v for k, v in (payload.get("headers") or {}).items()
+        if k.lower() not in SECRET_HEADERS
+    }
+    request = {
+        "provider": provider,
+        "method": method.upper(),
+        "url": strip_secrets(url),
+        "headers": headers,
+        "body": payload.get("json")
+    }
+
+    try:
+        canonical = json.dumps(
+            request, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_deterministic(body: any = None) -> bool:
+    """
+    True if request body asks for a reproducible result:
+    temperature 0 or fixed seed, at top level or in a nested
+    config such as generationConfig of Google Gemini.
+    """
+    if not isinstance(body, dict):
+        return False
+
+    if body.get("temperature") == 0 or body.get("seed") is not None:
+        return True
+
+    return any(
+        is_deterministic(value) for value in body.values()
+        if isinstance(value, dict)
+    )
+
+
+def strip_secrets(url: str = '') -> str:
+    """
+    Remove API keys from query string, keep other parameters in order.
+    """
+    parsed = urlparse(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in SECRET_QUERY_KEYS
+    ]
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=""))
+
+
+def to_record(response: Response = None) -> dict:
+    """
+    Response in JSON form, content in base64.
+    """
+    return {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "url": response.url,
+        "content": base64.b64encode(response.content).decode("ascii")
+    }
+
+
+def to_response(record: dict) -> Response:
+    """
+    Rebuild Response from to_record(), without request and timing.
+    """
+    response = Response()
+    response.status_code = record["status_code"]
+    response.headers = CaseInsensitiveDict(record.get("headers") or {})
+    response.url = record.get("url")
+    response._content = base64.b64decode(record["content"])
+    response.encoding = None
+    return response
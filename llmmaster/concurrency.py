@@ -0,0 +1,196 @@
+import threading
+import time
+
+from requests.models import Response
+
+from .config import AIMD_DECREASE
+from .config import AIMD_INCREASE
+from .config import AIMD_INITIAL
+from .config import AIMD_MAX
+from .config import AIMD_MAX_PAUSE
+from .config import AIMD_MIN
+from .config import POSITIVE_RESPONSE_CODES
+from .config import REQUEST_TOO_MANY
+from .deadline import Deadline
+from .deadline import DeadlineExceeded
+from .retry import retry_after
+
+
+REMAINING_HEADERS = [
+    "x-ratelimit-remaining-requests",
+    "x-ratelimit-remaining-tokens",
+    "x-ratelimit-remaining",
+    "anthropic-ratelimit-requests-remaining",
+    "anthropic-ratelimit-tokens-remaining",
+    "ratelimit-remaining"
+]
+
+
+class AdaptiveLimit:
+    """
+    In-flight request limit of one provider adjusted by AIMD:
+      - additive increase: about +increase per round of successful
+        requests while the limit is fully used
+      - multiplicative decrease: limit * decrease on throttling,
+        i.e. 429 or rate-limit remaining headers reaching 0
+    Only one decrease is made for requests sent before the last one,
+    so that a burst of 429s does not collapse the limit.
+    New requests are also held until reset time told by provider.
+    Arguments:
+      - initial, minimum, maximum: requests in flight
+      - increase, decrease: AIMD factors
+    """
+
+    def __init__(
+        self,
+        initial: float = AIMD_INITIAL,
+        minimum: float = AIMD_MIN,
+        maximum: float = AIMD_MAX,
+        increase: float = AIMD_INCREASE,
+        decrease: float = AIMD_DECREASE
+    ) -> None:
+        self.minimum = minimum if minimum >= 1 else 1
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.increase = increase if increase > 0 else AIMD_INCREASE
+        self.decrease = decrease if 0 < decrease < 1 else AIMD_DECREASE
+        self.in_flight = 0
+        self.throttled = 0
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def current(self) -> int:
+        return max(int(self.limit), 1)
+
+    def acquire(self, deadline: Deadline = None) -> int:
+        """
+        Block until a request can be sent, return ticket for release().
+        DeadlineExceeded is raised if no slot opens by the deadline.
+        """
+        deadline = deadline if deadline else Deadline()
+
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if self.in_flight < self.current and pause <= 0:
+                    break
+                remaining = deadline.remaining()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded("No request slot by deadline.")
+                to_wait = deadline.clip(pause if pause > 0 else None)
+                self._condition.wait(to_wait)
+
+            self.in_flight += 1
+            return self._epoch
+
+    def release(
+        self,
+        ticket: int = 0,
+        response: Response = None,
+        error: Exception = None
+    ) -> None:
+        """
+        Return the slot and adjust the limit from the result.
+        Errors without response (e.g. connection) change nothing.
+        """
+        with self._condition:
+            binding = self.in_flight >= self.current
+            self.in_flight -= 1
+
+            if response is not None and is_throttled(response):
+                self.throttled += 1
+                if ticket == self._epoch:
+                    self._epoch += 1
+                    self.limit = max(self.limit * self.decrease, self.minimum)
+                told = retry_after(response)
+                if told:
+                    self._paused_until = max(
+                        self._paused_until,
+                        time.monotonic() + min(told, AIMD_MAX_PAUSE)
+                    )
+
+            elif (error is None and binding and response is not None and
+                  response.status_code in POSITIVE_RESPONSE_CODES):
+                self.limit = min(
+                    self.limit + self.increase / self.current, self.maximum
+                )
+
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                "limit": self.current,
+                "in_flight": self.in_flight,
+                "throttled": self.throttled
+            }
+
+
+class AdaptiveConcurrency:
+    """
+    Registry of AdaptiveLimit keyed by provider KEY_NAME, same as
+    RateLimiter, so that each provider converges to its own capacity
+    in mixed batches. Arguments are given to each AdaptiveLimit.
+    Use limits() to monitor current limits.
+    """
+
+    def __init__(
+        self,
+        initial: float = AIMD_INITIAL,
+        minimum: float = AIMD_MIN,
+        maximum: float = AIMD_MAX,
+        increase: float = AIMD_INCREASE,
+        decrease: float = AIMD_DECREASE
+    ) -> None:
+        self.settings = {
+            "initial": initial,
+            "minimum": minimum,
+            "maximum": maximum,
+            "increase": increase,
+            "decrease": decrease
+        }
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def get(self, key_name: str = '') -> AdaptiveLimit:
+        """
+        Return AdaptiveLimit shared for key_name, None if no key_name.
+        """
+        if not key_name:
+            return None
+        with self._lock:
+            if key_name not in self._limits:
+                self._limits[key_name] = AdaptiveLimit(**self.settings)
+            return self._limits[key_name]
+
+    def limits(self) -> dict:
+        """
+        Current limit, requests in flight and throttled count
+        of each provider.
+        """
+        with self._lock:
+            limits = dict(self._limits)
+        return {key: limit.snapshot() for key, limit in limits.items()}
+
+
+def is_throttled(response: Response = None) -> bool:
+    """
+    True for 429, or when rate-limit remaining headers tell that
+    no more request is allowed until reset.
+    """
+    if response.status_code == REQUEST_TOO_MANY:
+        return True
+
+    for key in REMAINING_HEADERS:
+        value = response.headers.get(key)
+        if value is None:
+            continue
+        try:
+            if float(value) <= 0:
+                return True
+        except ValueError:
+            pass
+
+    return False
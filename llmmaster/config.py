@@ -29,20 +29,249 @@ STABLE_DIFFUSION_KEY_NAME = "STABLE_DIFFUSION_API_KEY"
 TRIPO_KEY_NAME = "TRIPO_API_KEY"
 XAI_KEY_NAME = "XAI_API_KEY"
 
+# Adaptive concurrency settings
+# Requests in flight per provider start at AIMD_INITIAL, grow by about
+# AIMD_INCREASE per round of successful requests and are multiplied by
+# AIMD_DECREASE on 429 or exhausted rate-limit headers.
+# New requests are held until reset time told by provider, at most
+# AIMD_MAX_PAUSE seconds.
+AIMD_INITIAL = 4
+AIMD_MIN = 1
+AIMD_MAX = 64
+AIMD_INCREASE = 1.0
+AIMD_DECREASE = 0.5
+AIMD_MAX_PAUSE = 60.0
+
+# Batch settings
+# Label of batch entries given without label.
+BATCH_LABEL_FORMAT = "entry_{:06d}"
+
+# Run journal settings
+# States of entries recorded by RunJournal.
+JOURNAL_QUEUED = "queued"
+JOURNAL_SUBMITTED = "submitted"
+JOURNAL_COMPLETED = "completed"
+JOURNAL_FAILED = "failed"
+
+# Rate limit settings
+# Requests (rpm) and estimated input tokens (tpm) per minute for each
+# API key name, taken from the lowest paid tier (free tier for Groq and
+# Cerebras) documented by providers. Not applied unless opted in with
+# RateLimiter(use_defaults=True), since higher tiers would be throttled.
+# Give the limits of your own tier with RateLimiter(limits) instead.
+RATE_LIMITS = {
+    ANTHROPIC_KEY_NAME: {"rpm": 50, "tpm": 30000},
+    CEREBRAS_KEY_NAME: {"rpm": 30, "tpm": 60000},
+    GOOGLE_KEY_NAME: {"rpm": 1000, "tpm": 1000000},
+    GROQ_KEY_NAME: {"rpm": 30, "tpm": 6000},
+    MESHY_KEY_NAME: {"rpm": 20, "tpm": 0},
+    MISTRAL_KEY_NAME: {"rpm": 60, "tpm": 500000},
+    OPENAI_KEY_NAME: {"rpm": 500, "tpm": 30000}
+}
+
 # REST API settings
 REQUEST_ACCEPTED = 202
 REQUEST_CREATED = 201
 REQUEST_OK = 200
 POSITIVE_RESPONSE_CODES = [REQUEST_ACCEPTED, REQUEST_CREATED, REQUEST_OK]
+REQUEST_TOO_MANY = 429
 
 MULTIPART_BOUNDARY = "LLMMasterMultiPartBoundary"
 X_API_KEY = "x-api-key"
 XI_API_KEY = "xi-api-key"
 
+# HTTP connection pool settings
+# pool_maxsize: keep-alive connections kept per base endpoint (host)
+# max_age: seconds until pooled connections are recycled, 0 for no limit
+POOL_MAXSIZE = 16
+POOL_MAX_AGE = 300.0
+
+# Retry settings
+# max_attempts includes the first request.
+# backoff: base of exponential wait, doubled each retry up to max_backoff.
+# RETRY_STATUS_CODES are retried for any request, as the provider has not
+# processed it. RETRY_IDEMPOTENT_STATUS_CODES are retried only for methods
+# safe to repeat, since a paid generation may have started before the
+# error, see RetryPolicy(retry_unsafe=True) to retry POST as well.
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 1.0
+RETRY_MAX_BACKOFF = 60.0
+RETRY_STATUS_CODES = [408, 429, 503]
+RETRY_IDEMPOTENT_STATUS_CODES = [500, 502, 504]
+IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS", "PUT", "DELETE"]
+
+# Timeout settings
+# connect/read timeouts of each HTTP request in seconds.
+# Both are shortened to meet the deadline of entry or run if given.
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 600.0
+TIMED_OUT_MESSAGE = "Timed out. "
+STATUS_TIMED_OUT = "timed_out"
+
+# Pipeline settings
+# In LLMMaster.run_graph(), entries referring to a failed entry or
+# to a field missing in its result are not run, and get result starting
+# with SKIPPED_MESSAGE and status STATUS_SKIPPED. So do hedge backups
+# of LLMMaster.race() not started before the race ended.
+SKIPPED_MESSAGE = "Skipped. "
+STATUS_SKIPPED = "skipped"
+
+# Race settings
+# Backup entry of a hedged race starts when the entries started so far
+# have not answered within HEDGE_PERCENTILE of latencies observed in
+# earlier races. HEDGE_INITIAL seconds are used until HEDGE_MIN_SAMPLES
+# latencies are observed. The last HEDGE_MAX_SAMPLES latencies are kept.
+HEDGE_PERCENTILE = 95.0
+HEDGE_INITIAL = 1.0
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MAX_SAMPLES = 200
+CANCELLED_MESSAGE = "Cancelled. "
+STATUS_CANCELLED = "cancelled"
+# Results starting with these are not accepted as race winner.
+FAILURE_PREFIXES = [
+    "Something went wrong.",
+    TIMED_OUT_MESSAGE,
+    CANCELLED_MESSAGE,
+    SKIPPED_MESSAGE,
+    "Error"
+]
+
+# Polling settings
+# Status checks of async tasks start at initial interval,
+# then the interval grows by factor up to max interval.
+# Progress reported by provider is used to estimate the next check.
+POLL_INITIAL_INTERVAL = 1.0
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_INTERVAL = 20.0
+
+# Webhook settings
+# Local server receiving task callbacks from providers.
+# port 0 picks a free port. Polling starts as fallback when no callback
+# arrives within WEBHOOK_FALLBACK seconds after submission.
+WEBHOOK_HOST = "127.0.0.1"
+WEBHOOK_PORT = 0
+WEBHOOK_PATH = "/llmmaster/webhook"
+WEBHOOK_FALLBACK = 60.0
+
+# Base64 encoding settings
+# Encoded local files are kept in memory up to BASE64_CACHE_MAX_BYTES
+# in total, keyed by path, mtime and size, so that the same file given
+# to several entries is read and encoded only once.
+# Files are read in BASE64_CHUNK_SIZE bytes (multiple of 3).
+BASE64_CACHE_MAX_BYTES = 64 * 1024 * 1024
+BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+# Response cache settings
+# Memory tier keeps CACHE_MAX_ENTRIES responses in LRU order.
+# Disk tier is evicted from the oldest used file over CACHE_MAX_BYTES.
+# Responses older than CACHE_TTL seconds are not used, 0 for no limit.
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_TTL = 7 * 24 * 3600.0
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+# Headers and query parameters never used in cache key (lower case).
+SECRET_HEADERS = ["authorization", X_API_KEY, XI_API_KEY, "x-goog-api-key"]
+SECRET_QUERY_KEYS = ["key", "api_key", "apikey", "token"]
+
+# Deduplication settings
+# With LLMMaster(dedup=True), identical deterministic requests in a run
+# share one upstream call. Results of finished calls are reused by later
+# entries of the run, up to DEDUP_MAX_ENTRIES in LRU order.
+DEDUP_MAX_ENTRIES = 256
+DEDUP_SHARED = "shared"
+
+# Output settings
+# Binary results of entries with option `output` are written to disk
+# in OUTPUT_CHUNK_SIZE bytes as they arrive. Responses of these types
+# are kept in memory as usual (e.g. errors, JSON results).
+OUTPUT_CHUNK_SIZE = 1024 * 1024
+OUTPUT_DEFAULT_EXTENSION = ".bin"
+TEXT_CONTENT_TYPES = [
+    "application/json",
+    "application/xml",
+    "application/x-ndjson",
+    "application/javascript"
+]
+
+# Download settings
+# LLMMaster.download() fetches asset URLs found under these keys of
+# results (Luma AI assets, Meshy model/texture URLs, Tripo and Runway
+# output, Skybox file URLs), and image URLs in data list of OpenAI and
+# xAI. Interrupted downloads resume by Range request up to
+# DOWNLOAD_MAX_ATTEMPTS times.
+ASSET_KEYS = [
+    "assets",
+    "model_urls",
+    "texture_urls",
+    "thumbnail_url",
+    "video_url",
+    "output",
+    "file_url",
+    "thumb_url",
+    "depth_map_url"
+]
+DOWNLOAD_MAX_WORKERS = 8
+DOWNLOAD_MAX_ATTEMPTS = 3
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Gemini file settings
+# Files uploaded for GoogleSpeechVideoToText are shared by entries on the
+# same content and API key, until GEMINI_FILE_EXPIRY_MARGIN seconds
+# before server-side expiry (GEMINI_FILE_TTL if not told by server).
+# Uploads are sent in chunks of GEMINI_UPLOAD_CHUNK_SIZE (multiple of
+# 256 KiB) and resumed from the offset confirmed by server, up to
+# GEMINI_UPLOAD_MAX_ATTEMPTS failures in a row.
+GEMINI_FILE_TTL = 48 * 3600.0
+GEMINI_FILE_EXPIRY_MARGIN = 600.0
+GEMINI_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+GEMINI_UPLOAD_MAX_ATTEMPTS = 5
+
+# Entry options
+# Keys taken out of entry parameters and never sent to providers.
+# - retry: RetryPolicy for the entry
+# - timeout: seconds for the entry to finish from its start
+# - connect_timeout: seconds to connect for each HTTP request
+# - read_timeout: seconds to wait for each HTTP response
+# - polling: PollingPolicy for status checks of async task
+# - stream: True, callback(delta) or TokenStream for streaming LLM output
+# - cache: True/False to use response cache regardless of determinism
+# - output: file path, directory or file-like object to stream binary
+#   result to, see save_output()
+# - verify: False to skip checks of parameters (e.g. input file exists),
+#   used to rebuild an entry already submitted, see LLMMaster.collect()
+ENTRY_OPTIONS = [
+    "retry",
+    "timeout",
+    "connect_timeout",
+    "read_timeout",
+    "polling",
+    "stream",
+    "cache",
+    "output",
+    "verify"
+]
+
+# Streaming settings
+# Server-sent events of OpenAI-compatible providers end with this data.
+SSE_DONE = "[DONE]"
+
 # Summon default settings
 SUMMON_LIMIT = 150
 WAIT_FOR_STARTING = 1.0
 
+# Executor settings
+# thread: one thread per instance (default, paced by wait_for_starting)
+# pool: instances run as jobs in a bounded worker pool
+EXECUTOR_THREAD = "thread"
+EXECUTOR_POOL = "pool"
+DEFAULT_MAX_WORKERS = 16
+
+# Poller settings
+# Status checks of async generation tasks are sent by a shared poller.
+# max_workers: status checks sent at the same time
+POLLER_MAX_WORKERS = 4
+
 # Text-To-Text settings
 # Note:
 # top_p is common for all models but top_k is only for anthropic and google.
@@ -199,9 +428,13 @@ FLUX1_FAL_KONTEXT_PARAMS = [
 # Google
 GOOGLE_GEMINI_BASE_EP = "https://generativelanguage.googleapis.com"
 GOOGLE_GEMINI_TTT_EP = "/v1beta/models/{model}:generateContent"
+GOOGLE_GEMINI_STREAM_EP = "/v1beta/models/{model}:streamGenerateContent"
 GOOGLE_GEMINI_UPLOAD_EP = "/upload/v1beta/files"
 GOOGLE_GEMINI_DELETE_EP = "/v1beta"
 GOOGLE_GEMINI_FILE_LIST_EP = "/v1beta/files"
+GOOGLE_GEMINI_FILE_EP = "/v1beta/{name}"
+GOOGLE_GEMINI_FILE_ACTIVE = "ACTIVE"
+GOOGLE_GEMINI_FILE_PROCESSING = "PROCESSING"
 WAIT_FOR_GOOGLE_VTT_RESULT = 5.0
 
 GOOGLE_GEMINI_TTT_PARAMS = [
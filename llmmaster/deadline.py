@@ -0,0 +1,120 @@
+import threading
+import time
+
+from requests.exceptions import Timeout
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request is attempted after its deadline.
+    """
+    pass
+
+
+class Deadline:
+    """
+    Point in time by which an entry or a run must finish.
+    seconds: time limit from now, None or 0 for no limit.
+    """
+
+    def __init__(self, seconds: float = None) -> None:
+        self.at = (
+            time.monotonic() + seconds if seconds and seconds > 0 else None
+        )
+        self._expired = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """
+        Seconds left, or None if no limit.
+        """
+        if self.at is None:
+            return None
+        return max(self.at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.at is not None and self.at <= time.monotonic()
+
+    def expire(self) -> None:
+        """
+        Pass the deadline now, e.g. to cancel an entry.
+        Threads in wait() wake up at once and on_expire() callbacks
+        are called.
+        """
+        self.at = time.monotonic()
+        self._expired.set()
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_expire(self, callback: any = None) -> any:
+        """
+        Call callback() at expire(), e.g. to abort a request in flight.
+        Called at once if expire() has been called already.
+        Return function to remove the callback.
+        """
+        with self._lock:
+            if not self._expired.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: any = None) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, seconds: float = None) -> bool:
+        """
+        Sleep for seconds, cut short by the deadline or expire().
+        Return True if the deadline has passed.
+        """
+        self._expired.wait(self.clip(seconds))
+        return self.expired()
+
+    def copy(self) -> "Deadline":
+        deadline = Deadline()
+        deadline.at = self.at
+        return deadline
+
+    def earliest(self, other: "Deadline" = None) -> "Deadline":
+        """
+        Return the deadline that comes first.
+        """
+        if other is None or other.at is None:
+            return self
+        if self.at is None or other.at < self.at:
+            return other
+        return self
+
+    def clip(self, seconds: float = None) -> float:
+        """
+        Shorten seconds so that it does not go beyond the deadline.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        if seconds is None:
+            return remaining
+        return min(seconds, remaining)
+
+    def timeout(self, timeout: any = None) -> any:
+        """
+        Shorten requests timeout, either float or (connect, read).
+        """
+        if isinstance(timeout, tuple):
+            return tuple(self.clip(value) for value in timeout)
+        return self.clip(timeout)
+
+
+def is_timeout(error: Exception = None) -> bool:
+    """
+    Judge if exception is caused by deadline or HTTP timeout.
+    """
+    return isinstance(error, (DeadlineExceeded, Timeout))
@@ -0,0 +1,359 @@
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from requests.exceptions import RequestException
+
+from .config import ASSET_KEYS
+from .config import CONNECT_TIMEOUT
+from .config import DOWNLOAD_CHUNK_SIZE
+from .config import DOWNLOAD_MAX_ATTEMPTS
+from .config import DOWNLOAD_MAX_WORKERS
+from .config import OUTPUT_DEFAULT_EXTENSION
+from .config import READ_TIMEOUT
+from .retry import RetryPolicy
+from .transport import Transport
+from .transport import get_transport
+from .transport import strip_query
+
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+PARTIAL_DIR = "partial"
+
+
+def find_assets(result: any = None) -> list:
+    """
+    Asset URLs in a generation result as list of (name, url).
+    name is the key path in result, e.g. "model_urls.glb" or "output.0".
+    URLs are looked up under ASSET_KEYS at any depth, and as "url" of
+    items in top-level "data" list (OpenAI and xAI images).
+    """
+    assets = []
+
+    def walk(value: any, path: str, inside: bool) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                name = f"{path}.{key}" if path else str(key)
+                walk(item, name, inside or key in ASSET_KEYS)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                walk(item, f"{path}.{i}" if path else str(i), inside)
+        elif inside and _is_url(value):
+            assets.append((path, value))
+
+    walk(result, '', False)
+
+    if isinstance(result, dict) and isinstance(result.get("data"), list):
+        for i, item in enumerate(result["data"]):
+            if isinstance(item, dict) and _is_url(item.get("url")):
+                assets.append((f"data.{i}.url", item["url"]))
+
+    return assets
+
+
+class AssetStore:
+    """
+    Content-addressed local store of downloaded assets.
+    Files are kept as objects/<sha256[:2]>/<sha256><ext> under path,
+    so that the same content is stored once even if it comes from
+    different URLs. index.jsonl maps each URL (without query string,
+    where signed URLs put expiring tokens) to its file, and URLs in
+    the index are never fetched again.
+    Arguments:
+      - path: root directory of the store, made if missing
+      - transport: Transport of pooled connections
+      - max_workers: concurrent downloads
+      - retry: RetryPolicy of each request, in addition to resuming
+        broken transfers
+    """
+
+    def __init__(
+        self,
+        path: str = '',
+        transport: Transport = None,
+        max_workers: int = DOWNLOAD_MAX_WORKERS,
+        retry: RetryPolicy = None
+    ) -> None:
+        self.path = os.fspath(path)
+        self.transport = transport if transport else get_transport()
+        self.max_workers = max_workers if max_workers > 0 else 1
+        self.retry = retry if retry else RetryPolicy()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(self.path, OBJECTS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(self.path, PARTIAL_DIR), exist_ok=True)
+        self.index = self._load()
+
+    def download(self, results: dict = None) -> dict:
+        """
+        Download assets of results in {label: result} concurrently.
+        Return {label: [descriptor]} where descriptor has keys
+        "name", "url", "path", "sha256", "size", "content_type" and
+        "fetched" (False if taken from store), or "name", "url" and
+        "error" if download failed.
+        Each URL is fetched once even if found in multiple results.
+        """
+        found = {
+            label: find_assets(result)
+            for label, result in (results if results else {}).items()
+        }
+        urls = {}
+        for assets in found.values():
+            for _, url in assets:
+                urls.setdefault(strip_query(url), url)
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llmmaster-download"
+        ) as executor:
+            futures = {
+                key: executor.submit(self.fetch, url)
+                for key, url in urls.items()
+            }
+            fetched = {}
+            for key, future in futures.items():
+                try:
+                    fetched[key] = future.result()
+                except Exception as e:
+                    fetched[key] = {"error": f"Something went wrong. {e}"}
+
+        return {
+            label: [
+                {"name": name, "url": strip_query(url),
+                 **fetched[strip_query(url)]}
+                for name, url in assets
+            ]
+            for label, assets in found.items()
+        }
+
+    def lookup(self, url: str = '') -> dict:
+        """
+        Stored descriptor of url, or None if not in store.
+        """
+        with self._lock:
+            record = self.index.get(strip_query(url))
+        if record is None:
+            return None
+        path = self.object_path(record["sha256"], record["ext"])
+        if not os.path.exists(path):
+            return None
+        return {
+            "path": path,
+            "sha256": record["sha256"],
+            "size": record["size"],
+            "content_type": record["content_type"]
+        }
+
+    def object_path(self, sha256: str = '', ext: str = '') -> str:
+        return os.path.join(
+            self.path, OBJECTS_DIR, sha256[:2], f"{sha256}{ext}"
+        )
+
+    def partial_path(self, url: str = '') -> str:
+        """
+        File of incomplete download, kept to resume it later.
+        """
+        key = hashlib.sha256(strip_query(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, PARTIAL_DIR, f"{key}.part")
+
+    def fetch(self, url: str = '') -> dict:
+        """
+        Download one URL into the store unless already stored.
+        Return descriptor as in download(), raise on failure.
+        """
+        stored = self.lookup(url)
+        if stored is not None:
+            return {**stored, "fetched": False}
+
+        content_type = self._transfer(url)
+
+        partial = self.partial_path(url)
+        sha256 = _file_digest(partial, "sha256")
+        size = os.path.getsize(partial)
+        ext = _extension(url, content_type)
+        path = self.object_path(sha256, ext)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(partial)
+        else:
+            os.replace(partial, path)
+
+        self._append({
+            "url": strip_query(url),
+            "sha256": sha256,
+            "ext": ext,
+            "size": size,
+            "content_type": content_type
+        })
+        return {
+            "path": path,
+            "sha256": sha256,
+            "size": size,
+            "content_type": content_type,
+            "fetched": True
+        }
+
+    def _transfer(self, url: str = '') -> str:
+        """
+        Fetch url into partial file, resuming from its current size.
+        Return Content-Type when the whole body is in the file and
+        its size and checksum (if told by server) are verified.
+        """
+        partial = self.partial_path(url)
+        error = None
+
+        for _ in range(DOWNLOAD_MAX_ATTEMPTS):
+            offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+            try:
+                response = self.transport.request(
+                    "GET",
+                    url,
+                    retry=self.retry,
+                    headers=headers,
+                    stream=True,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+                )
+            except RequestException as e:
+                error = e
+                continue
+
+            try:
+                if response.status_code == 416 and offset:
+                    # partial file does not match the remote file
+                    os.remove(partial)
+                    error = ValueError("Range not satisfiable.")
+                    continue
+                if response.status_code not in (200, 206):
+                    msg = f"{response.status_code} {response.text[:200]}"
+                    raise RuntimeError(msg)
+
+                start, total = _content_range(response, offset)
+                if start != offset:
+                    # range ignored or moved, write again from the start
+                    offset = 0
+                try:
+                    with open(partial, "ab" if offset else "wb") as file:
+                        for chunk in response.iter_content(
+                           DOWNLOAD_CHUNK_SIZE):
+                            file.write(chunk)
+                except RequestException as e:
+                    error = e
+                    continue
+            finally:
+                response.close()
+
+            size = os.path.getsize(partial)
+            if total is not None and size != total:
+                error = ValueError(f"Received {size} of {total} bytes.")
+                if size > total:
+                    os.remove(partial)
+                continue
+
+            expected = _expected_md5(response)
+            if expected and _file_digest(partial, "md5") != expected:
+                os.remove(partial)
+                error = ValueError("Checksum mismatch.")
+                continue
+
+            content_type = response.headers.get("Content-Type", "")
+            return content_type.split(";")[0].strip()
+
+        raise error
+
+    def _load(self) -> dict:
+        index = {}
+        path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(path):
+            return index
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # last line broken by interruption
+                    continue
+                index[record["url"]] = record
+        return index
+
+    def _append(self, record: dict = None) -> None:
+        path = os.path.join(self.path, INDEX_FILE)
+        with self._lock:
+            self.index[record["url"]] = record
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _is_url(value: any = None) -> bool:
+    return isinstance(value, str) and value.startswith(
+        ("http://", "https://")
+    )
+
+
+def _content_range(response: any = None, offset: int = 0) -> tuple:
+    """
+    (first byte, total size) of response body, total None if unknown.
+    """
+    if response.status_code == 206:
+        matched = CONTENT_RANGE_PATTERN.match(
+            response.headers.get("Content-Range", "")
+        )
+        if matched:
+            total = matched.group(3)
+            return (
+                int(matched.group(1)),
+                int(total) if total != "*" else None
+            )
+        return (offset, None)
+
+    length = response.headers.get("Content-Length")
+    encoded = response.headers.get("Content-Encoding", "identity")
+    if length and length.isdigit() and encoded == "identity":
+        return (0, int(length))
+    return (0, None)
+
+
+def _expected_md5(response: any = None) -> str:
+    """
+    MD5 in hex of the whole file if told by server, or None.
+    Content-MD5 covers the body of 200 response only; x-goog-hash of
+    Google Cloud Storage covers the whole object.
+    """
+    values = []
+    goog = response.headers.get("x-goog-hash", "")
+    values += [v.strip()[4:] for v in goog.split(",")
+               if v.strip().startswith("md5=")]
+    if response.status_code == 200 and response.headers.get("Content-MD5"):
+        values.append(response.headers["Content-MD5"])
+
+    for value in values:
+        try:
+            return base64.b64decode(value).hex()
+        except ValueError:
+            continue
+    return None
+
+
+def _file_digest(path: str = '', algorithm: str = "sha256") -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extension(url: str = '', content_type: str = '') -> str:
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if ext and len(ext) <= 6:
+        return ext
+    return mimetypes.guess_extension(content_type) or OUTPUT_DEFAULT_EXTENSION
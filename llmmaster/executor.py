@@ -0,0 +1,323 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from .config import DEFAULT_MAX_WORKERS
+from .config import EXECUTOR_POOL
+from .config import EXECUTOR_THREAD
+from .deadline import Deadline
+
+
+NOT_STARTED = "Deadline passed before start."
+STILL_RUNNING = "Still running at deadline."
+
+
+class LaunchPolicy:
+    """
+    Rate policy to pace the start of summoned instances.
+    Works as a token bucket:
+      - burst: number of instances allowed to start at once
+      - per_second: refill rate of start tokens, 0 means no pacing
+    Example:
+      LaunchPolicy(per_second=1.0) starts one instance per second.
+      LaunchPolicy(per_second=5.0, burst=10) starts 10 at once, then 5/sec.
+    """
+
+    def __init__(self, per_second: float = 0.0, burst: int = 1) -> None:
+        self.per_second = per_second if per_second > 0 else 0.0
+        self.burst = burst if burst > 0 else 1
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until the next instance is allowed to start.
+        """
+        to_wait = self._reserve()
+        if to_wait > 0:
+            time.sleep(to_wait)
+
+    async def aacquire(self) -> None:
+        """
+        Asynchronous twin of acquire().
+        """
+        to_wait = self._reserve()
+        if to_wait > 0:
+            await asyncio.sleep(to_wait)
+
+    def _reserve(self) -> float:
+        """
+        Take one start token and return seconds to wait for it.
+        Tokens may go negative so that concurrent callers queue up
+        in order instead of waking at the same time.
+        """
+        if not self.per_second:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._updated) * self.per_second
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            to_wait = 0.0 if self._tokens >= 0 else (
+                -self._tokens / self.per_second
+            )
+
+        return to_wait
+
+
+class ThreadExecutor:
+    """
+    Default executor: start each instance as its own thread.
+    With deadline, threads still alive at the deadline are left as daemon
+    and their instances are expired.
+    With poller, threads end right after task submission and the poller
+    tracks the tasks.
+    """
+
+    def execute(
+        self,
+        instances: dict,
+        launch_policy: LaunchPolicy,
+        deadline: Deadline = None,
+        poller: any = None
+    ) -> None:
+        deadline = deadline if deadline else Deadline()
+        threads = {}
+        polls = []
+
+        for instance in instances.values():
+            launch_policy.acquire()
+            if deadline.expired():
+                instance.expire(NOT_STARTED)
+                continue
+            thread = threading.Thread(
+                target=_run_in_thread,
+                args=(instance, deadline, poller, polls),
+                daemon=deadline.at is not None
+            )
+            thread.start()
+            threads[thread] = instance
+
+        for thread, instance in threads.items():
+            thread.join(deadline.remaining())
+            if thread.is_alive():
+                instance.expire(STILL_RUNNING)
+
+        wait_polls(dict(list(polls)), deadline)
+
+
+class PoolExecutor:
+    """
+    Run instances as plain jobs in a bounded worker pool.
+    Suitable for large batches mostly waiting on network I/O.
+    With poller, workers are released right after task submission.
+    max_workers: maximum number of instances running at the same time.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers = (
+            max_workers if max_workers > 0 else DEFAULT_MAX_WORKERS
+        )
+
+    def execute(
+        self,
+        instances: dict,
+        launch_policy: LaunchPolicy,
+        deadline: Deadline = None,
+        poller: any = None
+    ) -> None:
+        deadline = deadline if deadline else Deadline()
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llmmaster"
+        )
+
+        try:
+            futures = {}
+            for instance in instances.values():
+                launch_policy.acquire()
+                future = pool.submit(run_job, instance, deadline, poller)
+                futures[future] = instance
+
+            done, pending = wait(futures, timeout=deadline.remaining())
+            for future in pending:
+                future.cancel()
+                futures[future].expire(STILL_RUNNING)
+
+            polls = {
+                future.result(): futures[future] for future in done
+                if future.result() is not None
+            }
+            wait_polls(polls, deadline)
+
+        finally:
+            pool.shutdown(wait=deadline.at is None, cancel_futures=True)
+
+
+def run_job(
+    instance: any,
+    deadline: Deadline = None,
+    poller: any = None
+) -> any:
+    """
+    Run one instance in the current thread.
+    Exceptions are stored in instance.response instead of being raised,
+    so that one failed entry does not stop the others.
+    Instance is not run if deadline has passed while waiting in queue.
+    With poller, run() stops right after task submission and the task
+    is handed to the poller. Return future of the poller in that case.
+    """
+    if deadline is not None and deadline.expired():
+        instance.expire(NOT_STARTED)
+        return None
+
+    _start_job(instance, deadline, poller is not None)
+
+    if poller is not None and instance.task is not None:
+        future = poller.submit(instance)
+        future.add_done_callback(_complete_poll(instance))
+        return future
+
+    instance.complete()
+    return None
+
+
+def submit_job(instance: any, deadline: Deadline = None) -> dict:
+    """
+    Run one instance until its async task is submitted, without polling.
+    Return instance.task, or None if the instance is over in run()
+    (e.g. LLMs, errors) and completed here.
+    Instances not resumable from task alone run to the end.
+    """
+    if deadline is not None and deadline.expired():
+        instance.expire(NOT_STARTED)
+        return None
+
+    _start_job(instance, deadline, instance.resumable)
+
+    if instance.task is None:
+        instance.complete()
+    return instance.task
+
+
+def _start_job(instance: any, deadline: Deadline, detached: bool) -> None:
+    """
+    Run instance in the current thread, storing exceptions as result.
+    If detached, run() stops right after task submission.
+    """
+    instance.set_deadline(deadline)
+    instance.task = None
+    instance.detached = detached
+    try:
+        instance.execute()
+    except Exception as e:
+        instance.response = f"Something went wrong. {e}"
+    finally:
+        instance.detached = False
+        _close_stream(instance)
+
+
+def _complete_poll(instance: any) -> any:
+    """
+    Done callback of poller future. Cancelled task is completed
+    by expire() instead.
+    """
+    def callback(future: any) -> None:
+        if not future.cancelled():
+            instance.complete()
+    return callback
+
+
+def wait_polls(polls: dict, deadline: Deadline) -> None:
+    """
+    Wait for tasks tracked by poller until deadline.
+    polls: dictionary of poller future and instance.
+    Tasks still ongoing at the deadline are dropped from the poller.
+    """
+    if not polls:
+        return
+
+    _, pending = wait(polls, timeout=deadline.remaining())
+    for future in pending:
+        future.cancel()
+        polls[future].expire(STILL_RUNNING)
+
+
+def _run_in_thread(
+    instance: any,
+    deadline: Deadline,
+    poller: any,
+    polls: list
+) -> None:
+    future = run_job(instance, deadline, poller)
+    if future is not None:
+        polls.append((future, instance))
+
+
+async def arun_job(
+    instance: any,
+    executor: any = None,
+    deadline: Deadline = None
+) -> None:
+    """
+    Asynchronous twin of run_job().
+    Cancellation is passed through to the caller, after cancelling
+    the instance so that its request in the worker thread stops retrying
+    and waiting, see RootModel.cancel().
+    """
+    if deadline is not None and deadline.expired():
+        instance.expire(NOT_STARTED)
+        return
+
+    instance.set_deadline(deadline)
+    try:
+        await instance.arun(executor)
+    except asyncio.CancelledError:
+        instance.cancel()
+        raise
+    except Exception as e:
+        instance.response = f"Something went wrong. {e}"
+    finally:
+        _close_stream(instance)
+
+    instance.complete()
+
+
+def _close_stream(instance: any) -> None:
+    """
+    End iteration of token stream also for entries not streaming
+    (e.g. failed before request, or model without streaming).
+    """
+    stream = getattr(instance, "stream", None)
+    if stream is not None:
+        stream.close()
+
+
+def create_executor(
+    executor: any = EXECUTOR_THREAD,
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> any:
+    """
+    Return executor object from mode name.
+    An object with execute(instances, launch_policy, deadline, poller)
+    is used as it is.
+    """
+    if executor == EXECUTOR_THREAD:
+        return ThreadExecutor()
+    elif executor == EXECUTOR_POOL:
+        return PoolExecutor(max_workers=max_workers)
+    elif hasattr(executor, "execute"):
+        return executor
+
+    msg = (
+        f"Executor must be `{EXECUTOR_THREAD}`, `{EXECUTOR_POOL}` "
+        f"or an object with execute() but {executor}."
+    )
+    raise ValueError(msg)
@@ -1,4 +1,3 @@
-from requests import request
 from requests.models import Response
 
 from .config import FAL_BASE_EP
@@ -10,6 +9,7 @@ from .config import FLUX1_FAL_KONTEXT_PARAMS
 from .config import FLUX1_FAL_TTI_EP
 from .config import FLUX1_FAL_TTI_PARAMS
 from .config import WAIT_FOR_FLUX1_FAL_RESULT
+from .polling import PollingPolicy
 from .root_model import RootModel
 
 
@@ -35,17 +35,31 @@ class Flux1FalBase(RootModel):
                 url=response.json().get("status_url"),
                 wait_time=WAIT_FOR_FLUX1_FAL_RESULT
             )
-            if isinstance(response, Response):
-                response = request(
-                    "GET",
-                    headers=self._headers(),
-                    url=response.json().get("response_url")
-                )
-        return response.json() if isinstance(response, Response) else response
+        return self._task_result(response)
+
+    def _task_result(self, response: any) -> any:
+        """
+        Fal returns only status after polling.
+        Get the generated result from response_url.
+        """
+        if isinstance(response, Response):
+            response = self._request(
+                "GET",
+                headers=self._headers(),
+                url=response.json().get("response_url")
+            )
+        return super()._task_result(response)
 
     def _is_task_ongoing(self, response: Response) -> bool:
         return response.json().get("status") in FAL_STATUS_IN_PROGRESS
 
+    def _polling_policy(self, wait_time: float = 5.0) -> PollingPolicy:
+        """
+        FLUX.1 images are ready in seconds. Check often, never beyond
+        wait_time.
+        """
+        return PollingPolicy(initial=0.5, max_interval=wait_time)
+
     def _config_headers(self) -> None:
         self.auth_prefix = "Key "
 
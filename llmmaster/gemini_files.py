@@ -0,0 +1,164 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+from .config import GEMINI_FILE_EXPIRY_MARGIN
+from .config import GEMINI_FILE_TTL
+
+
+class GeminiFileRegistry:
+    """
+    Files uploaded to Gemini Files API, shared by entries on the same
+    file content and API key, so that asking several questions about
+    one video uploads it once.
+    A file is reused until shortly before its server-side expiry and
+    deleted on server by release() or release_all().
+    LLMMaster releases files of its own registry at the end of each run.
+    Give a registry to LLMMaster(file_registry=...) to keep files
+    across runs until released or expired.
+    Arguments:
+      - expiry_margin: seconds before expiry to stop reusing a file
+    """
+
+    def __init__(
+        self,
+        expiry_margin: float = GEMINI_FILE_EXPIRY_MARGIN
+    ) -> None:
+        self.expiry_margin = expiry_margin if expiry_margin > 0 else 0.0
+        self._files = {}
+        self._uploads = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        path: str = '',
+        api_key: str = '',
+        upload: any = None,
+        delete: any = None
+    ) -> tuple:
+        """
+        Return (file, shared) where file is the file resource (name, uri,
+        mimeType, expirationTime and others) of content of path, and
+        shared is True if uploaded before.
+          upload: function() to upload the file and return its resource,
+            called if no valid file is registered
+          delete: function(name) to delete the file on server at release
+        Concurrent callers on the same file wait for one upload.
+        """
+        key = self.key(path, api_key)
+
+        with self._lock:
+            lock = self._uploads.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._lock:
+                record = self._files.get(key)
+            if record is not None and self._usable(record):
+                return (dict(record["file"]), True)
+
+            file = upload()
+            with self._lock:
+                # file near expiry is replaced and left to expire on server
+                self._files[key] = {
+                    "file": file,
+                    "expires": _expiration(file),
+                    "delete": delete
+                }
+
+        return (dict(file), False)
+
+    def release(self, path: str = '') -> int:
+        """
+        Delete files of content of path for any API key.
+        Return the number of files deleted on server.
+        """
+        digest = self._digest(path)
+        with self._lock:
+            keys = [k for k in self._files if k[1] == digest]
+            records = [self._files.pop(k) for k in keys]
+        return self._delete(records)
+
+    def release_all(self) -> int:
+        """
+        Delete all files of this registry.
+        Return the number of files deleted on server.
+        """
+        with self._lock:
+            records = list(self._files.values())
+            self._files = {}
+        return self._delete(records)
+
+    def key(self, path: str = '', api_key: str = '') -> tuple:
+        """
+        (API key hash, content hash) as files are private to projects.
+        """
+        owner = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return (owner, self._digest(path))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    def _usable(self, record: dict = None) -> bool:
+        return time.time() < record["expires"] - self.expiry_margin
+
+    def _digest(self, path: str = '') -> str:
+        """
+        SHA-256 of file content, cached by path, mtime and size.
+        """
+        stat = os.stat(path)
+        cache_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(cache_key)
+        if digest is not None:
+            return digest
+
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+
+        with self._lock:
+            self._digests[cache_key] = digest
+        return digest
+
+    def _delete(self, records: list = None) -> int:
+        """
+        Files still on server are deleted, errors are ignored
+        since they expire on server anyway.
+        """
+        deleted = 0
+        for record in records:
+            if time.time() >= record["expires"]:
+                continue
+            try:
+                record["delete"](record["file"]["name"])
+                deleted += 1
+            except Exception:
+                pass
+        return deleted
+
+
+def _expiration(file: dict = None) -> float:
+    """
+    Epoch time of expirationTime in RFC 3339 (e.g.
+    "2026-10-20T09:15:30.123456789Z"), or GEMINI_FILE_TTL from now.
+    """
+    value = file.get("expirationTime") if file else None
+    if not value:
+        return time.time() + GEMINI_FILE_TTL
+
+    value = value.replace("Z", "+00:00")
+    if "." in value:
+        # Python takes up to 6 digits of fraction
+        head, tail = value.split(".", 1)
+        digits = len(tail) - len(tail.lstrip("0123456789"))
+        value = f"{head}.{tail[:min(digits, 6)]}{tail[digits:]}"
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return time.time() + GEMINI_FILE_TTL
@@ -1,17 +1,28 @@
 import mimetypes
 import os
 
-import requests
+from requests.exceptions import ConnectionError
+from requests.exceptions import HTTPError
+from requests.exceptions import Timeout
 from requests.models import Response
 
+from .config import GEMINI_UPLOAD_CHUNK_SIZE
+from .config import GEMINI_UPLOAD_MAX_ATTEMPTS
 from .config import GOOGLE_GEMINI_BASE_EP
 from .config import GOOGLE_GEMINI_DELETE_EP
+from .config import GOOGLE_GEMINI_FILE_ACTIVE
+from .config import GOOGLE_GEMINI_FILE_EP
 from .config import GOOGLE_GEMINI_FILE_LIST_EP
+from .config import GOOGLE_GEMINI_FILE_PROCESSING
+from .config import GOOGLE_GEMINI_STREAM_EP
 from .config import GOOGLE_GEMINI_TTT_EP
 from .config import GOOGLE_GEMINI_TTT_PARAMS
 from .config import GOOGLE_GEMINI_UPLOAD_EP
 from .config import POSITIVE_RESPONSE_CODES
+from .config import RETRY_IDEMPOTENT_STATUS_CODES
+from .config import RETRY_STATUS_CODES
 from .config import WAIT_FOR_GOOGLE_VTT_RESULT
+from .gemini_files import GeminiFileRegistry
 from .root_model import RootModel
 
 
@@ -24,6 +35,9 @@ class GoogleGeminiBase(RootModel):
 
     def __init__(self, **kwargs) -> None:
         self.uploaded_file_path = ""
+        self.uploaded_file_name = ""
+        self.file_registry = None
+        self._own_files = None
         try:
             super().__init__(**kwargs)
         except Exception as e:
@@ -62,7 +76,8 @@ class GoogleGeminiBase(RootModel):
             }
         }
 
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{GOOGLE_GEMINI_BASE_EP}{GOOGLE_GEMINI_UPLOAD_EP}",
             params={"key": self.api_key},
             headers=headers,
@@ -75,31 +90,105 @@ class GoogleGeminiBase(RootModel):
     def _upload_file(
         self,
         upload_url: str = "",
-        file_size: int = 0
-    ) -> tuple[str, str]:
+        file_size: int = 0,
+        restart: any = None
+    ) -> dict:
         """
-        Upload file and get file URL and file name
+        Upload file and get file resource (uri, name, expirationTime etc.)
+        2026-10-18: sent in chunks of GEMINI_UPLOAD_CHUNK_SIZE. After
+        a network or server error, upload restarts from the offset
+        confirmed by server instead of the beginning of file.
+        If the offset cannot be confirmed, restart() gives the URL of
+        a new upload session and the file is sent from the beginning.
         """
-        headers = {
-            "Content-Length": str(file_size),
-            "X-Goog-Upload-Offset": "0",
-            "X-Goog-Upload-Command": "upload, finalize",
-        }
+        offset = 0
+        failures = 0
 
         with open(self.parameters["file"], "rb") as file:
-            response = requests.post(upload_url, headers=headers, data=file)
+            while True:
+                file.seek(offset)
+                chunk = file.read(GEMINI_UPLOAD_CHUNK_SIZE)
+                last = offset + len(chunk) >= file_size
+                headers = {
+                    "Content-Length": str(len(chunk)),
+                    "X-Goog-Upload-Offset": str(offset),
+                    "X-Goog-Upload-Command": (
+                        "upload, finalize" if last else "upload"
+                    ),
+                }
 
+                try:
+                    response = self._request(
+                        "POST",
+                        upload_url,
+                        headers=headers,
+                        data=chunk,
+                        retry=None
+                    )
+                    error = None
+                except (ConnectionError, Timeout) as e:
+                    response = None
+                    error = e
+
+                # chunks are safe to resend from the offset confirmed
+                if response is not None and response.status_code not in (
+                   RETRY_STATUS_CODES + RETRY_IDEMPOTENT_STATUS_CODES):
+                    response.raise_for_status()
+                    if last:
+                        return response.json()["file"]
+                    offset += len(chunk)
+                    failures = 0
+                    continue
+
+                failures += 1
+                to_wait = (
+                    self.retry_policy.wait_time(failures, response)
+                    if self.retry_policy is not None else 0.0
+                )
+                if failures >= GEMINI_UPLOAD_MAX_ATTEMPTS or to_wait is None:
+                    if error is not None:
+                        raise error
+                    response.raise_for_status()
+                self.deadline.wait(to_wait)
+
+                try:
+                    status = self._query_upload(upload_url)
+                except (ConnectionError, Timeout, HTTPError):
+                    if restart is None:
+                        raise
+                    upload_url = restart()
+                    offset = 0
+                    continue
+                if status.headers.get("X-Goog-Upload-Status") == "final":
+                    return status.json()["file"]
+                offset = int(
+                    status.headers.get("X-Goog-Upload-Size-Received", 0)
+                )
+
+    def _query_upload(self, upload_url: str = "") -> Response:
+        """
+        Ask bytes received so far by resumable upload session.
+        """
+        response = self._request(
+            "POST",
+            upload_url,
+            headers={"X-Goog-Upload-Command": "query"}
+        )
         response.raise_for_status()
-        response_json = response.json()
-
-        return response_json["file"]["uri"], response_json["file"]["name"]
+        return response
 
     def _delete_file(self, file_name: str) -> None:
         """
         Delete uploaded file
+        Sent even after deadline so that no file is left on server.
         """
         url = f"{GOOGLE_GEMINI_BASE_EP}{GOOGLE_GEMINI_DELETE_EP}/{file_name}"
-        response = requests.delete(url, params={"key": self.api_key})
+        response = self._request(
+            "DELETE",
+            url,
+            params={"key": self.api_key},
+            deadline=None
+        )
         response.raise_for_status()
 
     def _file_list(self) -> None:
@@ -107,9 +196,11 @@ class GoogleGeminiBase(RootModel):
         Get uploaded file list
         Use only for debug
         """
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{GOOGLE_GEMINI_BASE_EP}{GOOGLE_GEMINI_FILE_LIST_EP}",
-            params={"key": self.api_key}
+            params={"key": self.api_key},
+            retry=None
         )
         response.raise_for_status()
         print(f"Uploaded file list =\n{response.json()}")
@@ -124,11 +215,70 @@ class GoogleLLM(GoogleGeminiBase):
 
     def run(self) -> None:
         self.payload = {"headers": self._headers(), "json": self._body()}
+
+        if self.stream is not None:
+            self.response = self._stream_rest_api(url=self._stream_endpoint())
+            return
+
         response = self._call_rest_api(url=self._endpoint())
         self.response = (
             response.json() if isinstance(response, Response) else response
         )
 
+    def _stream_endpoint(self) -> str:
+        """
+        streamGenerateContent returns server-sent events with alt=sse.
+        """
+        ep = GOOGLE_GEMINI_BASE_EP
+        ep += GOOGLE_GEMINI_STREAM_EP.format(model=self.parameters["model"])
+        ep += f"?alt=sse&key={self.api_key}"
+        return ep
+
+    def _stream_delta(self, chunk: dict) -> str:
+        for candidate in chunk.get("candidates") or []:
+            if candidate.get("index", 0) == 0:
+                parts = (candidate.get("content") or {}).get("parts") or []
+                return "".join(part.get("text", '') for part in parts)
+        return ''
+
+    def _stream_result(self, chunks: list) -> dict:
+        """
+        Assemble chunks into the same form as generateContent.
+        Text parts are joined, other parts (e.g. function calls) are kept.
+        usageMetadata and others are taken from the latest chunk.
+        """
+        result = {}
+        candidates = {}
+
+        for chunk in chunks:
+            result.update(
+                {k: v for k, v in chunk.items() if k != "candidates"}
+            )
+
+            for candidate in chunk.get("candidates") or []:
+                index = candidate.get("index", 0)
+                merged = candidates.setdefault(index, {
+                    "content": {"parts": [], "role": "model"},
+                    "index": index
+                })
+                parts = merged["content"]["parts"]
+
+                content = candidate.get("content") or {}
+                for part in content.get("parts") or []:
+                    if ("text" in part and parts and "text" in parts[-1] and
+                       part.get("thought") == parts[-1].get("thought")):
+                        parts[-1]["text"] += part["text"]
+                    else:
+                        parts.append(dict(part))
+
+                for key, value in candidate.items():
+                    if key not in ["content", "index"]:
+                        merged[key] = value
+
+        result["candidates"] = [candidates[i] for i in sorted(candidates)]
+
+        return result
+
     def _body(self) -> dict:
         """
         See following for parameters details:
@@ -228,8 +378,19 @@ class GoogleSpeechVideoToText(GoogleGeminiBase):
     """
     Speech-to-Text (STT)
     Video-to-Text (VTT)
+    Status check polls processing state of the uploaded file, and the
+    request is sent once when the file gets ACTIVE. The request is kept
+    in this instance, so the task cannot be resumed by another instance.
+    Poller only checks the file state, the request runs in a thread of
+    this entry, see RootModel.blocking_result.
+    2026-10-18: uploaded file is shared with entries on the same file
+    through self.file_registry (GeminiFileRegistry) set by LLMMaster.
+    Without registry, file is deleted once the task is over as before.
     """
 
+    resumable = False
+    blocking_result = True
+
     def run(self) -> None:
         self.response = self._call_llm()
 
@@ -238,12 +399,30 @@ class GoogleSpeechVideoToText(GoogleGeminiBase):
         file_size = os.path.getsize(self.parameters["file"])
         display_name = os.path.basename(self.parameters["file"])
 
+        def start() -> str:
+            return self._upload_url(mime_type, file_size, display_name)
+
+        def upload() -> dict:
+            return self._upload_file(start(), file_size, restart=start)
+
+        registry = self.file_registry
+        if registry is None:
+            # standalone entry uploads for itself
+            registry = self._own_files = GeminiFileRegistry()
+
         try:
-            upload_url = self._upload_url(mime_type, file_size, display_name)
-            file_uri, file_name = self._upload_file(upload_url, file_size)
+            file, shared = registry.acquire(
+                self.parameters["file"],
+                self.api_key,
+                upload=upload,
+                delete=self._delete_file
+            )
         except Exception as e:
             return f"Error while uploading file: {e}"
 
+        file_uri = file["uri"]
+        self.metadata["file"] = {"name": file["name"], "shared": shared}
+
         self.payload = {
             "headers": self._headers(),
             "json": {
@@ -261,26 +440,62 @@ class GoogleSpeechVideoToText(GoogleGeminiBase):
             }
         }
 
-        response = self._fetch_result()
+        self.uploaded_file_name = file["name"]
+
+        response = self._fetch_result(
+            url=self._file_url(file["name"]),
+            wait_time=WAIT_FOR_GOOGLE_VTT_RESULT
+        )
+
+        return self._task_result(response)
 
-        self._delete_file(file_name=file_name)
+    def _file_url(self, file_name: str = '') -> str:
+        ep = GOOGLE_GEMINI_BASE_EP
+        ep += GOOGLE_GEMINI_FILE_EP.format(name=file_name)
+        ep += f"?key={self.api_key}"
+        return ep
 
-        return response.json() if isinstance(response, Response) else response
+    def _check_task(self, url: str = '') -> Response:
+        """
+        Uploaded file is not usable until processed by Google.
+        Get the file state instead of sending the request for nothing.
+        2026-10-18: replaced resending generateContent until accepted.
+        """
+        return self._request("GET", url)
 
-    def _fetch_result(self) -> any:
-        response = None
-        flg = True
-        while flg:
-            response = requests.request(
-                method="POST",
-                url=self._endpoint(),
-                **self.payload
+    def _is_task_ongoing(self, response: Response) -> bool:
+        return (
+            response.status_code in POSITIVE_RESPONSE_CODES and
+            response.json().get("state") == GOOGLE_GEMINI_FILE_PROCESSING
+        )
+
+    def _task_result(self, response: any) -> any:
+        """
+        Send the request once the file is ACTIVE. Errors of file state
+        check and failed processing are returned as they are.
+        Delete uploaded file once the task is over, unless it is kept
+        in self.file_registry for other entries.
+        Kept while detached because the task is still pending.
+        """
+        if isinstance(response, Response):
+            response = self._generate(response)
+        if not self.detached and self._own_files is not None:
+            self._own_files.release_all()
+        return super()._task_result(response)
+
+    def _generate(self, file_response: Response) -> any:
+        if file_response.status_code not in POSITIVE_RESPONSE_CODES:
+            return (
+                f"Something went wrong. {file_response.status_code} - "
+                f"{file_response.text}"
             )
-            if response.status_code in POSITIVE_RESPONSE_CODES:
-                flg = False
-            else:
-                self._wait(WAIT_FOR_GOOGLE_VTT_RESULT)
-        return response
+
+        file = file_response.json()
+        if file.get("state") != GOOGLE_GEMINI_FILE_ACTIVE:
+            error = file.get("error", {}).get("message", "")
+            return f"Something went wrong. File {file.get('state')}. {error}"
+
+        return self._call_rest_api(url=self._endpoint())
 
     def _verify_arguments(self, **kwargs) -> dict:
         """
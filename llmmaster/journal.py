@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+
+from requests.models import Response
+
+from .batch import to_jsonable
+from .cache import strip_secrets
+from .cache import to_record
+from .cache import to_response
+from .config import JOURNAL_COMPLETED
+from .config import JOURNAL_FAILED
+from .config import JOURNAL_QUEUED
+from .config import JOURNAL_SUBMITTED
+
+
+class RunJournal:
+    """
+    Append-only record of entry states, so that a run stopped halfway
+    (e.g. process killed) resumes without paying for finished entries
+    again. One JSON line per state change, the last line of a label wins:
+      - queued: entry is about to run
+      - submitted: async task accepted by provider, with task to poll
+      - completed: final result, kept in the journal itself or in the
+        sink of run_batch()
+      - failed: error result, run again on resume
+    Give the same path to LLMMaster(journal=...) after restart.
+    Completed entries are skipped and submitted ones are polled by task
+    instead of being submitted again (Tripo, Meshy, Luma AI, Runway,
+    Skybox and others polling by task URL).
+    Entries not resumable from task (Google VTT) run again.
+    Response results are restored as Response with status code,
+    headers and content, see result().
+    """
+
+    def __init__(self, path: str = '') -> None:
+        self.path = path
+        self.states = self._load()
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._end_line()
+
+    def state(self, label: str = '') -> dict:
+        """
+        The last record of label, or None if never recorded.
+        """
+        return self.states.get(label)
+
+    def is_completed(self, label: str = '') -> bool:
+        record = self.states.get(label)
+        return record is not None and record["state"] == JOURNAL_COMPLETED
+
+    def result(self, label: str = '') -> any:
+        """
+        Result of completed entry in the type given to completed().
+        """
+        record = self.states.get(label) or {}
+        if record.get("result_type") == "response":
+            return to_response(record["result"])
+        return record.get("result")
+
+    def task(self, label: str = '') -> dict:
+        """
+        Task of submitted entry to resume, or None.
+        """
+        record = self.states.get(label)
+        if record is None or record["state"] != JOURNAL_SUBMITTED:
+            return None
+        return dict(record["task"])
+
+    def queued(self, label: str = '') -> None:
+        self._append({"label": label, "state": JOURNAL_QUEUED})
+
+    def submitted(self, label: str = '', task: dict = None) -> None:
+        task = {k: v for k, v in task.items() if k != "webhook"}
+        task["url"] = strip_secrets(task["url"])
+        self._append({"label": label, "state": JOURNAL_SUBMITTED,
+                      "task": task})
+
+    def completed(
+        self,
+        label: str = '',
+        result: any = None,
+        metadata: dict = None,
+        keep_result: bool = True
+    ) -> None:
+        """
+        keep_result: False if result is kept elsewhere (e.g. sink).
+        """
+        record = {"label": label, "state": JOURNAL_COMPLETED}
+        if keep_result and isinstance(result, Response):
+            record["result"] = to_record(result)
+            record["result_type"] = "response"
+        elif keep_result:
+            record["result"] = result
+        if keep_result:
+            record["metadata"] = metadata
+        self._append(record)
+
+    def failed(self, label: str = '', error: str = '') -> None:
+        """
+        Record error result. A task submitted before is not polled
+        again, since it may have failed on provider side.
+        """
+        self._append({"label": label, "state": JOURNAL_FAILED,
+                      "error": str(error)})
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _append(self, record: dict) -> None:
+        record["time"] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False, default=to_jsonable)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.states[record["label"]] = json.loads(line)
+
+    def _end_line(self) -> None:
+        """
+        Close a line broken by earlier process before appending.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(0, 2)
+            if file.tell() == 0:
+                return
+            file.seek(-1, 2)
+            broken = file.read(1) != b"\n"
+        if broken:
+            self._file.write("\n")
+            self._file.flush()
+
+    def _load(self) -> dict:
+        """
+        Read existing journal. A broken last line (e.g. killed while
+        writing) is ignored.
+        """
+        states = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    states[record["label"]] = record
+        except FileNotFoundError:
+            pass
+        return states
@@ -21,10 +21,68 @@ class LLMBase(RootModel):
             raise Exception(msg) from e
 
     def _call_llm(self, url: str = '') -> any:
+        """
+        2026-10-18: stream response if entry option `stream` is given.
+        """
         self.payload = {"headers": self._headers(), "json": self._body()}
+        if self.stream is not None:
+            return self._stream_rest_api(url=url)
         response = self._call_rest_api(url=url)
         return response.json() if isinstance(response, Response) else response
 
+    def _stream_delta(self, chunk: dict) -> str:
+        """
+        OpenAI-compatible chunk: choices[0].delta.content
+        (or choices[0].text for completion style endpoints).
+        """
+        for choice in chunk.get("choices") or []:
+            if choice.get("index", 0) == 0:
+                delta = choice.get("delta") or {}
+                return delta.get("content") or choice.get("text") or ''
+        return ''
+
+    def _stream_result(self, chunks: list) -> dict:
+        """
+        Assemble OpenAI-compatible chunks into a chat completion.
+        String fields of delta (content, reasoning, etc.) are joined,
+        tool call fragments are merged by index.
+        Other top-level fields (id, usage, citations, etc.) are taken
+        from the latest chunk.
+        """
+        result = {}
+        choices = {}
+
+        for chunk in chunks:
+            result.update({k: v for k, v in chunk.items() if k != "choices"})
+
+            for choice in chunk.get("choices") or []:
+                index = choice.get("index", 0)
+                merged = choices.setdefault(index, {
+                    "index": index,
+                    "message": {"role": "assistant", "content": ""},
+                    "finish_reason": None
+                })
+                message = merged["message"]
+
+                for key, value in (choice.get("delta") or {}).items():
+                    if key == "tool_calls":
+                        _merge_tool_calls(message, value or [])
+                    elif isinstance(value, str) and key != "role":
+                        message[key] = (message.get(key) or '') + value
+                    elif value is not None:
+                        message[key] = value
+
+                if choice.get("text"):
+                    merged["text"] = merged.get("text", '') + choice["text"]
+
+                if choice.get("finish_reason"):
+                    merged["finish_reason"] = choice["finish_reason"]
+
+        result["object"] = "chat.completion"
+        result["choices"] = [choices[index] for index in sorted(choices)]
+
+        return result
+
     def _body(self) -> dict:
         """
         Make request body for LLM.
@@ -38,11 +96,12 @@ class LLMBase(RootModel):
           - top_p: float
           - top_k: int
         2025-01-12: system_prompt is added.
+        2026-10-18: stream is True with entry option `stream`.
         """
         body = {
             "model": self.parameters["model"],
             "messages": [],
-            "stream": False,
+            "stream": self.stream is not None,
         }
 
         if "system_prompt" in self.parameters:
@@ -109,3 +168,26 @@ class LLMBase(RootModel):
                 parameters["top_k"] = TOP_K
 
         return parameters
+
+
+def _merge_tool_calls(message: dict, fragments: list) -> None:
+    """
+    Merge streamed tool call fragments into message["tool_calls"].
+    Arguments of function arrive in pieces of JSON string.
+    """
+    tool_calls = message.setdefault("tool_calls", [])
+
+    for fragment in fragments:
+        index = fragment.get("index", len(tool_calls))
+        while len(tool_calls) <= index:
+            tool_calls.append({"function": {"name": "", "arguments": ""}})
+        tool_call = tool_calls[index]
+
+        for key in ["id", "type"]:
+            if fragment.get(key):
+                tool_call[key] = fragment[key]
+
+        function = fragment.get("function") or {}
+        for key in ["name", "arguments"]:
+            if function.get(key):
+                tool_call["function"][key] += function[key]
@@ -1,14 +1,22 @@
+import asyncio
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from .config import ANTHROPIC_KEY_NAME
 from .config import CEREBRAS_KEY_NAME
+from .config import CANCELLED_MESSAGE
 from .config import CLASS
 from .config import DALLE_KEY_NAME
 from .config import DEEPSEEK_KEY_NAME
+from .config import DEFAULT_MAX_WORKERS
 from .config import DEFAULT_MODEL
+from .config import DOWNLOAD_MAX_WORKERS
 from .config import DUMMY_KEY_NAME
 from .config import ELEVENLABS_KEY_NAME
+from .config import EXECUTOR_THREAD
 from .config import FAL_KEY_NAME
 from .config import GOOGLE_KEY_NAME
 from .config import GROQ_KEY_NAME
@@ -25,13 +33,22 @@ from .config import RUNWAY_KEY_NAME
 from .config import SAMBANOVA_KEY_NAME
 from .config import SKYBOX_KEY_NAME
 from .config import STABLE_DIFFUSION_KEY_NAME
+from .config import SKIPPED_MESSAGE
+from .config import STATUS_CANCELLED
+from .config import STATUS_SKIPPED
+from .config import STATUS_TIMED_OUT
 from .config import SUMMON_LIMIT
 from .config import TRIPO_KEY_NAME
 from .config import WAIT_FOR_STARTING
 from .config import XAI_KEY_NAME
 
 from .anthropic_models import AnthropicLLM
+from .batch import iter_entries
+from .batch import open_sink
+from .cache import ResponseCache
+from .cache import strip_secrets
 from .cerebras_models import CerebrasLLM
+from .concurrency import AdaptiveConcurrency
 from .deepseek_models import DeepSeekLLM
 from .elevenlabs_models import ElevenLabsAudioIsolation
 from .elevenlabs_models import ElevenLabsDub
@@ -39,9 +56,19 @@ from .elevenlabs_models import ElevenLabsTextToSoundEffect
 from .elevenlabs_models import ElevenLabsTextToSpeech
 from .elevenlabs_models import ElevenLabsVoiceChanger
 from .elevenlabs_models import ElevenLabsVoiceDesign
+from .deadline import Deadline
+from .download import AssetStore
+from .executor import LaunchPolicy
+from .executor import NOT_STARTED
+from .executor import STILL_RUNNING
+from .executor import arun_job
+from .executor import run_job
+from .executor import submit_job
+from .executor import create_executor
 from .flux1_fal_models import Flux1FalImageToImage
 from .flux1_fal_models import Flux1FalKontext
 from .flux1_fal_models import Flux1FalTextToImage
+from .gemini_files import GeminiFileRegistry
 from .google_models import GoogleLLM
 from .google_models import GoogleSpeechVideoToText
 from .groq_models import GroqLLM
@@ -50,6 +77,7 @@ from .groq_models import GroqTextToSpeech
 from .inceptionlabs_models import InceptionLabsEdit
 from .inceptionlabs_models import InceptionLabsFIM
 from .inceptionlabs_models import InceptionLabsLLM
+from .journal import RunJournal
 from .lumaai_models import LumaAIImageToImage
 from .lumaai_models import LumaAIImageToVideo
 from .lumaai_models import LumaAIReframeImage
@@ -71,15 +99,28 @@ from .openai_models import OpenAISpeechToText
 from .openai_models import OpenAITextToImage
 from .openai_models import OpenAITextToSpeech
 from .perplexity_models import PerplexityLLM
+from .pipeline import RefError
+from .pipeline import dependencies
+from .pipeline import resolve_refs
+from .poller import Poller
+from .poller import get_poller
+from .race import HedgePolicy
+from .race import is_success
+from .ratelimit import RateLimiter
+from .ratelimit import get_rate_limiter
 from .replica_models import ReplicaTextToSpeech
+from .retry import RetryPolicy
 from .runway_models import RunwayImageToVideo
 from .sambanova_models import SambaNovaLLM
+from .singleflight import SingleFlight
 from .skybox_models import SkyboxPanoramaToImageVideo
 from .skybox_models import SkyboxTextToPanorama
 from .stable_diffusion_models import StableDiffusionImageTo3D
 from .stable_diffusion_models import StableDiffusionImageToImage
 from .stable_diffusion_models import StableDiffusionImageToVideo
 from .stable_diffusion_models import StableDiffusionTextToImage
+from .timing import chrome_trace
+from .timing import write_trace
 from .tripo_models import TripoAnimationPreRigCheck
 from .tripo_models import TripoAnimationRetarget
 from .tripo_models import TripoAnimationRig
@@ -90,7 +131,10 @@ from .tripo_models import TripoRefineModel
 from .tripo_models import TripoStylization
 from .tripo_models import TripoTextTo3D
 from .tripo_models import TripoTextureModel
+from .transport import Transport
+from .transport import get_transport
 from .voicevox_models import VoicevoxTextToSpeech
+from .webhook import WebhookServer
 from .xai_models import XAILLM
 from .xai_models import XAITextToImage
 
@@ -429,11 +473,18 @@ class LLMMaster:
          (optional) set summon_limit and wait_for_starting.
          Default of summon_limit is 100 and wait_for_starting is 1 second.
          wait_for_starting must not be shorter than 1 second.
+         (optional) set executor (`thread` or `pool`), max_workers,
+         launch_policy, transport, retry_policy, retry_policies, poller,
+         webhook, cache, rate_limiter, concurrency, journal, dedup and
+         file_registry. See each class for details, None for defaults.
       2. (optional) load API keys with set_api_keys() method from text file.
       3. call summon() to set a new LLM/AI entry with parameters.
          Use pack_parameters() to make parameters into dictionary.
-      4. call run() to start working for each entry.
-      5. access self.results to get results for each LLM/AI entry.
+      4. call run() to start working for each entry, or arun() in asyncio.
+         See also run_iter(), run_batch(), run_graph(), race(), submit()
+         and collect().
+      5. access self.results to get results for each LLM/AI entry,
+         and self.metadata for attempts and timing of each entry.
       6. call dismiss() to clear entries and results, then finish work.
     2024-09-03: added `api_key_pairs` for one-time use.
     """
@@ -441,11 +492,26 @@ class LLMMaster:
     def __init__(
         self,
         summon_limit: int = SUMMON_LIMIT,
-        wait_for_starting: float = WAIT_FOR_STARTING
+        wait_for_starting: float = WAIT_FOR_STARTING,
+        executor: any = EXECUTOR_THREAD,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        launch_policy: LaunchPolicy = None,
+        transport: Transport = None,
+        retry_policy: RetryPolicy = None,
+        retry_policies: dict = None,
+        poller: Poller = None,
+        webhook: WebhookServer = None,
+        cache: ResponseCache = None,
+        rate_limiter: RateLimiter = None,
+        concurrency: AdaptiveConcurrency = None,
+        journal: RunJournal = None,
+        dedup: bool = False,
+        file_registry: GeminiFileRegistry = None
     ) -> None:
         self.api_key_pairs = {}
         self.instances = {}
         self.results = {}
+        self.metadata = {}
         self.elapsed_time = 0
         self.summon_limit = (
             summon_limit if summon_limit > 0 else SUMMON_LIMIT
@@ -453,6 +519,33 @@ class LLMMaster:
         self.wait_for_starting = (
             wait_for_starting if wait_for_starting > 0 else WAIT_FOR_STARTING
         )
+        self.max_workers = (
+            max_workers if max_workers > 0 else DEFAULT_MAX_WORKERS
+        )
+        self.executor = create_executor(executor, self.max_workers)
+        if launch_policy is None:
+            launch_policy = (
+                LaunchPolicy(per_second=1.0 / self.wait_for_starting)
+                if executor == EXECUTOR_THREAD else LaunchPolicy()
+            )
+        self.launch_policy = launch_policy
+        self.transport = transport if transport else get_transport()
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+        self.retry_policies = retry_policies if retry_policies else {}
+        self.poller = poller if poller else get_poller()
+        self.webhook = webhook
+        self.cache = cache
+        self.rate_limiter = (
+            rate_limiter if rate_limiter else get_rate_limiter()
+        )
+        self.concurrency = concurrency
+        self.journal = journal
+        self.single_flight = SingleFlight() if dedup else None
+        self.file_registry = (
+            file_registry if file_registry is not None
+            else GeminiFileRegistry()
+        )
+        self._owns_files = file_registry is None
 
     def summon(self, entries: dict = None) -> None:
         """
@@ -503,37 +596,903 @@ class LLMMaster:
                     api_key_pairs=self.api_key_pairs,
                     **value
                 )
-                self.instances.update(creator.create())
+                for label, instance in creator.create().items():
+                    instance.label = label
+                    self._configure_instance(instance)
+                    self.instances[label] = instance
 
             except Exception as e:
                 msg = "Error occurred while verifying or creating instance."
                 raise Exception(f"{msg} - {e}") from e
 
-    def run(self) -> None:
+    def run(self, timeout: float = None, on_complete: any = None) -> None:
         """
-        Run all instances in parallel.
+        Run all instances in parallel through the executor.
+        timeout: seconds for whole run, None for no limit.
+        Entries not finished by then get timed-out results.
+        on_complete: see run_iter()
         """
-        self.results = {}
+        if on_complete is not None or self.journal is not None:
+            for _ in self.run_iter(timeout, on_complete):
+                pass
+            return
+
+        self._prepare_run()
         start_time = time.time()
 
-        for instance in self.instances.values():
-            time.sleep(self.wait_for_starting)
-            instance.start()
+        self.executor.execute(
+            self.instances, self.launch_policy, Deadline(timeout), self.poller
+        )
 
-        for instance in self.instances.values():
-            instance.join()
+        end_time = time.time()
+        self.elapsed_time = round(end_time - start_time, 3)
+        self._end_run()
+
+        self._collect_results()
+
+    def run_iter(
+        self,
+        timeout: float = None,
+        on_complete: any = None,
+        keep_results: bool = True
+    ) -> any:
+        """
+        Same as run() but yield (label, result, timing) of each entry
+        as soon as it completes, so that the next step can start
+        without waiting for the slowest entry.
+          timeout: same as run()
+          on_complete: callback(label, result, timing) called before
+            each yield, in the thread iterating this generator
+          keep_results: False to drop each result from this master
+            (results, metadata and instance) after it is yielded
+        timing: {"elapsed": seconds from start of run to completion}
+        The executor runs in a background thread. Entries still running
+        when iteration is stopped early keep running to the end.
+        With journal, entries completed in earlier run are yielded first
+        from the journal without running.
+        """
+        self._prepare_run()
+        start_time = time.time()
+        done = queue.Queue()
+        labels = {id(instance): label for label, instance in
+                  self.instances.items()}
+        restored = self._restore_entries()
+        to_run = {}
+        for label, instance in self.instances.items():
+            instance.on_complete = done.put
+            if label in restored:
+                done.put(instance)
+            else:
+                to_run[label] = instance
+                self._journal_entry(label, instance)
+
+        def execute() -> None:
+            try:
+                self.executor.execute(
+                    to_run, self.launch_policy,
+                    Deadline(timeout), self.poller
+                )
+            finally:
+                self.elapsed_time = round(time.time() - start_time, 3)
+                self._end_run()
+                done.put(None)
+
+        worker = threading.Thread(
+            target=execute, name="llmmaster-run", daemon=True
+        )
+        worker.start()
+
+        finished = set()
+        try:
+            while len(finished) < len(self.instances):
+                instance = done.get()
+                if instance is None:
+                    # executor without completion notice: flush the rest
+                    rest = [i for i in self.instances.values()
+                            if labels[id(i)] not in finished]
+                else:
+                    rest = [instance]
+
+                for instance in rest:
+                    label = labels[id(instance)]
+                    if label in finished:
+                        continue
+                    finished.add(label)
+                    if label not in restored:
+                        self._journal_result(
+                            label, instance.response, instance.metadata
+                        )
+                    yield self._complete_entry(
+                        label, start_time, on_complete
+                    )
+                    if not keep_results:
+                        self._release_entry(label)
+
+            # all completed, executor is just closing up
+            worker.join()
+
+        finally:
+            for instance in self.instances.values():
+                instance.on_complete = None
+                instance.on_submit = None
+
+    def _restore_entries(self) -> list:
+        """
+        Set results of entries completed in the journal and return
+        their labels.
+        """
+        if self.journal is None:
+            return []
+
+        restored = []
+        for label, instance in self.instances.items():
+            if self.journal.is_completed(label):
+                record = self.journal.state(label)
+                instance.response = self.journal.result(label)
+                instance.metadata = record.get("metadata") or {}
+                restored.append(label)
+        return restored
+
+    def _journal_result(
+        self,
+        label: str = '',
+        result: any = None,
+        metadata: dict = None,
+        keep_result: bool = True
+    ) -> None:
+        """
+        Record completed entry. Timed out entry is left as it is,
+        so that it runs (or its task is polled) again on resume.
+        Failed entry is recorded as failed and runs again on resume.
+        """
+        if self.journal is None:
+            return
+        if (metadata or {}).get("status") == STATUS_TIMED_OUT:
+            return
+        if not is_success(result):
+            self.journal.failed(label, result)
+            return
+        self.journal.completed(label, result, metadata, keep_result)
+
+    def _journal_entry(self, label: str = '', instance: any = None) -> None:
+        """
+        Record entry about to run, and set task to resume if the entry
+        was submitted in earlier run.
+        """
+        if self.journal is None:
+            return
+
+        instance.resume_task = self.journal.task(label)
+        if instance.resume_task is None:
+            self.journal.queued(label)
+        if instance.resumable:
+            instance.on_submit = (
+                lambda task, label=label: self.journal.submitted(label, task)
+            )
+
+    def run_batch(
+        self,
+        entries: any = None,
+        sink: any = None,
+        window: int = None,
+        timeout: float = None,
+        on_complete: any = None
+    ) -> dict:
+        """
+        Run a large batch of entries beyond summon_limit with bounded
+        memory. Entries are read and created one by one, at most `window`
+        instances exist at a time, and each result is written to sink
+        and dropped as soon as the entry completes.
+          entries: JSON Lines file path, dictionary same as summon(),
+            or iterable of entries, see batch.iter_entries()
+          sink: JSON Lines file path, function(label, result, metadata)
+            or object with write() and close(), see batch.open_sink()
+          window: entries in flight, default 2 * max_workers
+          timeout: seconds for the whole batch, same as run()
+          on_complete: callback(label, result, timing), see run_iter()
+        Entries run in a pool of max_workers threads paced by
+        launch_policy. self.instances and self.results are not used.
+        An entry failed to create gets "Something went wrong." result.
+        With journal, entries completed in earlier run are skipped
+        (their results are in the sink already) and counted as skipped.
+        Return counts of entries in total and timed out (and skipped).
+        """
+        sink = open_sink(sink)
+        window = window if window and window > 0 else 2 * self.max_workers
+        deadline = Deadline(timeout)
+        done = queue.Queue()
+        counts = {"total": 0, "timed_out": 0}
+        if self.journal is not None:
+            counts["skipped"] = 0
+        in_flight = 0
+        start_time = time.time()
+        self._clear_flights()
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llmmaster"
+        )
+
+        def write(label: str, result: any, metadata: dict) -> None:
+            counts["total"] += 1
+            if metadata.get("status") == STATUS_TIMED_OUT:
+                counts["timed_out"] += 1
+            sink.write(label, result, metadata)
+            self._journal_result(label, result, metadata, keep_result=False)
+            if on_complete is not None:
+                timing = {"elapsed": round(time.time() - start_time, 3)}
+                on_complete(label, result, timing)
+
+        def collect(block: bool = False) -> int:
+            collected = 0
+            while True:
+                try:
+                    label, instance = done.get(block=block and not collected)
+                except queue.Empty:
+                    return collected
+                instance.on_complete = None
+                write(label, instance.response, instance.metadata)
+                collected += 1
+
+        try:
+            for label, parameters in iter_entries(entries):
+                if self.journal and self.journal.is_completed(label):
+                    counts["skipped"] += 1
+                    continue
+
+                in_flight -= collect()
+                while in_flight >= window:
+                    in_flight -= collect(block=True)
+
+                try:
+                    instance = self._create_instance(label, parameters)
+                except Exception as e:
+                    write(label, f"Something went wrong. {e}", {})
+                    continue
+
+                instance.on_complete = (
+                    lambda entry, label=label: done.put((label, entry))
+                )
+                self._journal_entry(label, instance)
+                in_flight += 1
+                self.launch_policy.acquire()
+                pool.submit(run_job, instance, deadline, self.poller)
+
+            while in_flight > 0:
+                in_flight -= collect(block=True)
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            sink.close()
+            self.elapsed_time = round(time.time() - start_time, 3)
+            self._end_run()
+
+        return counts
+
+    def race(
+        self,
+        labels: list = None,
+        timeout: float = None,
+        hedge: any = None,
+        accept: any = None
+    ) -> tuple:
+        """
+        Run entries as one race group, e.g. the same prompt summoned
+        to several providers, and return (label, result) of the first
+        successful entry, or (None, None) if none succeeded by timeout.
+        The other started entries are cancelled, see RootModel.cancel(),
+        with their requests in flight aborted, and get cancelled results
+        in self.results. Hedge backups never started get skipped
+        results. Entries unfinished at timeout get timed-out results
+        as in run().
+          labels: entries of the race in order, all entries if None
+          timeout: same as run()
+          hedge: None to start all entries at once, HedgePolicy (or
+            fixed seconds) to start the next entry only when no entry
+            has answered within the hedge delay. A failed entry starts
+            the next one at once. Latencies of all started entries are
+            recorded, time until cancelled for unfinished ones.
+          accept: function(result) judging success, is_success() if None
+        """
+        labels = list(labels) if labels else list(self.instances)
+        if isinstance(hedge, (int, float)):
+            hedge = HedgePolicy(initial=float(hedge), max_samples=0)
+        accept = accept if accept else is_success
+
+        self._prepare_run()
+        start_time = time.time()
+        deadline = Deadline(timeout)
+        done = queue.Queue()
+        started = {}
+        finished = set()
+        latencies = {}
+        winner = None
+
+        def start(label: str) -> None:
+            instance = self.instances[label]
+            instance.on_complete = lambda _, label=label: done.put(label)
+            started[label] = time.monotonic()
+            threading.Thread(
+                target=run_job, args=(instance, deadline), daemon=True
+            ).start()
+
+        waiting = list(labels)
+        try:
+            # no launch pacing, latency matters more here
+            for label in (waiting if hedge is None else waiting[:1]):
+                start(label)
+            waiting = waiting[len(started):]
+
+            while winner is None and len(finished) < len(labels):
+                if len(started) == len(finished):
+                    start(waiting.pop(0))
+                    continue
+                to_wait = hedge.delay() if hedge and waiting else None
+                try:
+                    label = done.get(timeout=deadline.clip(to_wait))
+                except queue.Empty:
+                    if deadline.expired():
+                        break
+                    if waiting:
+                        start(waiting.pop(0))
+                    continue
+
+                finished.add(label)
+                latencies[label] = time.monotonic() - started[label]
+                if accept(self.instances[label].response):
+                    winner = label
+
+        finally:
+            for label in labels:
+                self.instances[label].on_complete = None
+
+        timed_out = winner is None and deadline.expired()
+        detail = "Another entry won." if winner else "No entry succeeded."
+        for label in labels:
+            instance = self.instances[label]
+            if label in finished:
+                pass
+            elif timed_out:
+                instance.expire(
+                    STILL_RUNNING if label in started else NOT_STARTED
+                )
+            elif label in started:
+                instance.cancel(f"{CANCELLED_MESSAGE}{detail}")
+                instance.metadata["status"] = STATUS_CANCELLED
+            else:
+                instance.response = f"{SKIPPED_MESSAGE}{detail}"
+                instance.metadata["status"] = STATUS_SKIPPED
+            self.results[label] = instance.response
+            self.metadata[label] = instance.metadata
+
+        if hedge is not None:
+            # cancelled entries took at least this long
+            now = time.monotonic()
+            for label, start in started.items():
+                hedge.record(latencies.get(label, now - start))
+
+        self.elapsed_time = round(time.time() - start_time, 3)
+        self._end_run()
+
+        if winner is None:
+            return (None, None)
+        return (winner, self.results[winner])
+
+    def run_graph(
+        self,
+        entries: dict = None,
+        timeout: float = None,
+        on_complete: any = None
+    ) -> None:
+        """
+        Run entries depending on results of other entries, e.g. Tripo
+        rig of a model made by text-to-3D, without one run() per stage.
+        entries: same as summon(), and a parameter may be ref(label)
+          followed by fields of its result, see pipeline.Ref, e.g.
+          {"original_model_task_id": ref("tt3d").data.task_id}
+        timeout: seconds for the whole graph, same as run()
+        on_complete: callback(label, result, timing), see run_iter()
+        Each entry is created and started as soon as all entries it
+        refers to have completed, so that independent chains overlap
+        instead of running stage by stage. Entries run in a pool of
+        max_workers threads paced by launch_policy, and polling of async
+        tasks does not hold any thread.
+        Entries referring to a failed entry or to a missing field are
+        not run and get skipped results.
+        Instances, results and metadata are kept as summon() and run(),
+        and entries summoned before are neither run nor cleared.
+        """
+        if entries is None or not isinstance(entries, dict):
+            raise ValueError("No entries provided.")
+
+        total = len(self.instances) + len(entries)
+        if self.summon_limit < total:
+            msg = (
+                f"LLM entries must be up to {self.summon_limit} "
+                f"but {total}."
+            )
+            raise ValueError(msg)
+        duplicates = [label for label in entries if label in self.instances]
+        if duplicates:
+            raise Exception(f"Duplicate label: {duplicates[0]}")
+
+        graph = dependencies(entries)
+        dependents = {label: [] for label in graph}
+        for label, labels in graph.items():
+            for other in labels:
+                dependents[other].append(label)
+
+        self._clear_flights()
+        start_time = time.time()
+        deadline = Deadline(timeout)
+        done = queue.Queue()
+        waiting = {label: set(labels) for label, labels in graph.items()}
+        finished = set()
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llmmaster"
+        )
+
+        def launch(instance: any) -> None:
+            self.launch_policy.acquire()
+            run_job(instance, deadline, self.poller)
+
+        def start(label: str) -> None:
+            try:
+                parameters = resolve_refs(entries[label], self.results)
+            except RefError as e:
+                metadata = {"status": STATUS_SKIPPED}
+                done.put((label, f"{SKIPPED_MESSAGE}{e}", metadata))
+                return
+
+            try:
+                instance = self._create_instance(label, parameters)
+            except Exception as e:
+                done.put((label, f"Something went wrong. {e}", {}))
+                return
+
+            instance.queued_at = time.time()
+            instance.on_complete = (
+                lambda entry, label=label:
+                done.put((label, entry.response, entry.metadata))
+            )
+            self.instances[label] = instance
+            pool.submit(launch, instance)
+
+        try:
+            for label, labels in waiting.items():
+                if not labels:
+                    start(label)
+
+            while len(finished) < len(entries):
+                label, result, metadata = done.get()
+                if label in finished:
+                    continue
+                finished.add(label)
+                instance = self.instances.get(label)
+                if instance is not None:
+                    instance.on_complete = None
+                self.results[label] = result
+                self.metadata[label] = metadata
+                if on_complete is not None:
+                    timing = {"elapsed": round(time.time() - start_time, 3)}
+                    on_complete(label, result, timing)
+
+                for other in dependents[label]:
+                    waiting[other].discard(label)
+                    if not waiting[other]:
+                        start(other)
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.elapsed_time = round(time.time() - start_time, 3)
+            self._end_run()
+
+    def submit(self, timeout: float = None) -> dict:
+        """
+        Run all instances until their async generation tasks (Tripo,
+        Meshy, Luma AI, Runway, Skybox, Fal, Stable Diffusion) are
+        submitted, without waiting for the tasks to finish.
+        Return dictionary of label and handle for collect():
+          {"provider": ..., "parameters": {...}, "task": {"url": ...}}
+        Handles are JSON-serializable and have no API key.
+        Other entries (e.g. LLMs) run to the end, and their results are
+        in self.results same as run().
+        timeout: seconds for all submissions, same as run()
+        """
+        self._prepare_run()
+        start_time = time.time()
+        deadline = Deadline(timeout)
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llmmaster"
+        )
+
+        try:
+            futures = {}
+            for label, instance in self.instances.items():
+                self.launch_policy.acquire()
+                futures[label] = pool.submit(submit_job, instance, deadline)
+
+            handles = {}
+            for label, future in futures.items():
+                task = future.result()
+                if task is not None:
+                    handles[label] = self._task_handle(label, task)
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        self.elapsed_time = round(time.time() - start_time, 3)
+        self._end_run()
+
+        self._collect_results()
+        for label in handles:
+            del self.results[label]
+
+        return handles
+
+    def collect(self, handles: dict = None, timeout: float = None) -> dict:
+        """
+        Poll tasks of handles given by submit() until they finish.
+        Instances are created again from handles, so that summon() is
+        not needed and this master may be in another process with the
+        same API keys.
+        Return results by label, also kept in self.results and
+        self.metadata. Tasks not finished by timeout get timed-out
+        results, and their handles can be collected again.
+        Parameters are not checked again, since input files (e.g. image
+        of tripo_it3d) were sent at submit and may not exist here.
+        A handle failed to rebuild gets "Something went wrong." result.
+        """
+        if not handles:
+            return {}
+
+        instances = {}
+        failed = {}
+        for label, handle in handles.items():
+            try:
+                instance = self._create_instance(
+                    label, {**handle["parameters"], "verify": False}
+                )
+                instance.resume_task = dict(handle["task"])
+                instances[label] = instance
+            except Exception as e:
+                failed[label] = f"Something went wrong. {e}"
+
+        start_time = time.time()
+
+        self.executor.execute(
+            instances, self.launch_policy, Deadline(timeout), self.poller
+        )
+
+        self.elapsed_time = round(time.time() - start_time, 3)
+        self._end_run()
+
+        for label, instance in instances.items():
+            self.results[label] = instance.response
+            self.metadata[label] = instance.metadata
+        for label, result in failed.items():
+            self.results[label] = result
+            self.metadata[label] = {}
+
+        return {label: self.results[label] for label in handles}
+
+    def _task_handle(self, label: str = '', task: dict = None) -> dict:
+        """
+        Serializable handle of task submitted by submit().
+        Webhook token is only valid in this process and dropped.
+        """
+        instance = self.instances[label]
+        return {
+            "provider": instance.parameters.get("provider"),
+            "parameters": dict(instance.parameters),
+            "task": {
+                "url": strip_secrets(task["url"]),
+                "wait_time": task.get("wait_time", 5.0),
+                "started": task.get("started")
+            }
+        }
+
+    def _create_instance(
+        self,
+        label: str = '',
+        parameters: dict = None
+    ) -> any:
+        """
+        Verify parameters and create one configured instance.
+        """
+        creator = InstanceCreator()
+        creator.verify(
+            label=label, api_key_pairs=self.api_key_pairs, **parameters
+        )
+        instance = creator.create()[label]
+        instance.label = label
+        self._configure_instance(instance)
+        return instance
+
+    async def arun(
+        self,
+        timeout: float = None,
+        max_threads: int = None
+    ) -> None:
+        """
+        Run all instances as asyncio tasks in the running event loop.
+        Blocking HTTP requests are executed in a pool of max_threads
+        threads, while launch pacing and polling of async generation tasks
+        are awaited in the event loop without holding any thread.
+        Each request holds one thread until its response is read, so at
+        most max_threads requests are in flight and the others wait for
+        a free thread. Raise max_threads for many slow requests (e.g.
+        long LLM answers), not needed for polling models.
+        Cancelling arun() cancels all unfinished instances.
+        timeout: same as run()
+        max_threads: size of the thread pool, max_workers if None
+        """
+        self._prepare_run()
+        start_time = time.time()
+        deadline = Deadline(timeout)
+
+        pool = ThreadPoolExecutor(
+            max_workers=self._async_threads(max_threads),
+            thread_name_prefix="llmmaster"
+        )
+
+        tasks = []
+        try:
+            for instance in self.instances.values():
+                await self.launch_policy.aacquire()
+                tasks.append(asyncio.create_task(
+                    arun_job(instance, pool, deadline)
+                ))
+            await self._await_jobs(tasks, deadline)
+
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
         end_time = time.time()
         self.elapsed_time = round(end_time - start_time, 3)
+        self._end_run()
+
+        self._collect_results()
 
+    async def arun_iter(
+        self,
+        timeout: float = None,
+        on_complete: any = None,
+        keep_results: bool = True,
+        max_threads: int = None
+    ) -> any:
+        """
+        Asynchronous twin of run_iter(), used as
+          async for label, result, timing in master.arun_iter(): ...
+        Closing the generator (e.g. aclose() after leaving the loop)
+        cancels all unfinished entries.
+        max_threads: same as arun()
+        """
+        self._prepare_run()
+        start_time = time.time()
+        deadline = Deadline(timeout)
+        done = asyncio.Queue()
+        tasks = {}
+
+        pool = ThreadPoolExecutor(
+            max_workers=self._async_threads(max_threads),
+            thread_name_prefix="llmmaster"
+        )
+
+        async def launch() -> None:
+            for label, instance in self.instances.items():
+                await self.launch_policy.aacquire()
+                task = asyncio.create_task(
+                    arun_job(instance, pool, deadline)
+                )
+                task.add_done_callback(
+                    lambda _, label=label: done.put_nowait(label)
+                )
+                tasks[label] = task
+
+        launcher = asyncio.create_task(launch())
+        finished = []
+
+        try:
+            while len(finished) < len(self.instances):
+                try:
+                    label = await asyncio.wait_for(
+                        done.get(), deadline.remaining()
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if label in finished or tasks[label].cancelled():
+                    continue
+                finished.append(label)
+                yield self._complete_entry(label, start_time, on_complete)
+                if not keep_results:
+                    self._release_entry(label)
+
+            # deadline has passed, finished tasks may still be in queue
+            unfinished = [
+                label for label in self.instances if label not in finished
+            ]
+            await self._cancel_jobs(launcher, tasks)
+            for label in unfinished:
+                task = tasks.get(label)
+                if task is None:
+                    self.instances[label].expire(NOT_STARTED)
+                elif task.cancelled():
+                    self.instances[label].expire(STILL_RUNNING)
+                yield self._complete_entry(label, start_time, on_complete)
+                if not keep_results:
+                    self._release_entry(label)
+
+        finally:
+            await self._cancel_jobs(launcher, tasks)
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.elapsed_time = round(time.time() - start_time, 3)
+            self._end_run()
+
+    def _async_threads(self, max_threads: int = None) -> int:
+        if max_threads is not None and max_threads > 0:
+            return max_threads
+        return self.max_workers
+
+    async def _cancel_jobs(self, launcher: any, tasks: dict) -> None:
+        pending = [task for task in [launcher, *tasks.values()]
+                   if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _complete_entry(
+        self,
+        label: str = '',
+        start_time: float = 0.0,
+        on_complete: any = None
+    ) -> tuple:
+        """
+        Collect result of one entry and make an item of run_iter().
+        """
+        instance = self.instances[label]
+        self.results[label] = instance.response
+        self.metadata[label] = instance.metadata
+        timing = {"elapsed": round(time.time() - start_time, 3)}
+        if on_complete is not None:
+            on_complete(label, instance.response, timing)
+        return (label, instance.response, timing)
+
+    def _release_entry(self, label: str = '') -> None:
+        self.results.pop(label, None)
+        self.metadata.pop(label, None)
+        self.instances[label].response = ''
+        self.instances[label].metadata = {}
+
+    async def _await_jobs(self, tasks: list, deadline: Deadline) -> None:
+        """
+        Wait for tasks of arun() until deadline.
+        Unfinished tasks are cancelled and their instances expired.
+        """
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=deadline.remaining())
+        if not pending:
+            return
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for instance, task in zip(self.instances.values(), tasks):
+            if task in pending:
+                instance.expire(STILL_RUNNING)
+
+    def _prepare_run(self) -> None:
+        self.results = {}
+        self.metadata = {}
+        queued_at = time.time()
+        for instance in self.instances.values():
+            instance.metadata = {}
+            instance.queued_at = queued_at
+        self._clear_flights()
+
+    def _end_run(self) -> None:
+        """
+        Delete Gemini files uploaded in the run, unless registry was
+        given by user to keep them across runs.
+        """
+        if self._owns_files:
+            self.file_registry.release_all()
+
+    def _clear_flights(self) -> None:
+        """
+        Forget results shared in the previous run.
+        """
+        if self.single_flight is not None:
+            self.single_flight.clear()
+
+    def _collect_results(self) -> None:
         for label, instance in self.instances.items():
             buff = {label: instance.response}
             self.results.update(buff)
+            self.metadata[label] = instance.metadata
+
+    def _configure_instance(self, instance: any) -> None:
+        """
+        Share execution settings of this master with a new instance.
+        Entry options given in summon() are prior to master settings.
+        """
+        provider = instance.parameters.get("provider")
+        instance.transport = self.transport
+        instance.webhook = self.webhook
+        instance.cache = self.cache
+        key_name = ACTIVE_MODELS.get(provider, {}).get(KEY_NAME)
+        instance.rate_limit = self.rate_limiter.get(
+            key_name, instance.parameters.get("model")
+        )
+        instance.concurrency = (
+            self.concurrency.get(key_name) if self.concurrency else None
+        )
+        instance.single_flight = self.single_flight
+        if hasattr(instance, "file_registry"):
+            instance.file_registry = self.file_registry
+
+        if "retry" not in instance.options:
+            instance.retry_policy = self.retry_policies.get(
+                provider, self.retry_policy
+            )
+
+    def export_trace(self, path: str = None) -> dict:
+        """
+        Timeline of the last run in Chrome trace format (Perfetto),
+        one track per entry with queue wait, run, HTTP attempts and
+        polling. Written to path if given.
+        """
+        if path:
+            return write_trace(path, self.metadata)
+        return chrome_trace(self.metadata)
+
+    def download(
+        self,
+        store: any = None,
+        labels: list = None,
+        max_workers: int = DOWNLOAD_MAX_WORKERS
+    ) -> dict:
+        """
+        Download asset URLs in results after run (Luma AI, Meshy, Tripo,
+        Runway, Skybox, OpenAI and xAI images) concurrently over pooled
+        connections of this LLMMaster.
+        Arguments:
+          - store: AssetStore or its directory path
+          - labels: entries to download, all if None
+          - max_workers: concurrent downloads
+        Return {label: [descriptor]}, also kept in
+        metadata[label]["assets"]. See AssetStore.download().
+        """
+        if not isinstance(store, AssetStore):
+            store = AssetStore(
+                store, transport=self.transport, max_workers=max_workers
+            )
+        labels = labels if labels is not None else list(self.results)
+        assets = store.download({
+            label: self.results[label] for label in labels
+            if isinstance(self.results.get(label), (dict, list))
+        })
+        for label, records in assets.items():
+            self.metadata.setdefault(label, {})["assets"] = records
+        return assets
 
     def dismiss(self) -> None:
         self.api_key_pairs = {}
         self.instances = {}
         self.results = {}
+        self.metadata = {}
         self.elapsed_time = 0
 
     def pack_parameters(self, **kwargs) -> dict:
@@ -51,7 +51,7 @@ class LumaAIBase(RootModel):
                 url=fetch_url,
                 wait_time=WAIT_FOR_LUMAI_RESULT
             )
-        return response.json() if isinstance(response, Response) else response
+        return self._task_result(response)
 
     def _config_headers(self) -> None:
         self.extra_headers = {"Accept": "application/json"}
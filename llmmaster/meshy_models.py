@@ -40,11 +40,18 @@ class MeshyBase(RootModel):
                 url=f"{url}/{response.json().get('result')}",
                 wait_time=WAIT_FOR_MESHY_RESULT
             )
-        return response.json() if isinstance(response, Response) else response
+        return self._task_result(response)
 
     def _is_task_ongoing(self, response: Response) -> bool:
         return response.json().get("status") in MESHY_STATUS_IN_PROGRESS
 
+    def _task_progress(self, response: Response) -> float:
+        """
+        Meshy reports progress from 0 to 100.
+        """
+        progress = response.json().get("progress")
+        return progress / 100.0 if progress is not None else None
+
 
 class MeshyTextTo3D(MeshyBase):
     """
@@ -0,0 +1,106 @@
+import hashlib
+import mimetypes
+import os
+import threading
+
+from requests.models import Response
+
+from .config import OUTPUT_CHUNK_SIZE
+from .config import OUTPUT_DEFAULT_EXTENSION
+from .config import TEXT_CONTENT_TYPES
+
+
+def is_binary(response: Response = None) -> bool:
+    """
+    True if response body is media (audio, video, image, 3D model),
+    not JSON or text such as errors and LLM answers.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    content_type = content_type.split(";")[0].strip().lower()
+    if not content_type:
+        return True
+    return not (
+        content_type.startswith("text/") or
+        content_type in TEXT_CONTENT_TYPES or
+        content_type.endswith("+json")
+    )
+
+
+def save_output(
+    response: Response = None,
+    output: any = None,
+    fields: dict = None
+) -> dict:
+    """
+    Stream response body to output in chunks without keeping it in
+    memory, then close response. output is one of:
+      - file path, may include fields such as "out/{label}{ext}"
+      - existing directory (or path ending with separator):
+        file {label}{ext} is made in it
+      - file-like object with write(), not closed here
+    fields: label, provider, model and others for file name.
+    {ext} is guessed from Content-Type.
+    Return descriptor {"path", "size", "content_type", "sha256"}.
+    File is written under temporary name and renamed when complete,
+    so that a broken download never looks finished.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        if hasattr(output, "write"):
+            path = getattr(output, "name", None)
+            for chunk in response.iter_content(OUTPUT_CHUNK_SIZE):
+                output.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        else:
+            path = output_path(output, content_type, fields)
+            temp = f"{path}.{threading.get_ident()}.part"
+            try:
+                with open(temp, "wb") as file:
+                    for chunk in response.iter_content(OUTPUT_CHUNK_SIZE):
+                        file.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                os.replace(temp, path)
+            except BaseException:
+                if os.path.exists(temp):
+                    os.remove(temp)
+                raise
+    finally:
+        response.close()
+
+    return {
+        "path": path if isinstance(path, str) else None,
+        "size": size,
+        "content_type": content_type,
+        "sha256": digest.hexdigest()
+    }
+
+
+def output_path(
+    output: any = None,
+    content_type: str = '',
+    fields: dict = None
+) -> str:
+    """
+    File path for output option, with parent directories made.
+    """
+    fields = dict(fields) if fields else {}
+    mime = content_type.split(";")[0].strip().lower()
+    fields.setdefault(
+        "ext", mimetypes.guess_extension(mime) or OUTPUT_DEFAULT_EXTENSION
+    )
+    fields.setdefault("label", "output")
+
+    path = os.fspath(output)
+    if os.path.isdir(path) or path.endswith(("/", os.sep)):
+        path = os.path.join(path, "{label}{ext}")
+    path = path.format(**fields)
+
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    return path
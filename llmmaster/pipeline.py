@@ -0,0 +1,125 @@
+from .race import is_success
+
+
+class RefError(LookupError):
+    """
+    Raised when a reference cannot be resolved from the result
+    of its entry, e.g. the entry failed or the field is missing.
+    """
+
+
+class Ref:
+    """
+    Reference to a field of another entry's result in
+    LLMMaster.run_graph(), made by ref(label) followed by attributes or
+    items, e.g. ref("tt3d").data.task_id or ref("preview")["id"].
+    Give it as a parameter value (at any depth of dict or list) and it
+    is replaced by the value when the referred entry completes.
+    """
+
+    __slots__ = ("label", "path")
+
+    def __init__(self, label: str = '', path: tuple = ()) -> None:
+        self.label = label
+        self.path = tuple(path)
+
+    def __getattr__(self, name: str) -> "Ref":
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Ref(self.label, self.path + (name,))
+
+    def __getitem__(self, key: any) -> "Ref":
+        return Ref(self.label, self.path + (key,))
+
+    def __repr__(self) -> str:
+        path = "".join(
+            f".{key}" if isinstance(key, str) and key.isidentifier()
+            else f"[{key!r}]"
+            for key in self.path
+        )
+        return f"ref({self.label!r}){path}"
+
+    def resolve(self, results: dict = None) -> any:
+        """
+        Value of this reference in results {label: result}.
+        """
+        value = results.get(self.label) if results else None
+        if not is_success(value):
+            raise RefError(f"Entry {self.label} failed.")
+
+        for key in self.path:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            elif isinstance(value, list) and isinstance(key, int) and (
+               -len(value) <= key < len(value)):
+                value = value[key]
+            else:
+                raise RefError(f"{self!r} not found in result.")
+        return value
+
+
+def ref(label: str = '') -> Ref:
+    """
+    Reference to the result of entry `label`, see Ref.
+    """
+    return Ref(label)
+
+
+def find_refs(value: any = None) -> list:
+    """
+    All Ref objects in parameters of an entry.
+    """
+    if isinstance(value, Ref):
+        return [value]
+    if isinstance(value, dict):
+        return [r for item in value.values() for r in find_refs(item)]
+    if isinstance(value, (list, tuple)):
+        return [r for item in value for r in find_refs(item)]
+    return []
+
+
+def resolve_refs(value: any = None, results: dict = None) -> any:
+    """
+    Copy of parameters with each Ref replaced by its value.
+    RefError is raised if any of them cannot be resolved.
+    """
+    if isinstance(value, Ref):
+        return value.resolve(results)
+    if isinstance(value, dict):
+        return {k: resolve_refs(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(item, results) for item in value]
+    if isinstance(value, tuple):
+        return tuple(resolve_refs(item, results) for item in value)
+    return value
+
+
+def dependencies(entries: dict = None) -> dict:
+    """
+    {label: set of labels referred} of entries in summon() format.
+    ValueError is raised for reference to unknown entry or circular
+    references, before anything runs.
+    """
+    graph = {}
+    for label, parameters in entries.items():
+        graph[label] = {r.label for r in find_refs(parameters)}
+        unknown = graph[label] - set(entries)
+        if unknown:
+            msg = f"Entry {label} refers to unknown entries: {sorted(unknown)}"
+            raise ValueError(msg)
+
+    # Kahn's algorithm: entries left are on a cycle
+    waiting = {label: set(labels) for label, labels in graph.items()}
+    ready = [label for label, labels in waiting.items() if not labels]
+    while ready:
+        label = ready.pop()
+        for other, labels in waiting.items():
+            if label in labels:
+                labels.discard(label)
+                if not labels:
+                    ready.append(other)
+        waiting.pop(label)
+    if waiting:
+        raise ValueError(f"Circular references among: {sorted(waiting)}")
+
+    return graph
@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import InvalidStateError
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import POLLER_MAX_WORKERS
+from .deadline import is_timeout
+from .executor import LaunchPolicy
+
+
+class Poller:
+    """
+    Central scheduler of status checks for async generation tasks
+    (Tripo, Luma AI, Meshy, Runway, Skybox, Fal, Stable Diffusion,
+    Google VTT).
+    Entries only submit their tasks, then the poller keeps all pending
+    tasks in one priority queue ordered by the time of the next check.
+    Due checks are sent by a few worker threads, so that hundreds of
+    pending tasks do not hold hundreds of sleeping threads.
+    Arguments:
+      - max_workers: status checks sent at the same time
+      - per_second: max status checks per second, 0 for no limit
+    The scheduler thread starts on the first submit().
+    """
+
+    def __init__(
+        self,
+        max_workers: int = POLLER_MAX_WORKERS,
+        per_second: float = 0.0
+    ) -> None:
+        self.max_workers = (
+            max_workers if max_workers > 0 else POLLER_MAX_WORKERS
+        )
+        self.rate = LaunchPolicy(
+            per_second=per_second, burst=max(int(per_second), 1)
+        )
+        self._queue = []
+        self._scheduled = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pool = None
+        self._closed = False
+
+    def submit(self, instance: any) -> Future:
+        """
+        Track instance.task until it finishes.
+        First check is sent at once, then as told by PollingPolicy
+        of the instance.
+        Returned future is resolved with instance.response.
+        Cancel the future to stop tracking the task.
+        With webhook, the check is moved up when callback arrives.
+        """
+        future = Future()
+        self._start()
+        self._schedule(time.monotonic(), instance, future)
+
+        token = instance.task.get("webhook")
+        if token and instance.webhook is not None:
+            instance.webhook.subscribe(
+                token,
+                lambda: self._schedule(time.monotonic(), instance, future)
+            )
+
+        return future
+
+    def pending(self) -> int:
+        """
+        Number of tasks waiting for the next check.
+        """
+        with self._condition:
+            return len(self._scheduled)
+
+    def close(self) -> None:
+        """
+        Stop scheduler thread. Pending tasks are left unresolved.
+        """
+        with self._condition:
+            self._closed = True
+            self._queue = []
+            self._scheduled = {}
+            self._condition.notify_all()
+            pool, self._pool = self._pool, None
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self) -> None:
+        with self._condition:
+            self._closed = False
+            if self._thread is not None:
+                return
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="llmmaster-poller"
+            )
+            self._thread = threading.Thread(
+                target=self._loop, name="llmmaster-poller", daemon=True
+            )
+            self._thread.start()
+
+    def _schedule(self, due: float, instance: any, future: Future) -> None:
+        """
+        Set the next check of task. Each task has one valid entry
+        in the queue and it is only moved up, never put off.
+        """
+        with self._condition:
+            current = self._scheduled.get(future, (None, None))[0]
+            if current is not None and current <= due:
+                return
+            count = next(self._counter)
+            self._scheduled[future] = (due, count)
+            heapq.heappush(self._queue, (due, count, instance, future))
+            self._condition.notify()
+
+    def _forget(self, future: Future) -> None:
+        with self._condition:
+            self._scheduled.pop(future, None)
+
+    def _loop(self) -> None:
+        """
+        Hand due checks to worker threads in order of due time.
+        """
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._queue and self._queue[0][0] <= now:
+                        break
+                    to_wait = self._queue[0][0] - now if self._queue else None
+                    self._condition.wait(to_wait)
+                if self._closed:
+                    return
+                _, count, instance, future = heapq.heappop(self._queue)
+                if self._scheduled.get(future, (None, None))[1] != count:
+                    continue
+                self._scheduled[future] = (None, count)
+                pool = self._pool
+
+            if future.done():
+                self._forget(future)
+                instance._end_task(instance.task)
+                continue
+
+            self.rate.acquire()
+            pool.submit(self._check, instance, future)
+
+    def _check(self, instance: any, future: Future) -> None:
+        """
+        Send one status check and either reschedule or resolve the task.
+        """
+        task = instance.task
+        try:
+            response = instance._poll_task(task)
+            if response is None or instance._is_task_ongoing(response):
+                wait_time = instance._next_interval(task, response)
+                self._schedule(time.monotonic() + wait_time, instance, future)
+                return
+        except Exception as e:
+            self._resolve(instance, future, _failure(instance, task, e))
+            return
+
+        if instance.blocking_result:
+            # long request must not hold a worker for status checks
+            threading.Thread(
+                target=self._finish,
+                args=(instance, future, response),
+                name="llmmaster-result",
+                daemon=True
+            ).start()
+        else:
+            self._finish(instance, future, response)
+
+    def _finish(self, instance: any, future: Future, response: any) -> None:
+        """
+        Make the result from the final status of the task.
+        """
+        try:
+            result = instance._task_result(response)
+        except Exception as e:
+            result = _failure(instance, instance.task, e)
+        self._resolve(instance, future, result)
+
+    def _resolve(self, instance: any, future: Future, result: any) -> None:
+        task = instance.task
+        self._forget(future)
+        instance._end_task(task)
+        if future.done():
+            return
+        try:
+            instance.response = result
+            future.set_result(result)
+        except InvalidStateError:
+            pass
+
+
+def _failure(instance: any, task: dict, error: Exception) -> str:
+    if is_timeout(error):
+        return instance._task_timed_out(task["url"])
+    return f"Something went wrong. {error}"
+
+
+_default_poller = Poller()
+
+
+def get_poller() -> Poller:
+    """
+    Global poller used when no poller is given to LLMMaster.
+    """
+    return _default_poller
@@ -0,0 +1,52 @@
+from .config import POLL_BACKOFF_FACTOR
+from .config import POLL_INITIAL_INTERVAL
+from .config import POLL_MAX_INTERVAL
+
+
+class PollingPolicy:
+    """
+    Interval rule between status checks of async generation tasks.
+    Arguments:
+      - initial: seconds before the second check
+      - factor: growth of interval after each check
+      - max_interval: upper limit of a single interval
+      - use_progress: estimate remaining time from progress reported
+        by provider (e.g. Meshy, Tripo, Runway) instead of growing
+    Example:
+      PollingPolicy(initial=1.0, factor=1.5, max_interval=20.0)
+      checks after 0, 1, 2.5, 4.75, 8.1... seconds.
+    """
+
+    def __init__(
+        self,
+        initial: float = POLL_INITIAL_INTERVAL,
+        factor: float = POLL_BACKOFF_FACTOR,
+        max_interval: float = POLL_MAX_INTERVAL,
+        use_progress: bool = True
+    ) -> None:
+        self.initial = initial if initial > 0 else POLL_INITIAL_INTERVAL
+        self.factor = factor if factor >= 1.0 else 1.0
+        self.max_interval = max(max_interval, self.initial)
+        self.use_progress = use_progress
+
+    def interval(
+        self,
+        checks: int = 1,
+        elapsed: float = 0.0,
+        progress: float = None
+    ) -> float:
+        """
+        Seconds to wait after `checks` status checks.
+          elapsed: seconds since task submission
+          progress: 0.0 to 1.0 reported by provider, None if unknown
+        """
+        to_wait = min(
+            self.initial * (self.factor ** (checks - 1)), self.max_interval
+        )
+
+        if (self.use_progress and progress is not None and
+           0.0 < progress < 1.0 and elapsed > 0):
+            remaining = elapsed * (1.0 - progress) / progress
+            to_wait = min(max(remaining, self.initial), self.max_interval)
+
+        return round(to_wait, 3)
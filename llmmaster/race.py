@@ -0,0 +1,65 @@
+import threading
+from collections import deque
+
+from .config import FAILURE_PREFIXES
+from .config import HEDGE_INITIAL
+from .config import HEDGE_MAX_SAMPLES
+from .config import HEDGE_MIN_SAMPLES
+from .config import HEDGE_PERCENTILE
+
+
+class HedgePolicy:
+    """
+    When to start a backup entry in LLMMaster.race(): after entries
+    started so far have not answered within `percentile` of latencies
+    observed in earlier races, e.g. 95th percentile.
+    Arguments:
+      - percentile: 0 to 100
+      - initial: seconds to wait until min_samples are observed
+      - min_samples: latencies needed to use percentile
+      - max_samples: latest latencies kept, 0 for fixed initial delay
+    Share one HedgePolicy among races of the same kind of prompt.
+    """
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        initial: float = HEDGE_INITIAL,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        max_samples: int = HEDGE_MAX_SAMPLES
+    ) -> None:
+        self.percentile = min(max(percentile, 0.0), 100.0)
+        self.initial = initial if initial >= 0 else HEDGE_INITIAL
+        self.min_samples = max(min_samples, 1)
+        self.samples = deque(maxlen=max(max_samples, 0))
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float = 0.0) -> None:
+        """
+        Add latency of an entry, also of failed or cancelled one
+        (time until cancelled) so that slow providers raise the delay.
+        """
+        with self._lock:
+            self.samples.append(seconds)
+
+    def delay(self) -> float:
+        """
+        Seconds to wait for answer before starting a backup entry.
+        """
+        with self._lock:
+            samples = sorted(self.samples)
+        if len(samples) < self.min_samples:
+            return self.initial
+
+        # nearest-rank percentile
+        rank = max(int(-(-self.percentile * len(samples) // 100)), 1)
+        return samples[rank - 1]
+
+
+def is_success(result: any = None) -> bool:
+    """
+    False for error, timed-out and cancelled results of entries.
+    """
+    if isinstance(result, str):
+        return bool(result) and not result.startswith(tuple(FAILURE_PREFIXES))
+    return result is not None
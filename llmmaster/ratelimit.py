@@ -0,0 +1,179 @@
+import threading
+import time
+
+from .config import RATE_LIMITS
+from .deadline import Deadline
+from .deadline import DeadlineExceeded
+
+
+class RateLimit:
+    """
+    Requests-per-minute and tokens-per-minute buckets of one provider
+    (or one model of a provider), shared by all entries using it.
+    Arguments:
+      - rpm: requests per minute, 0 for no limit
+      - tpm: estimated tokens per minute, 0 for no limit
+    Each bucket holds up to one minute of quota and refills evenly.
+    A request larger than the whole bucket waits for a full bucket.
+    """
+
+    def __init__(self, rpm: float = 0.0, tpm: float = 0.0) -> None:
+        self.rpm = rpm if rpm > 0 else 0.0
+        self.tpm = tpm if tpm > 0 else 0.0
+        self._requests = self.rpm
+        self._tokens = self.tpm
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0, deadline: Deadline = None) -> float:
+        """
+        Block until one request of `tokens` is allowed.
+        Return seconds waited. DeadlineExceeded is raised without
+        using quota if the wait would pass the deadline, and when
+        the deadline expires (e.g. cancel()) during the wait.
+        """
+        deadline = deadline if deadline else Deadline()
+        to_wait = self._reserve(tokens, deadline)
+        if to_wait > 0 and deadline.wait(to_wait):
+            msg = f"Deadline expired waiting {round(to_wait, 3)} sec quota."
+            raise DeadlineExceeded(msg)
+        return to_wait
+
+    def _reserve(self, tokens: int = 0, deadline: Deadline = None) -> float:
+        """
+        Take quota and return seconds to wait for it.
+        Buckets may go negative so that concurrent callers queue up
+        in order, same as LaunchPolicy.
+        """
+        if not self.rpm and not self.tpm:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            self._requests = min(
+                self.rpm, self._requests + elapsed * self.rpm / 60.0
+            )
+            self._tokens = min(
+                self.tpm, self._tokens + elapsed * self.tpm / 60.0
+            )
+
+            to_wait = 0.0
+            if self.rpm:
+                to_wait = max(to_wait, _shortage(self._requests, 1, self.rpm))
+            if self.tpm and tokens > 0:
+                needed = min(tokens, self.tpm)
+                to_wait = max(
+                    to_wait, _shortage(self._tokens, needed, self.tpm)
+                )
+
+            remaining = deadline.remaining() if deadline else None
+            if remaining is not None and to_wait > remaining:
+                msg = f"Rate limit needs {round(to_wait, 3)} sec more."
+                raise DeadlineExceeded(msg)
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+        return to_wait
+
+
+class RateLimiter:
+    """
+    Registry of RateLimit keyed by provider KEY_NAME (e.g. GROQ_API_KEY),
+    so that every model using the same API key shares the same quota.
+    A limit for a specific model is given with key (KEY_NAME, model)
+    and used instead of the provider limit for that model.
+    Arguments:
+      - limits: dictionary of key and {"rpm": ..., "tpm": ...}
+        for the tier of your account
+      - use_defaults: True to start from the lowest-tier RATE_LIMITS
+        in config.py, overridden by limits
+    Providers without limit are not limited.
+    Example:
+      RateLimiter({
+          "GROQ_API_KEY": {"rpm": 1000, "tpm": 300000},
+          ("OPENAI_API_KEY", "gpt-4o"): {"rpm": 5000, "tpm": 800000}
+      })
+    """
+
+    def __init__(
+        self,
+        limits: dict = None,
+        use_defaults: bool = False
+    ) -> None:
+        self.limits = dict(RATE_LIMITS) if use_defaults else {}
+        self.limits.update(limits if limits else {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set(
+        self,
+        key_name: str = '',
+        rpm: float = 0.0,
+        tpm: float = 0.0,
+        model: str = None
+    ) -> None:
+        """
+        Override limit of provider or its model. Quota used so far
+        is forgotten.
+        """
+        key = (key_name, model) if model else key_name
+        with self._lock:
+            self.limits[key] = {"rpm": rpm, "tpm": tpm}
+            self._buckets.pop(key, None)
+
+    def get(self, key_name: str = '', model: str = None) -> RateLimit:
+        """
+        Return RateLimit shared for key_name and model,
+        or None if no limit is given.
+        """
+        key = (key_name, model)
+        if key not in self.limits:
+            key = key_name
+        if key not in self.limits:
+            return None
+
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = RateLimit(**self.limits[key])
+            return self._buckets[key]
+
+
+def estimate_tokens(body: any = None) -> int:
+    """
+    Rough number of input tokens in JSON request body,
+    4 characters per token. Base64 data of images, audio and PDF
+    (`data` fields and data URLs) and non-text values are not counted.
+    """
+    if isinstance(body, str):
+        return 0 if body.startswith("data:") else (len(body) + 3) // 4
+    if isinstance(body, dict):
+        return sum(
+            estimate_tokens(v) for k, v in body.items() if k != "data"
+        )
+    if isinstance(body, list):
+        return sum(estimate_tokens(v) for v in body)
+    return 0
+
+
+def _shortage(available: float, needed: float, per_minute: float) -> float:
+    if available >= needed:
+        return 0.0
+    return (needed - available) * 60.0 / per_minute
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Global rate limiter used when no rate limiter is given to LLMMaster.
+    Quota is shared across LLMMaster instances and run() calls.
+    No provider is limited until set, e.g.
+      get_rate_limiter().set("GROQ_API_KEY", rpm=1000, tpm=300000)
+    """
+    return _default_rate_limiter
@@ -0,0 +1,192 @@
+import random
+import re
+import time
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import ConnectionError
+from requests.models import Response
+
+from .config import IDEMPOTENT_METHODS
+from .config import RETRY_BACKOFF
+from .config import RETRY_IDEMPOTENT_STATUS_CODES
+from .config import RETRY_MAX_ATTEMPTS
+from .config import RETRY_MAX_BACKOFF
+from .config import RETRY_STATUS_CODES
+
+
+RESET_HEADERS = [
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset-tokens",
+    "x-ratelimit-reset",
+    "anthropic-ratelimit-requests-reset",
+    "anthropic-ratelimit-tokens-reset",
+    "ratelimit-reset"
+]
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class RetryPolicy:
+    """
+    Retry rule for HTTP requests sent through Transport.
+    Arguments:
+      - max_attempts: total attempts including the first request
+      - status_codes: HTTP status codes to retry for any method
+      - idempotent_status_codes: HTTP status codes to retry only for
+        methods safe to repeat, see IDEMPOTENT_METHODS
+      - exceptions: exception classes to retry
+      - backoff: base seconds of exponential backoff
+      - max_backoff: upper limit of a single wait
+      - jitter: random part of each wait, 0.0 (none) to 1.0 (full jitter)
+      - respect_retry_after: wait as told by Retry-After or rate-limit
+        reset headers when given by provider
+      - retry_unsafe: retry idempotent_status_codes also for POST and
+        PATCH, for providers known to fail before charging
+    Default exceptions are connection errors only, since read timeouts
+    may happen after provider has accepted a paid generation.
+    For the same reason server errors other than 503 are not retried
+    for POST by default.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        status_codes: list = RETRY_STATUS_CODES,
+        idempotent_status_codes: list = RETRY_IDEMPOTENT_STATUS_CODES,
+        exceptions: tuple = (ConnectionError,),
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+        jitter: float = 1.0,
+        respect_retry_after: bool = True,
+        retry_unsafe: bool = False
+    ) -> None:
+        self.max_attempts = max_attempts if max_attempts > 0 else 1
+        self.status_codes = list(status_codes)
+        self.idempotent_status_codes = list(idempotent_status_codes)
+        self.exceptions = tuple(exceptions)
+        self.backoff = backoff if backoff > 0 else 0.0
+        self.max_backoff = max_backoff if max_backoff > 0 else 0.0
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.respect_retry_after = respect_retry_after
+        self.retry_unsafe = retry_unsafe
+
+    def should_retry(
+        self,
+        attempt: int = 1,
+        response: Response = None,
+        error: Exception = None
+    ) -> bool:
+        """
+        Judge if another attempt is allowed after `attempt` attempts.
+        """
+        if self.max_attempts <= attempt:
+            return False
+        if error is not None:
+            return isinstance(error, self.exceptions)
+        if response is None:
+            return False
+        if response.status_code in self.status_codes:
+            return True
+        return response.status_code in self.idempotent_status_codes and (
+            self.retry_unsafe or is_idempotent(response)
+        )
+
+    def wait_time(self, attempt: int = 1, response: Response = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+        Exponential backoff with jitter, or header value if given.
+        Return None to give up when provider tells to wait longer than
+        max_backoff, since retrying earlier would be rejected again.
+        """
+        to_wait = min(self.backoff * (2 ** (attempt - 1)), self.max_backoff)
+        to_wait -= to_wait * self.jitter * random.random()
+
+        if self.respect_retry_after and response is not None:
+            told = retry_after(response)
+            if told is not None and self.max_backoff < told:
+                return None
+            if told is not None:
+                to_wait = max(told, to_wait)
+
+        return round(to_wait, 3)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def is_idempotent(response: Response = None) -> bool:
+    """
+    Judge if the request of response is safe to send again.
+    """
+    request = getattr(response, "request", None)
+    method = getattr(request, "method", None) or ''
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def retry_after(response: Response = None) -> float:
+    """
+    Seconds to wait told by provider, or None if not given.
+    Supported headers:
+      - Retry-After: seconds or HTTP date
+      - retry-after-ms: milliseconds
+      - rate-limit reset headers of OpenAI-compatible providers
+        and Anthropic, see RESET_HEADERS
+    The longest value is taken if several reset headers are given.
+    """
+    headers = response.headers if response is not None else {}
+
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000.0
+        except ValueError:
+            pass
+
+    if headers.get("Retry-After"):
+        value = parse_reset(headers["Retry-After"])
+        if value is not None:
+            return value
+
+    values = [parse_reset(headers[key]) for key in RESET_HEADERS
+              if headers.get(key)]
+    values = [value for value in values if value is not None]
+
+    return max(values) if values else None
+
+
+def parse_reset(value: str = '') -> float:
+    """
+    Convert reset header value into seconds from now. Accepted formats:
+      - seconds: "20", "1.5"
+      - epoch time in seconds: "1767225600"
+      - duration: "1s", "6m0s", "20ms"
+      - RFC 3339 or HTTP date
+    Return None if not parsable.
+    """
+    value = value.strip()
+
+    try:
+        number = float(value)
+        if 1e9 < number:
+            number -= time.time()
+        return max(number, 0.0)
+    except ValueError:
+        pass
+
+    matches = DURATION_PATTERN.findall(value)
+    if matches and "".join(n + u for n, u in matches) == value:
+        units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(n) * units[u] for n, u in matches)
+
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -1,10 +1,38 @@
+import asyncio
+import json
 import time
+from threading import Lock
 from threading import Thread
 
-from requests import request
 from requests.models import Response
 
+from .cache import cache_key
+from .cache import is_deterministic
+from .config import CACHE_HIT
+from .config import CACHE_MISS
+from .config import CONNECT_TIMEOUT
+from .config import DEDUP_SHARED
+from .config import ENTRY_OPTIONS
+from .config import POLL_INITIAL_INTERVAL
 from .config import POSITIVE_RESPONSE_CODES
+from .config import READ_TIMEOUT
+from .config import REQUEST_OK
+from .config import SSE_DONE
+from .config import STATUS_TIMED_OUT
+from .config import TIMED_OUT_MESSAGE
+from .deadline import Deadline
+from .deadline import DeadlineExceeded
+from .deadline import is_timeout
+from .output import is_binary
+from .output import save_output
+from .polling import PollingPolicy
+from .ratelimit import estimate_tokens
+from .retry import RetryPolicy
+from .streaming import TokenStream
+from .streaming import iter_sse
+from .timing import entry_timing
+from .transport import get_transport
+from .transport import strip_query
 
 
 class RootModel(Thread):
@@ -13,6 +41,14 @@ class RootModel(Thread):
     2025-01-10: renamed from BaseModel to RootModel, and revised the code.
     """
 
+    # task of _fetch_result() can be polled by another instance,
+    # even in another process, see LLMMaster.submit() and RunJournal
+    resumable = True
+
+    # _task_result() sends a long request, run in a thread of its own
+    # instead of a status check worker of Poller
+    blocking_result = False
+
     def __init__(self, api_key: str = '', **kwargs) -> None:
         """
         Arguments in kwargs:
@@ -20,16 +56,46 @@ class RootModel(Thread):
           - prompt: message or request to model
           - additional args: parameters for different model type
             (e.g. max_tokens, temperature, size, quality, etc.)
+          - entry options: see ENTRY_OPTIONS, kept in self.options
+            and not passed to parameters
         2024-09-03: added new argument `api_key`
         2025-01-17: removed self.headers and consolidated self.payload.
         2025-02-12: added _config_headers() method.
         """
         super().__init__()
+        self._response_lock = Lock()
+        self._response = ''
+        self.cancelled = False
         self.api_key = api_key
-        self.parameters = self._verify_arguments(**kwargs)
+        self.label = ''
+        self.transport = get_transport()
+        self.options = {
+            key: kwargs.pop(key) for key in ENTRY_OPTIONS if key in kwargs
+        }
+        self.retry_policy = self.options.get("retry", RetryPolicy())
+        self.deadline = Deadline()
+        self.metadata = {}
+        self.parameters = (
+            self._verify_arguments(**kwargs)
+            if self.options.get("verify", True) else kwargs
+        )
         self._config_headers()
         self.payload = {}
         self.response = ''
+        self.task = None
+        self.detached = False
+        self.webhook = None
+        self.webhook_token = None
+        self.stream = self._token_stream(self.options.get("stream"))
+        self.cache = None
+        self.rate_limit = None
+        self.concurrency = None
+        self.on_complete = None
+        self.on_submit = None
+        self.resume_task = None
+        self.single_flight = None
+        self.queued_at = time.time()
+        self.started_at = None
 
     def run(self) -> None:
         """
@@ -39,26 +105,316 @@ class RootModel(Thread):
         """
         pass
 
+    def execute(self) -> None:
+        """
+        Entry point used by executors: resume() if resume_task is given
+        (e.g. restored from RunJournal), otherwise run().
+        """
+        task, self.resume_task = self.resume_task, None
+        if task:
+            self.resume(task)
+        else:
+            self.run()
+
+    def resume(self, task: dict = None) -> None:
+        """
+        Poll task submitted by run() of an earlier process,
+        instead of submitting it again.
+        If detached, the task is only kept in self.task same as run().
+        """
+        response = self._fetch_result(
+            url=task["url"], wait_time=task.get("wait_time", 5.0)
+        )
+        if not self.detached:
+            self.response = self._task_result(response)
+
+    async def arun(self, executor: any = None) -> None:
+        """
+        Asynchronous twin of run() used by LLMMaster.arun().
+        Blocking requests are executed in `executor` (None = loop default).
+        For models polling a task, run() stops right after task submission
+        and polling is awaited on the event loop without holding a thread.
+        """
+        loop = asyncio.get_running_loop()
+
+        self.task = None
+        self.detached = True
+        try:
+            await loop.run_in_executor(executor, self.execute)
+        finally:
+            self.detached = False
+
+        if self.task is not None:
+            response = await self._afetch_result(self.task, executor)
+            self.response = await loop.run_in_executor(
+                executor, self._task_result, response
+            )
+
+    @property
+    def response(self) -> any:
+        return self._response
+
+    @response.setter
+    def response(self, value: any = None) -> None:
+        # result fixed by cancel() is kept against the worker still running
+        with self._response_lock:
+            if not self.cancelled:
+                self._response = value
+
+    def set_deadline(self, run_deadline: Deadline = None) -> None:
+        """
+        Start the clock of entry option `timeout` just before run().
+        The earlier one of entry and run deadlines is applied.
+        Start time is kept in self.started_at.
+        """
+        self.started_at = time.time()
+        self.cancelled = False
+        self.deadline = Deadline(
+            self.options.get("timeout")
+        ).earliest(run_deadline).copy()
+
+    def expire(self, detail: str = '') -> None:
+        """
+        Give up this entry when its deadline has passed outside run().
+        """
+        self.cancel(f"{TIMED_OUT_MESSAGE}{detail}")
+        self.metadata["status"] = STATUS_TIMED_OUT
+        self.complete()
+
+    def cancel(self, result: any = None) -> None:
+        """
+        Stop this entry as soon as possible, e.g. loser of race().
+        No more attempts, waits or status checks are made, and request
+        in flight is aborted, see Transport.request().
+        result: final result of this entry, if given. self.response is
+        not changed by the worker still running after cancel().
+        """
+        with self._response_lock:
+            self.cancelled = True
+            if result is not None:
+                self._response = result
+        self.deadline.expire()
+
+    def complete(self) -> None:
+        """
+        Tell on_complete(self) that self.response is final.
+        Called by executors, poller callback and expire().
+        Timing breakdown is kept in self.metadata["timing"].
+        """
+        self.metadata["timing"] = entry_timing(
+            self.queued_at, self.started_at, time.time(), self.metadata
+        )
+        callback = self.on_complete
+        if callback is not None:
+            callback(self)
+
     def _call_rest_api(self, url: str = '') -> any:
         """
-        Call common REST API using requests library.
+        Call common REST API through pooled connections of self.transport.
         Returns `requests.models.Response` that contains various data types.
         Handle the returned object in run() method of each sub-class.
+        With self.cache, identical cacheable request is served from cache
+        and self.metadata["cache"] tells hit or miss.
+        With self.single_flight, identical deterministic request shares
+        the call of another entry and self.metadata["dedup"] tells it.
+        With entry option `output`, binary body is streamed to it and
+        descriptor of the file is returned, see _save_output().
         """
         to_return = "Something went wrong. "
+        key = self._cache_key(url)
+
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metadata["cache"] = CACHE_HIT
+                return cached
+            self.metadata["cache"] = CACHE_MISS
 
         try:
-            response = request(method="POST", url=url, **self.payload)
+            flight = self._dedup_key(url)
+            if flight is None:
+                response = self._send_request(url, key)
+            else:
+                response, shared = self.single_flight.do(
+                    flight,
+                    lambda: self._send_request(url, key),
+                    self.deadline
+                )
+                if shared:
+                    self.metadata["dedup"] = DEDUP_SHARED
 
             if response.status_code in POSITIVE_RESPONSE_CODES:
-                to_return = response
+                to_return = self._save_output(response)
             else:
+                if flight is not None:
+                    self.single_flight.forget(flight)
                 msg = f"{response.status_code} - {response.text}"
                 to_return += msg
 
         except Exception as e:
+            if is_timeout(e):
+                return self._timed_out(str(e))
+            to_return += str(e)
+
+        return to_return
+
+    def _send_request(self, url: str = '', key: str = None) -> Response:
+        """
+        POST self.payload to url and keep successful response in
+        self.cache under key if given.
+        """
+        self._acquire_rate()
+        response = self._request(
+            method="POST", url=url, **self._output_kwargs(), **self.payload
+        )
+        if key is not None and response.status_code in POSITIVE_RESPONSE_CODES:
+            self.cache.put(key, response)
+        return response
+
+    def _acquire_rate(self) -> None:
+        """
+        Wait for quota of self.rate_limit before sending self.payload.
+        Seconds waited are added up in self.metadata["rate_wait"].
+        DeadlineExceeded is raised if the quota comes after deadline.
+        """
+        if self.rate_limit is None:
+            return
+
+        waited = self.rate_limit.acquire(
+            tokens=estimate_tokens(self.payload.get("json")),
+            deadline=self.deadline
+        )
+        if waited > 0:
+            self.metadata["rate_wait"] = round(
+                self.metadata.get("rate_wait", 0.0) + waited, 3
+            )
+
+    def _cache_key(self, url: str = '') -> str:
+        """
+        Key of self.payload sent to url in self.cache, or None if
+        the request is not cached. Entry option `cache` decides it,
+        otherwise only deterministic requests are cached.
+        Streaming requests and results to `output` are not cached.
+        """
+        option = self.options.get("cache")
+        if self.cache is None or self.stream is not None or option is False:
+            return None
+        if self.options.get("output") is not None:
+            return None
+        if option is None and not is_deterministic(self.payload.get("json")):
+            return None
+
+        return cache_key(
+            provider=self.parameters.get("provider", type(self).__name__),
+            method="POST",
+            url=url,
+            payload=self.payload
+        )
+
+    def _dedup_key(self, url: str = '') -> str:
+        """
+        Key of self.payload sent to url in self.single_flight, or None
+        if the request is not shared. Only deterministic requests are
+        shared, since others are expected to give different results.
+        Entry option `cache` False or `output` also turns it off.
+        """
+        if self.single_flight is None or self.stream is not None:
+            return None
+        if self.options.get("output") is not None:
+            return None
+        if self.options.get("cache") is False:
+            return None
+        if not is_deterministic(self.payload.get("json")):
+            return None
+
+        return cache_key(
+            provider=self.parameters.get("provider", type(self).__name__),
+            method="POST",
+            url=url,
+            payload=self.payload
+        )
+
+    def _output_kwargs(self) -> dict:
+        """
+        Request keywords to read body lazily for entry option `output`.
+        """
+        if self.options.get("output") is None:
+            return {}
+        return {"stream": True}
+
+    def _save_output(self, response: any) -> any:
+        """
+        With entry option `output`, stream binary body of response to it
+        and return descriptor {"path", "size", "content_type", "sha256"}
+        instead of Response, so that results do not hold media in memory.
+        Other responses (e.g. JSON) are read and returned as they are.
+        """
+        output = self.options.get("output")
+        if output is None or not isinstance(response, Response):
+            return response
+        if not is_binary(response):
+            # read body now, same as without `output`
+            response.content
+            return response
+
+        fields = {
+            "label": self.label if self.label else type(self).__name__,
+            "provider": self.parameters.get("provider", ''),
+            "model": self.parameters.get("model", '')
+        }
+        return save_output(response, output, fields)
+
+    def _stream_rest_api(self, url: str = '') -> any:
+        """
+        Streaming twin of _call_rest_api() for server-sent events.
+        Each text delta is given to self.stream as soon as it arrives,
+        then assembled result is returned in the same form as
+        non-streaming response. Implement _stream_delta() and
+        _stream_result() in sub-class.
+        Time to the first delta is kept in self.metadata["first_token"].
+        """
+        to_return = "Something went wrong. "
+        self.stream.open()
+        start = time.monotonic()
+
+        try:
+            self._acquire_rate()
+            response = self._request(
+                method="POST", url=url, stream=True, **self.payload
+            )
+
+            if response.status_code not in POSITIVE_RESPONSE_CODES:
+                msg = f"{response.status_code} - {response.text}"
+                return to_return + msg
+
+            chunks = []
+            with response:
+                for data in iter_sse(response):
+                    if self.deadline.expired():
+                        raise DeadlineExceeded("Deadline passed in stream.")
+                    if data == SSE_DONE:
+                        break
+                    chunk = json.loads(data)
+                    if isinstance(chunk, dict) and chunk.get("error"):
+                        return to_return + json.dumps(chunk["error"])
+                    chunks.append(chunk)
+                    delta = self._stream_delta(chunk)
+                    if delta:
+                        self.metadata.setdefault(
+                            "first_token", round(time.monotonic() - start, 3)
+                        )
+                        self.stream.put(delta)
+
+            to_return = self._stream_result(chunks)
+
+        except Exception as e:
+            if is_timeout(e):
+                return self._timed_out(str(e))
             to_return += str(e)
 
+        finally:
+            self.stream.close()
+
         return to_return
 
     def _fetch_result(
@@ -70,18 +426,253 @@ class RootModel(Thread):
         Common function to fetch result through GET request.
           url: endpoint that must include task_id or other identifier.
           wait_time: time to wait for next GET request.
+        If detached, only keep url and wait_time in self.task and return it.
+        Polling stops with timed-out result when self.deadline passes.
+        Interval follows PollingPolicy (see _next_interval()) unless
+        webhook callback replaces polling (see _poll_task()).
+        on_submit(task) is called for RunJournal.
         """
-        headers = self._headers()
+        task = {"url": url, "wait_time": wait_time, "started": time.time()}
+        if self.webhook_token:
+            task["webhook"] = self.webhook_token
+        if self.on_submit is not None:
+            self.on_submit(task)
+
+        if self.detached:
+            self.task = task
+            return self.task
+
         flg = True
-        while flg:
-            response = request(method="GET", url=url, headers=headers)
-            if self._is_task_ongoing(response):
-                self._wait(wait_time)
-            else:
-                flg = False
+        try:
+            while flg:
+                response = self._poll_task(task)
+                if response is None or self._is_task_ongoing(response):
+                    self._wait_task(task, self._next_interval(task, response))
+                else:
+                    flg = False
+        except Exception as e:
+            if is_timeout(e):
+                return self._task_timed_out(url)
+            raise
+        finally:
+            self._end_task(task)
 
         return response
 
+    async def _afetch_result(
+        self,
+        task: dict = None,
+        executor: any = None
+    ) -> any:
+        """
+        Asynchronous twin of _fetch_result() for task kept in detached run.
+        Waiting for next GET request does not block any thread.
+        """
+        loop = asyncio.get_running_loop()
+        flg = True
+        try:
+            while flg:
+                response = await loop.run_in_executor(
+                    executor, self._poll_task, task
+                )
+                if response is None or self._is_task_ongoing(response):
+                    await self._await_task(
+                        task, self._next_interval(task, response)
+                    )
+                else:
+                    flg = False
+        except Exception as e:
+            if is_timeout(e):
+                return self._task_timed_out(task["url"])
+            raise
+        finally:
+            self._end_task(task)
+
+        return response
+
+    def _poll_task(self, task: dict) -> Response:
+        """
+        Get the latest status of task.
+        Callback received by webhook is used if any, otherwise status
+        check is sent. Return None if waiting for webhook callback
+        without status check until fallback time.
+        """
+        token = task.get("webhook")
+        if token and self.webhook is not None:
+            payload = self.webhook.take(token)
+            if payload is not None:
+                return self._webhook_response(payload)
+            if self._webhook_remaining(task) > 0:
+                return None
+
+        task["polls"] = task.get("polls", 0) + 1
+        return self._check_task(task["url"])
+
+    def _wait_task(self, task: dict, to_wait: float) -> None:
+        """
+        Sleep until next status check, or until webhook callback.
+        """
+        token = task.get("webhook")
+        if token and self.webhook is not None:
+            self.webhook.wait(token, to_wait)
+        else:
+            self._wait(to_wait)
+
+    async def _await_task(self, task: dict, to_wait: float) -> None:
+        """
+        Asynchronous twin of _wait_task().
+        """
+        token = task.get("webhook")
+        if not token or self.webhook is None:
+            await asyncio.sleep(to_wait)
+            return
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        self.webhook.subscribe(
+            token, lambda: loop.call_soon_threadsafe(event.set)
+        )
+        try:
+            await asyncio.wait_for(event.wait(), to_wait)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.webhook.subscribe(token, None)
+
+    def _end_task(self, task: dict) -> None:
+        """
+        Close webhook inbox of task after polling, and keep polling
+        window in self.metadata["polling"].
+        """
+        self.metadata["polling"] = {
+            "started": task.get("started"),
+            "ended": time.time(),
+            "polls": task.get("polls", 0)
+        }
+        if task.get("webhook") and self.webhook is not None:
+            self.webhook.release(task["webhook"])
+
+    def _webhook_url(self) -> str:
+        """
+        Register this entry to self.webhook and return callback URL
+        to give provider, or None if webhook is not used.
+        Call this method in _body() of models supporting webhook.
+        """
+        if self.webhook is None:
+            return None
+        self.webhook_token = self.webhook.register()
+        return self.webhook.url(self.webhook_token)
+
+    def _webhook_remaining(self, task: dict) -> float:
+        """
+        Seconds left until polling starts as fallback of webhook.
+        """
+        elapsed = time.time() - task.get("started", time.time())
+        return max(self.webhook.fallback_after - elapsed, 0.0)
+
+    def _webhook_response(self, payload: dict) -> Response:
+        """
+        Convert webhook payload into the same form as status response,
+        so that _is_task_ongoing() and _task_result() can handle it.
+        Override this method if payload differs from status response.
+        """
+        response = Response()
+        response.status_code = REQUEST_OK
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(payload).encode("utf-8")
+        return response
+
+    def _check_task(self, url: str = '') -> Response:
+        """
+        Send one status check of the task submitted by run().
+        Used by _fetch_result(), _afetch_result() and Poller.
+        """
+        return self._request(method="GET", url=url, headers=self._headers())
+
+    def _next_interval(self, task: dict, response: Response) -> float:
+        """
+        Seconds until the next status check of task.
+        Number of checks is counted in task.
+        With webhook, no check is made until fallback time.
+        """
+        if response is not None:
+            task["checks"] = task.get("checks", 0) + 1
+
+        if task.get("webhook") and self.webhook is not None:
+            remaining = self._webhook_remaining(task)
+            if remaining > 0:
+                return self.deadline.clip(remaining)
+
+        policy = self.options.get("polling")
+        policy = policy if policy else self._polling_policy(task["wait_time"])
+
+        try:
+            progress = self._task_progress(response)
+        except Exception:
+            progress = None
+
+        to_wait = policy.interval(
+            checks=max(task.get("checks", 0), 1),
+            elapsed=time.time() - task.get("started", time.time()),
+            progress=progress
+        )
+
+        return self.deadline.clip(to_wait)
+
+    def _polling_policy(self, wait_time: float = 5.0) -> PollingPolicy:
+        """
+        Default PollingPolicy of this model.
+        wait_time given by model is the longest first interval.
+        Override this method to tune polling for provider.
+        """
+        return PollingPolicy(initial=min(POLL_INITIAL_INTERVAL, wait_time))
+
+    def _task_progress(self, response: Response) -> float:
+        """
+        Progress of the task from 0.0 to 1.0, or None if not reported.
+        Implement this method in sub-class if provider reports progress.
+        """
+        if response:
+            pass
+        return None
+
+    def _task_result(self, response: any) -> any:
+        """
+        Convert the final response of _fetch_result() into self.response.
+        Override this method if more steps are needed after polling.
+        """
+        return response.json() if isinstance(response, Response) else response
+
+    def _stream_delta(self, chunk: dict) -> str:
+        """
+        Text delta in a chunk of streaming response.
+        Implement this method in sub-class supporting streaming.
+        """
+        if chunk:
+            pass
+        return ''
+
+    def _stream_result(self, chunks: list) -> any:
+        """
+        Assemble chunks of streaming response into the final result.
+        Implement this method in sub-class supporting streaming.
+        """
+        return chunks
+
+    def _token_stream(self, option: any = None) -> TokenStream:
+        """
+        Entry option `stream` is one of:
+          - True: deltas are received by iterating self.stream
+          - callback(delta): called with each delta
+          - TokenStream: used as it is
+        Return None if streaming is not requested.
+        """
+        if not option:
+            return None
+        if isinstance(option, TokenStream):
+            return option
+        return TokenStream(callback=option if callable(option) else None)
+
     def _is_task_ongoing(self, response: Response) -> bool:
         """
         Check if content generation task has stopped by vendor.
@@ -143,5 +734,55 @@ class RootModel(Thread):
         """
         return kwargs
 
+    def _request(
+        self,
+        method: str = "GET",
+        url: str = '',
+        **kwargs
+    ) -> Response:
+        """
+        Send HTTP request through self.transport with retry policy,
+        attempt record, deadline, timeouts and adaptive concurrency
+        limit of this entry.
+        Each of them can be replaced by giving the same keyword,
+        e.g. retry=None to send only once.
+        """
+        kwargs.setdefault("retry", self.retry_policy)
+        kwargs.setdefault("attempts", self._attempts())
+        kwargs.setdefault("deadline", self.deadline)
+        kwargs.setdefault("timeout", self._timeout())
+        kwargs.setdefault("concurrency", self.concurrency)
+        return self.transport.request(method=method, url=url, **kwargs)
+
+    def _timeout(self) -> tuple:
+        """
+        (connect, read) timeouts of each HTTP request in seconds.
+        """
+        return (
+            self.options.get("connect_timeout", CONNECT_TIMEOUT),
+            self.options.get("read_timeout", READ_TIMEOUT)
+        )
+
+    def _timed_out(self, detail: str = '') -> str:
+        """
+        Result of this entry when deadline or timeout has come.
+        Status of cancelled entry is kept.
+        """
+        if not self.cancelled:
+            self.metadata["status"] = STATUS_TIMED_OUT
+        return f"{TIMED_OUT_MESSAGE}{detail}"
+
+    def _task_timed_out(self, url: str = '') -> str:
+        return self._timed_out(f"Task still ongoing at {strip_query(url)}")
+
+    def _attempts(self) -> list:
+        """
+        List in self.metadata to record every HTTP attempt.
+        """
+        return self.metadata.setdefault("attempts", [])
+
     def _wait(self, to_wait: float) -> None:
-        time.sleep(to_wait)
+        """
+        Sleep between status checks, cut short by cancel().
+        """
+        self.deadline.wait(to_wait)
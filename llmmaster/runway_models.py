@@ -36,7 +36,7 @@ class RunwayBase(RootModel):
                 ),
                 wait_time=WAIT_FOR_RUNWAY_RESULT
             )
-        return response.json() if isinstance(response, Response) else response
+        return self._task_result(response)
 
     def _config_headers(self) -> None:
         self.extra_headers = {"X-Runway-Version": RUNWAY_VERSION}
@@ -44,6 +44,12 @@ class RunwayBase(RootModel):
     def _is_task_ongoing(self, response: Response) -> bool:
         return response.json().get("status") in RUNWAY_STATUS_IN_PROGRESS
 
+    def _task_progress(self, response: Response) -> float:
+        """
+        Runway reports progress from 0.0 to 1.0 while running.
+        """
+        return response.json().get("progress")
+
     def _verify_arguments(self, **kwargs) -> dict:
         """
         Check required parameters:
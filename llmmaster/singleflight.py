@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+from .config import DEDUP_MAX_ENTRIES
+from .deadline import Deadline
+from .deadline import DeadlineExceeded
+
+
+class SingleFlight:
+    """
+    Share one upstream call among entries sending identical requests,
+    e.g. templated eval grids with repeated prompts.
+    The first caller of a key makes the call, callers of the same key
+    meanwhile wait for it, and later callers take the kept result.
+    Exceptions are passed to waiting callers and not kept.
+    Arguments:
+      - max_entries: results kept in LRU order, 0 for in-flight only
+    Results are kept until clear(), called by LLMMaster at each run.
+    """
+
+    def __init__(self, max_entries: int = DEDUP_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries if max_entries > 0 else 0
+        self._calls = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: str = '',
+        function: any = None,
+        deadline: Deadline = None
+    ) -> tuple:
+        """
+        Return (result of function, True if shared from another caller).
+        DeadlineExceeded is raised if the call in flight does not finish
+        by the deadline of this caller.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key], True
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if leader:
+            return self._lead(key, call, function), False
+
+        remaining = deadline.remaining() if deadline else None
+        if not call.done.wait(remaining):
+            raise DeadlineExceeded("Identical request still in flight.")
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def forget(self, key: str = '') -> None:
+        """
+        Drop kept result of key, e.g. when it is not worth sharing.
+        """
+        with self._lock:
+            self._results.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def _lead(self, key: str, call: "_Call", function: any) -> any:
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.max_entries:
+                    self._results[key] = call.result
+                    while len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+            call.done.set()
+        return call.result
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -35,7 +35,7 @@ class SkyboxBase(RootModel):
                 url=result_url.format(id=response.json().get("id")),
                 wait_time=WAIT_FOR_SKYBOX_RESULT
             )
-        return response.json() if isinstance(response, Response) else response
+        return self._task_result(response)
 
     def _config_headers(self) -> None:
         self.auth_header = X_API_KEY
@@ -63,7 +63,7 @@ class SkyboxTextToPanorama(SkyboxBase):
           - remix_imagine_id: int
           - control_image: binary/base64/url
           - control_model: str
-          - webhook_url: str
+          - webhook_url: str, given by webhook server of LLMMaster if any
         Note: prompt must be less than 2000 characters.
         """
         body = {
@@ -89,8 +89,9 @@ class SkyboxTextToPanorama(SkyboxBase):
         if "control_model" in self.parameters:
             body["control_model"] = self.parameters["control_model"]
 
-        if "webhook_url" in self.parameters:
-            body["webhook_url"] = self.parameters["webhook_url"]
+        webhook_url = self.parameters.get("webhook_url") or self._webhook_url()
+        if webhook_url:
+            body["webhook_url"] = webhook_url
 
         return body
 
@@ -111,6 +112,14 @@ class SkyboxTextToPanorama(SkyboxBase):
         response_json = response.json()
         return response_json["request"]["status"] in SKYBOX_STATUS_IN_PROGRESS
 
+    def _webhook_response(self, payload: dict) -> Response:
+        """
+        Webhook posts the request object without `request` key.
+        """
+        if "request" not in payload:
+            payload = {"request": payload}
+        return super()._webhook_response(payload)
+
 
 class SkyboxPanoramaToImageVideo(SkyboxBase):
     """
@@ -131,15 +140,16 @@ class SkyboxPanoramaToImageVideo(SkyboxBase):
             1: jpg, 2: png, 3: cube map,
             4: HDRI HDR, 5: HDRI EXR, 6: depth map,
             7: mp4 landscape, 8: mp4 portrait, 9: mp4 square
-          - webhook_url: str
+          - webhook_url: str, given by webhook server of LLMMaster if any
         """
         body = {
             "skybox_id": self.parameters["skybox_id"],
             "type_id": self.parameters["type_id"]
         }
 
-        if "webhook_url" in self.parameters:
-            body["webhook_url"] = self.parameters["webhook_url"]
+        webhook_url = self.parameters.get("webhook_url") or self._webhook_url()
+        if webhook_url:
+            body["webhook_url"] = webhook_url
 
         return body
 
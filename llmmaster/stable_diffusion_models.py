@@ -110,9 +110,7 @@ class StableDiffusionImageToImage(MultipartFormdataModel):
                 ),
                 wait_time=WAIT_FOR_STABLE_DIFFUSION_ITI_RESULT
             )
-        self.response = (
-            response.json() if isinstance(response, Response) else response
-        )
+        self.response = self._task_result(response)
 
     def _config_headers(self) -> None:
         self.extra_headers = {"Accept": "application/json"}
@@ -296,7 +294,28 @@ class StableDiffusionImageToVideo(MultipartFormdataModel):
                 ),
                 wait_time=WAIT_FOR_STABLE_DIFFUSION_ITV_RESULT
             )
-        self.response = response
+        self.response = self._task_result(response)
+
+    def _task_result(self, response: any) -> any:
+        """
+        Keep Response as it is because video is returned in binary.
+        With entry option `output`, video is saved there instead.
+        """
+        return self._save_output(response)
+
+    def _check_task(self, url: str = '') -> Response:
+        """
+        Video is streamed to entry option `output` if given.
+        """
+        response = self._request(
+            method="GET",
+            url=url,
+            headers=self._headers(),
+            **self._output_kwargs()
+        )
+        if self._is_task_ongoing(response):
+            response.close()
+        return response
 
     def _config_headers(self) -> None:
         self.extra_headers = {"Accept": "video/*"}
@@ -0,0 +1,73 @@
+import queue
+import threading
+
+from requests.models import Response
+
+
+class TokenStream:
+    """
+    Text deltas of a streaming entry, see entry option `stream`.
+    Either iterate this object to receive deltas as they arrive
+    (e.g. in another thread or asyncio task while LLMMaster runs),
+    or give callback(delta) called in the worker thread.
+    self.text keeps all deltas received so far.
+    Iteration ends when the entry finishes.
+    """
+
+    def __init__(self, callback: any = None) -> None:
+        self.callback = callback
+        self.text = ''
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def open(self) -> None:
+        """
+        Reset before a new request. Called by the entry.
+        """
+        with self._lock:
+            self.text = ''
+            self._closed = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    def put(self, delta: str = '') -> None:
+        with self._lock:
+            self.text += delta
+        if self.callback is not None:
+            self.callback(delta)
+        self._queue.put(delta)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+
+    def __iter__(self) -> any:
+        while True:
+            delta = self._queue.get()
+            if delta is None:
+                return
+            yield delta
+
+
+def iter_sse(response: Response) -> any:
+    """
+    Yield data of each event in server-sent events stream.
+    Data in multiple lines is joined with newline.
+    Events without data (e.g. comments and pings) are skipped.
+    """
+    data = []
+    for line in response.iter_lines(decode_unicode=False):
+        line = line.decode("utf-8") if isinstance(line, bytes) else line
+        if not line:
+            if data:
+                yield "\n".join(data)
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+
+    if data:
+        yield "\n".join(data)
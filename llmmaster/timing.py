@@ -0,0 +1,136 @@
+import json
+
+
+def entry_timing(
+    queued: float = None,
+    started: float = None,
+    finished: float = None,
+    metadata: dict = None
+) -> dict:
+    """
+    Timing breakdown of one entry in seconds, kept in
+    metadata["timing"] when the entry completes:
+      - queued, started, finished: epoch time of each stage
+      - queue_wait: from queued (e.g. run() called) to start
+      - total: from start to finish
+      - connect: TCP and TLS handshakes of new connections
+      - ttfb: time to first byte of the first response
+      - transfer: reading response bodies
+      - retries: attempts retried after failure
+      - polls, poll_wait: status checks of async task and time between
+    HTTP figures are summed up from metadata["attempts"].
+    """
+    metadata = metadata if metadata else {}
+    attempts = metadata.get("attempts") or []
+    polling = metadata.get("polling") or {}
+    finished = finished if finished else queued
+    begun = started if started else finished
+
+    ttfb = next(
+        (a["ttfb"] for a in attempts if a.get("ttfb") is not None), None
+    )
+    timing = {
+        "queued": queued,
+        "started": started,
+        "finished": finished,
+        "queue_wait": _span(queued, begun),
+        "total": _span(started, finished),
+        "connect": _sum(attempts, "connect"),
+        "ttfb": ttfb,
+        "transfer": _sum(attempts, "transfer"),
+        "retries": len([a for a in attempts if "wait" in a]),
+        "polls": polling.get("polls", 0),
+        "poll_wait": 0.0
+    }
+
+    if polling:
+        window = _span(polling.get("started"), polling.get("ended"))
+        checks = _sum(
+            [a for a in attempts
+             if a.get("start", 0) >= polling.get("started", 0)],
+            "elapsed"
+        )
+        timing["poll_wait"] = round(max(window - checks, 0.0), 3)
+
+    return timing
+
+
+def chrome_trace(metadata: dict = None) -> dict:
+    """
+    Chrome trace (Perfetto) of a run from metadata of each label,
+    one track per entry with spans of queue wait, run, HTTP attempts
+    and polling. Open the JSON file in https://ui.perfetto.dev or
+    chrome://tracing to see concurrency and stragglers.
+    """
+    metadata = metadata if metadata else {}
+    timings = {
+        label: record["timing"] for label, record in metadata.items()
+        if isinstance(record, dict) and record.get("timing")
+    }
+    origin = min(
+        (t["queued"] for t in timings.values() if t.get("queued")),
+        default=0.0
+    )
+    events = []
+
+    def span(tid: int, name: str, start: float, end: float,
+             category: str, args: dict = None) -> None:
+        if start is None or end is None:
+            return
+        events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "pid": 1,
+            "tid": tid,
+            "ts": round((start - origin) * 1e6),
+            "dur": round(max(end - start, 0.0) * 1e6),
+            "args": args if args else {}
+        })
+
+    for tid, (label, timing) in enumerate(timings.items(), start=1):
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+            "args": {"name": label}
+        })
+        begun = timing["started"] if timing["started"] else timing["finished"]
+        span(tid, "queue", timing["queued"], begun, "queue")
+        span(tid, label, timing["started"], timing["finished"], "entry",
+             {k: v for k, v in timing.items()
+              if k not in ("queued", "started", "finished")})
+
+        record = metadata[label]
+        polling = record.get("polling")
+        if polling:
+            span(tid, "polling", polling.get("started"),
+                 polling.get("ended"), "polling",
+                 {"polls": polling.get("polls", 0)})
+
+        for attempt in record.get("attempts") or []:
+            start = attempt.get("start")
+            if start is None:
+                continue
+            span(tid, f"{attempt['method']} {attempt['status']}", start,
+                 start + attempt.get("elapsed", 0.0), "http", attempt)
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_trace(path: str = '', metadata: dict = None) -> dict:
+    """
+    Write chrome_trace() of metadata to path and return it.
+    """
+    trace = chrome_trace(metadata)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(trace, file, ensure_ascii=False, default=str)
+    return trace
+
+
+def _span(start: float = None, end: float = None) -> float:
+    if start is None or end is None:
+        return 0.0
+    return round(max(end - start, 0.0), 3)
+
+
+def _sum(attempts: list, key: str) -> float:
+    return round(sum(a.get(key) or 0.0 for a in attempts), 3)
@@ -0,0 +1,372 @@
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+from urllib.parse import urlunparse
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+from .config import POOL_MAX_AGE
+from .config import POOL_MAXSIZE
+from .deadline import Deadline
+from .deadline import DeadlineExceeded
+from .retry import NO_RETRY
+from .retry import RetryPolicy
+
+
+class Transport:
+    """
+    HTTP transport shared by all models in LLMMaster.
+    Keeps one keep-alive connection pool (requests.Session) per base
+    endpoint, e.g. https://api.openai.com or https://api.tripo3d.ai,
+    so that TCP and TLS handshakes are paid only once per host.
+    Arguments:
+      - pool_maxsize: max connections kept per base endpoint
+      - max_age: seconds until a pool is recycled, 0 for no limit
+    Sessions do not keep cookies, same as calling requests.request().
+    Requests are retried according to RetryPolicy given to request().
+    Each attempt record has start time and timing of connect, time to
+    first byte and transfer, see request().
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = POOL_MAXSIZE,
+        max_age: float = POOL_MAX_AGE
+    ) -> None:
+        self.pool_maxsize = pool_maxsize if pool_maxsize > 0 else POOL_MAXSIZE
+        self.max_age = max_age if max_age > 0 else 0.0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str = "GET",
+        url: str = '',
+        retry: RetryPolicy = None,
+        attempts: list = None,
+        deadline: Deadline = None,
+        concurrency: any = None,
+        **kwargs
+    ) -> Response:
+        """
+        Same interface as requests.request() with following additions:
+          - retry: RetryPolicy, no retry if None
+          - attempts: list to append a record of each attempt
+          - deadline: Deadline to shorten timeout and stop retry.
+            DeadlineExceeded is raised if deadline has passed,
+            also while waiting to retry. Deadline.expire() (e.g. entry
+            cancelled) aborts the request in flight, and closes the
+            response if streamed.
+          - concurrency: AdaptiveLimit to hold each attempt until
+            a slot is free and to adjust it from the response
+        Request body in stream (e.g. multipart encoder) is sent only once
+        unless it can be rewound by seek().
+        Return the last response or raise the last exception.
+        Timing in attempt record (seconds):
+          - connect: handshakes of new connections, 0 if reused
+          - ttfb: from start of attempt to response headers
+          - transfer: reading response body, None if streamed
+        """
+        retry = retry if retry else NO_RETRY
+        deadline = deadline if deadline else Deadline()
+        timeout = kwargs.pop("timeout", None)
+        positions = _stream_positions(kwargs)
+        attempt = 0
+
+        while True:
+            if deadline.expired():
+                raise DeadlineExceeded(f"Deadline passed before {method}.")
+
+            attempt += 1
+            response = None
+            error = None
+            started = time.time()
+            start = time.monotonic()
+
+            ticket = concurrency.acquire(deadline) if concurrency else None
+            _connect_time.seconds = 0.0
+            _watched.deadline = deadline
+            try:
+                response = self.session(url).request(
+                    method=method,
+                    url=url,
+                    timeout=deadline.timeout(timeout),
+                    **kwargs
+                )
+            except Exception as e:
+                error = e
+            finally:
+                _unwatch()
+            if concurrency is not None:
+                concurrency.release(ticket, response, error)
+
+            elapsed = time.monotonic() - start
+            record = {
+                "attempt": attempt,
+                "method": method,
+                "url": strip_query(url),
+                "status": (
+                    response.status_code if response is not None else None
+                ),
+                "error": str(error) if error else None,
+                "start": round(started, 6),
+                "elapsed": round(elapsed, 3),
+                "connect": round(_connect_time.seconds, 3)
+            }
+            record.update(_response_timing(response, elapsed, kwargs))
+
+            to_retry = (
+                positions is not None and
+                retry.should_retry(attempt, response, error)
+            )
+            if to_retry:
+                wait = retry.wait_time(attempt, response)
+                remaining = deadline.remaining()
+                to_retry = wait is not None and (
+                    remaining is None or wait < remaining
+                )
+                if to_retry:
+                    record["wait"] = wait
+
+            if attempts is not None:
+                attempts.append(record)
+
+            if not to_retry:
+                break
+
+            if response is not None:
+                response.close()
+            deadline.wait(record["wait"])
+            for stream, position in positions:
+                stream.seek(position)
+
+        if error is not None:
+            if deadline.expired():
+                raise DeadlineExceeded(str(error)) from error
+            raise error
+
+        if kwargs.get("stream"):
+            deadline.on_expire(response.close)
+
+        return response
+
+    def session(self, url: str = '') -> Session:
+        """
+        Return pooled session for base endpoint of url.
+        """
+        key = base_endpoint(url)
+        now = time.monotonic()
+        expired = None
+
+        with self._lock:
+            session, created = self._sessions.get(key, (None, 0.0))
+            if session is not None and self.max_age and (
+               self.max_age < now - created):
+                expired = session
+                session = None
+            if session is None:
+                session = self._new_session()
+                self._sessions[key] = (session, now)
+
+        if expired is not None:
+            expired.close()
+
+        return session
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        Transport is still usable and opens new pools on next request.
+        """
+        with self._lock:
+            sessions = [value[0] for value in self._sessions.values()]
+            self._sessions = {}
+
+        for session in sessions:
+            session.close()
+
+    def _new_session(self) -> Session:
+        session = Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = _TimedAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.monotonic()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.monotonic() - start)
+
+    def request(self, *args, **kwargs) -> None:
+        _watch(self)
+        super().request(*args, **kwargs)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.monotonic()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.monotonic() - start)
+
+    def request(self, *args, **kwargs) -> None:
+        _watch(self)
+        super().request(*args, **kwargs)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter measuring time to open new connections (TCP and TLS),
+    added up per thread for the attempt record of Transport.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+_connect_time = threading.local()
+
+
+def _add_connect_time(seconds: float) -> None:
+    _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + seconds
+
+
+_watched = threading.local()
+
+
+def _watch(connection: HTTPConnection = None) -> None:
+    """
+    Abort connection sending the request of this thread's attempt
+    when its deadline is expired, see Transport.request().
+    """
+    deadline = getattr(_watched, "deadline", None)
+    if deadline is None:
+        return
+    removes = getattr(_watched, "removes", None) or []
+    removes.append(deadline.on_expire(lambda: _abort(connection)))
+    _watched.removes = removes
+
+
+def _unwatch() -> None:
+    """
+    Stop watching after the attempt, as the connections go back
+    to the pool for other entries.
+    """
+    removes = getattr(_watched, "removes", None) or []
+    _watched.deadline = None
+    _watched.removes = None
+    for remove in removes:
+        remove()
+
+
+def _abort(connection: HTTPConnection = None) -> None:
+    """
+    Shut down socket so that the thread waiting for the response
+    gets an error at once. The connection is not reused.
+    """
+    sock = getattr(connection, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+def _response_timing(
+    response: Response = None,
+    elapsed: float = 0.0,
+    kwargs: dict = {}
+) -> dict:
+    """
+    Time to first byte and transfer of response. requests measures
+    elapsed until headers arrive, before the body is read.
+    """
+    if response is None or response.elapsed is None:
+        return {"ttfb": None, "transfer": None}
+    ttfb = response.elapsed.total_seconds()
+    if kwargs.get("stream"):
+        return {"ttfb": round(ttfb, 3), "transfer": None}
+    return {
+        "ttfb": round(ttfb, 3),
+        "transfer": round(max(elapsed - ttfb, 0.0), 3)
+    }
+
+
+def _stream_positions(kwargs: dict = {}) -> list:
+    """
+    Find file-like objects in request body to rewind before retry.
+    Return list of (stream, position), or None if any is not seekable.
+    """
+    candidates = [kwargs.get("data")]
+    files = kwargs.get("files") or {}
+    values = files.values() if isinstance(files, dict) else files
+    for value in values:
+        candidates.append(value[1] if isinstance(value, tuple) else value)
+
+    positions = []
+    for candidate in candidates:
+        if candidate is None or not hasattr(candidate, "read"):
+            continue
+        try:
+            positions.append((candidate, candidate.tell()))
+        except Exception:
+            return None
+
+    return positions
+
+
+def strip_query(url: str = '') -> str:
+    """
+    Remove query string so that API keys in URL are not recorded.
+    """
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(query="", fragment=""))
+
+
+def base_endpoint(url: str = '') -> str:
+    """
+    Return scheme and host of url as key of connection pool.
+    """
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+_default_transport = Transport()
+
+
+def get_transport() -> Transport:
+    """
+    Global transport used when no transport is given to LLMMaster.
+    Pools are reused across LLMMaster instances and run() calls.
+    """
+    return _default_transport
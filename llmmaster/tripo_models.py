@@ -59,14 +59,19 @@ class TripoBase(RootModel):
                 wait_time=WAIT_FOR_TRIPO_RESULT
             )
 
-        self.response = (
-            response.json() if isinstance(response, Response) else response
-        )
+        self.response = self._task_result(response)
 
     def _is_task_ongoing(self, response: Response) -> bool:
         response_json = response.json()
         return response_json["data"]["status"] in TRIPO_STATUS_IN_PROGRESS
 
+    def _task_progress(self, response: Response) -> float:
+        """
+        Tripo reports progress from 0 to 100.
+        """
+        progress = response.json()["data"].get("progress")
+        return progress / 100.0 if progress is not None else None
+
 
 class TripoTextTo3D(TripoBase):
     """
@@ -160,7 +165,8 @@ class TripoImageTo3D(TripoBase):
             "model_version": self.parameters["model"],
             "file": tripo_image_input(
                 image_path=self.parameters["file"],
-                api_key=self.api_key
+                api_key=self.api_key,
+                transport=self.transport
             )
         }
 
@@ -243,7 +249,8 @@ class TripoMultiviewTo3D(TripoBase):
         for file in self.parameters["files"]:
             body["files"].append(tripo_image_input(
                 image_path=file,
-                api_key=self.api_key
+                api_key=self.api_key,
+                transport=self.transport
             ))
 
         if "face_limit" in self.parameters:
@@ -1,14 +1,19 @@
 import base64
 import os
+import threading
+from collections import OrderedDict
 from mimetypes import guess_type
 from urllib.parse import urlparse
 from urllib.parse import urlunparse
 
-from requests import post
 from requests.models import Response
 
+from .config import BASE64_CACHE_MAX_BYTES
+from .config import BASE64_CHUNK_SIZE
 from .config import TRIPO_BASE_EP
 from .config import TRIPO_UPLOAD_EP
+from .transport import Transport
+from .transport import get_transport
 
 
 # Vision input for Image-To-Text LLMs
@@ -222,11 +227,16 @@ def skybox_image_input(image_path: str = '') -> str:
     return common_image_input(image_path)
 
 
-def tripo_image_input(image_path: str = '', api_key: str = '') -> dict:
+def tripo_image_input(
+    image_path: str = '',
+    api_key: str = '',
+    transport: Transport = None
+) -> dict:
     """
     Tripo Image-To-3D model input.
     Both local and online image paths are supported.
     Tripo asks to upload image to its server so api_key is required.
+    transport: pooled connections to use, global transport if None.
     """
     file = {}
 
@@ -244,7 +254,9 @@ def tripo_image_input(image_path: str = '', api_key: str = '') -> dict:
 
         with open(image_path, "rb") as fp:
             files = {"file": (image_path, fp, guess_type(image_path)[0])}
-            response = post(url, headers=headers, files=files)
+            response = (transport or get_transport()).request(
+                "POST", url, headers=headers, files=files
+            )
 
         response_json = response.json()
         file["file_token"] = response_json["data"]["image_token"]
@@ -370,16 +382,95 @@ def openai_image_save(
         )
 
 
+def iter_base64(
+    file_path: str = '',
+    chunk_size: int = BASE64_CHUNK_SIZE
+) -> any:
+    """
+    Yield base64 of file in pieces without reading the whole file.
+    Joined pieces are the same as base64 of the whole file, since
+    chunk_size is rounded to a multiple of 3 bytes.
+    Prompt builders do not use it; request bodies hold the whole string.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    chunk_size = max(chunk_size - chunk_size % 3, 3)
+    with open(file_path, "rb") as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            yield base64.b64encode(chunk)
+
+
 # Supporting functions
 
+class _Base64Cache:
+    """
+    LRU of base64 strings keyed by (path, mtime, size) of local files.
+    Total length is kept under max_bytes. Larger files are not cached.
+    """
+
+    def __init__(self, max_bytes: int = BASE64_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: str) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            # older versions of the same file are never used again
+            for old in [k for k in self._entries if k[0] == key[0]]:
+                self.size -= len(self._entries.pop(old))
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_BASE64_CACHE = _Base64Cache()
+
+
 def _encode_base64(file_path: str = '') -> str:
     """
     Encode image/audio to base64.
+    Cached by path, mtime and size, so a file given to several entries
+    is encoded once. The returned string is still held in full.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-    with open(file_path, "rb") as fp:
-        file_data = base64.b64encode(fp.read()).decode("utf-8")
+
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size)
+    file_data = _BASE64_CACHE.get(key)
+
+    if file_data is None:
+        buffer = bytearray(4 * -(-stat.st_size // 3))
+        position = 0
+        for piece in iter_base64(file_path):
+            buffer[position:position + len(piece)] = piece
+            position += len(piece)
+        del buffer[position:]
+        file_data = buffer.decode("utf-8")
+        _BASE64_CACHE.put(key, file_data)
+
     return file_data
 
 
@@ -0,0 +1,188 @@
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from .config import WEBHOOK_FALLBACK
+from .config import WEBHOOK_HOST
+from .config import WEBHOOK_PATH
+from .config import WEBHOOK_PORT
+
+
+class WebhookServer:
+    """
+    Embedded HTTP server receiving task callbacks from providers
+    (e.g. Skybox `webhook_url`), so that entries need no status checks.
+    Each entry registers a random token and gives `{url}/{token}` to
+    the provider. JSON posted there completes the entry.
+    Arguments:
+      - host, port: address to listen, port 0 picks a free port
+      - path: path prefix of callback URL
+      - public_url: URL reachable from provider (e.g. reverse proxy or
+        tunnel) forwarded to host:port, None to use local address
+      - fallback_after: seconds after submission to start polling
+        in case no callback arrives
+    The server starts on the first register().
+    """
+
+    def __init__(
+        self,
+        host: str = WEBHOOK_HOST,
+        port: int = WEBHOOK_PORT,
+        path: str = WEBHOOK_PATH,
+        public_url: str = None,
+        fallback_after: float = WEBHOOK_FALLBACK
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.path = "/" + path.strip("/")
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.fallback_after = fallback_after if fallback_after > 0 else 0.0
+        self._inbox = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        URL prefix given to providers, without token.
+        """
+        if self.public_url:
+            return f"{self.public_url}{self.path}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def start(self) -> None:
+        with self._lock:
+            if self._server is not None:
+                return
+            self._server = _CallbackServer((self.host, self.port), self)
+            self.port = self._server.server_address[1]
+            threading.Thread(
+                target=self._server.serve_forever,
+                name="llmmaster-webhook",
+                daemon=True
+            ).start()
+
+    def close(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def register(self) -> str:
+        """
+        Open inbox for a new task and return its token.
+        """
+        self.start()
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._inbox[token] = {
+                "event": threading.Event(),
+                "payloads": [],
+                "callback": None
+            }
+        return token
+
+    def url(self, token: str = '') -> str:
+        return f"{self.base_url}/{token}"
+
+    def release(self, token: str = '') -> None:
+        with self._lock:
+            self._inbox.pop(token, None)
+
+    def subscribe(self, token: str = '', callback: any = None) -> None:
+        """
+        Call callback() in server thread whenever callback of token
+        arrives. Called at once if something has arrived already.
+        """
+        with self._lock:
+            inbox = self._inbox.get(token)
+            if inbox is None:
+                return
+            inbox["callback"] = callback
+            arrived = bool(inbox["payloads"])
+        if arrived and callback is not None:
+            callback()
+
+    def take(self, token: str = '') -> dict:
+        """
+        Return the latest payload not taken yet, or None.
+        """
+        with self._lock:
+            inbox = self._inbox.get(token)
+            if inbox is None or not inbox["payloads"]:
+                return None
+            payload = inbox["payloads"][-1]
+            inbox["payloads"] = []
+            inbox["event"].clear()
+        return payload
+
+    def wait(self, token: str = '', timeout: float = None) -> bool:
+        """
+        Block until callback of token arrives or timeout.
+        Unknown token just waits for timeout.
+        """
+        with self._lock:
+            inbox = self._inbox.get(token)
+        if inbox is None:
+            time.sleep(timeout if timeout else 0.0)
+            return False
+        return inbox["event"].wait(timeout)
+
+    def receive(self, token: str = '', payload: dict = None) -> bool:
+        """
+        Store callback payload. Return False if token is unknown.
+        """
+        with self._lock:
+            inbox = self._inbox.get(token)
+            if inbox is None:
+                return False
+            inbox["payloads"].append(payload)
+            inbox["event"].set()
+            callback = inbox["callback"]
+        if callback is not None:
+            callback()
+        return True
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        webhook = self.server.webhook
+        prefix, _, token = self.path.split("?")[0].rpartition("/")
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = self.rfile.read(length) if length else b""
+
+        try:
+            payload = json.loads(body.decode("utf-8")) if body else {}
+        except ValueError:
+            payload = None
+
+        if payload is None:
+            status = 400
+        elif prefix == webhook.path and webhook.receive(token, payload):
+            status = 200
+        else:
+            status = 404
+
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _CallbackServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, webhook: WebhookServer) -> None:
+        super().__init__(address, _CallbackHandler)
+        self.webhook = webhook
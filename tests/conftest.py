@@ -1,6 +1,10 @@
 import json
 import os
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -10,10 +14,13 @@ import pytest
 from requests.models import Response
 
 from llmmaster import LLMMaster
+from llmmaster import config
+from llmmaster.runway_models import RunwayImageToVideo
 
 
 API_KEY_FILE = "api_key_pairs.txt"
 TEST_OUTPUT_PATH = "test-outputs"
+DUMMY_API_KEY = "dummy"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -21,6 +28,195 @@ def setup_api_client() -> None:
     pass
 
 
+@pytest.fixture(autouse=True)
+def dummy_api_keys(monkeypatch) -> None:
+    """
+    Dummy API keys for offline tests, so that instances can be created
+    without real keys. Keys already set (e.g. for --run-api) are kept.
+    """
+    for name, key_name in vars(config).items():
+        if name.endswith("_KEY_NAME") and not os.getenv(key_name):
+            monkeypatch.setenv(key_name, DUMMY_API_KEY)
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of LocalServer.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self.server.dispatch(self)
+
+    def do_POST(self) -> None:
+        self.server.dispatch(self)
+
+    def do_PUT(self) -> None:
+        self.server.dispatch(self)
+
+    def do_DELETE(self) -> None:
+        self.server.dispatch(self)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    """
+    Local stand-in of provider APIs for offline tests.
+    Register responses with route(), check requests in self.calls.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), LocalHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.routes = {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def route(
+        self,
+        method: str = "GET",
+        path: str = "/",
+        responses: any = None
+    ) -> None:
+        """
+        path ending with `*` matches any path with the same prefix.
+        responses: list of (status, body) or (status, body, headers),
+        returned in order and the last one is repeated.
+        Also acceptable: function(handler, body) returning the tuple.
+        body in dict is returned as JSON.
+        """
+        self.routes[(method, path)] = responses
+
+    def dispatch(self, handler: LocalHandler) -> None:
+        length = int(handler.headers.get("Content-Length", 0) or 0)
+        body = handler.rfile.read(length) if length else b""
+        path = handler.path.split("?")[0]
+
+        with self.lock:
+            self.calls.append((handler.command, path, body))
+            responses = self.routes.get((handler.command, path))
+            for (method, prefix), value in self.routes.items():
+                if (responses is None and method == handler.command and
+                   prefix.endswith("*") and path.startswith(prefix[:-1])):
+                    responses = value
+            if callable(responses):
+                response = None
+            elif responses:
+                response = (
+                    responses.pop(0) if len(responses) > 1 else responses[0]
+                )
+            else:
+                response = (404, {"error": "not found"})
+
+        # functions run outside the lock to serve requests concurrently
+        if response is None:
+            response = responses(handler, body)
+
+        status, content = response[0], response[1]
+        headers = response[2] if len(response) > 2 else {}
+
+        if isinstance(content, (dict, list)):
+            content = json.dumps(content).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        elif isinstance(content, str):
+            content = content.encode("utf-8")
+
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def count(self, method: str = "GET", path: str = "/") -> int:
+        return len([c for c in self.calls if c[:2] == (method, path)])
+
+
+@pytest.fixture
+def local_server() -> LocalServer:
+    server = LocalServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def groq_server(local_server, monkeypatch) -> any:
+    """
+    Groq stand-in on local_server. groq_server(responses) serves
+    chat completions with responses, see LocalServer.route(),
+    and returns the server.
+    """
+    monkeypatch.setattr(
+        "llmmaster.groq_models.GROQ_BASE_EP", local_server.url
+    )
+
+    def serve(responses: any) -> LocalServer:
+        local_server.route("POST", "/v1/chat/completions", responses)
+        return local_server
+
+    return serve
+
+
+@pytest.fixture
+def runway_server(local_server, monkeypatch) -> any:
+    """
+    Runway stand-in on local_server. runway_server(responses, wait)
+    serves task status with responses, see LocalServer.route(), and
+    returns the server. By default every task is RUNNING twice, then
+    SUCCEEDED. wait: seconds between status checks.
+    """
+    counts = {}
+
+    def task_status(handler, body):
+        task_id = handler.path.split("/")[-1]
+        counts[task_id] = counts.get(task_id, 0) + 1
+        status = "RUNNING" if counts[task_id] < 3 else "SUCCEEDED"
+        return (200, {"id": task_id, "status": status})
+
+    def submit(handler, body):
+        return (200, {"id": f"task-{time.monotonic_ns()}"})
+
+    monkeypatch.setattr(
+        "llmmaster.runway_models.RUNWAY_BASE_EP", local_server.url
+    )
+
+    def serve(responses: any = None, wait: float = 0.1) -> LocalServer:
+        monkeypatch.setattr(
+            "llmmaster.runway_models.WAIT_FOR_RUNWAY_RESULT", wait
+        )
+        local_server.route("POST", "/v1/image_to_video", submit)
+        local_server.route(
+            "GET", "/v1/tasks/*", responses if responses else task_status
+        )
+        return local_server
+
+    return serve
+
+
+def make_runway(num: int = 1) -> dict:
+    """
+    Runway image-to-video entries runway_00, runway_01, ...
+    """
+    return {
+        f"runway_{i:02d}": RunwayImageToVideo(
+            api_key=DUMMY_API_KEY,
+            model="gen3a_turbo",
+            promptImage="https://example.com/image.png",
+            prompt="test"
+        )
+        for i in range(num)
+    }
+
+
 def load_api_keys() -> str:
     return Path(API_KEY_FILE).read_text(encoding="utf-8")
 
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from conftest import make_runway
+from llmmaster import LLMMaster
+from llmmaster.executor import LaunchPolicy
+from llmmaster.root_model import RootModel
+
+
+class SleepModel(RootModel):
+
+    def run(self) -> None:
+        time.sleep(self.parameters.get("sleep", 0.1))
+        self.response = self.parameters["prompt"]
+
+
+def test_arun_plain_models() -> None:
+    master = LLMMaster(launch_policy=LaunchPolicy())
+    master.instances = {
+        f"entry_{i:02d}": SleepModel(prompt=f"result {i}", sleep=0.2)
+        for i in range(10)
+    }
+    asyncio.run(master.arun())
+    assert master.results["entry_09"] == "result 9"
+    assert master.elapsed_time < 1.0
+
+    # each blocking run() holds one of max_threads threads
+    asyncio.run(master.arun(max_threads=5))
+    assert master.elapsed_time >= 0.4
+
+
+def test_arun_polling_models(runway_server) -> None:
+    server = runway_server()
+    """
+    Polling waits must not hold worker threads:
+    40 tasks with 2 workers finish about as fast as 1 task.
+    """
+    master = LLMMaster(max_workers=2, launch_policy=LaunchPolicy())
+    master.instances = make_runway(40)
+    asyncio.run(master.arun())
+    for result in master.results.values():
+        assert result["status"] == "SUCCEEDED"
+    assert server.count("POST", "/v1/image_to_video") == 40
+    assert master.elapsed_time < 3.0
+
+
+def test_arun_cancel(runway_server) -> None:
+    runway_server(wait=10)
+    master = LLMMaster(max_workers=2, launch_policy=LaunchPolicy())
+    master.instances = make_runway(5)
+
+    async def main():
+        task = asyncio.create_task(master.arun())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start < 2.0
+    assert threading.active_count() < 10
+    # running entries are cancelled, not left polling or retrying
+    for instance in master.instances.values():
+        assert instance.deadline.expired()
+
+
+def test_run_unchanged_for_polling_models(runway_server) -> None:
+    runway_server()
+    instances = make_runway(1)
+    instance = instances["runway_00"]
+    instance.run()
+    assert instance.response["status"] == "SUCCEEDED"
+    assert instance.task is None
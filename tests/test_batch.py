@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.ratelimit import RateLimiter
+
+
+class Completion:
+    """
+    Groq stand-in answering after seconds given as prompt,
+    recording the peak of requests in flight.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, handler, body) -> tuple:
+        prompt = json.loads(body)["messages"][-1]["content"]
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(float(prompt))
+        with self.lock:
+            self.in_flight -= 1
+        return (200, {"answer": prompt})
+
+
+def make_master() -> LLMMaster:
+    return LLMMaster(
+        executor="pool",
+        max_workers=8,
+        rate_limiter=RateLimiter(use_defaults=False)
+    )
+
+
+def test_jsonl_in_and_out(groq_server, tmp_path) -> None:
+    completion = Completion()
+    groq_server(completion)
+    source = tmp_path / "entries.jsonl"
+    with open(source, "w") as f:
+        for i in range(200):
+            entry = {"provider": "groq", "model": "m", "prompt": "0.01"}
+            if i % 2:
+                entry["label"] = f"q{i}"
+            f.write(json.dumps(entry) + "\n\n")
+
+    master = make_master()
+    counts = master.run_batch(
+        str(source), sink=str(tmp_path / "results.jsonl"), window=4
+    )
+
+    lines = [json.loads(line) for line in open(tmp_path / "results.jsonl")]
+    assert counts == {"total": 200, "timed_out": 0}
+    assert len(lines) == 200
+    assert {line["label"] for line in lines} >= {"entry_000000", "q199"}
+    assert all(line["result"] == {"answer": "0.01"} for line in lines)
+    assert "attempts" in lines[0]["metadata"]
+    assert completion.peak <= 4
+    assert master.instances == {} and master.results == {}
+
+
+def test_iterable_with_errors(groq_server) -> None:
+    groq_server(Completion())
+
+    def entries():
+        yield ("ok", {"provider": "groq", "model": "m", "prompt": "0.01"})
+        yield {"label": "bad", "provider": "unknown", "prompt": "x"}
+
+    written = {}
+    completed = []
+    counts = make_master().run_batch(
+        entries(),
+        sink=lambda label, result, metadata: written.update({label: result}),
+        on_complete=lambda label, result, timing: completed.append(label)
+    )
+
+    assert counts["total"] == 2
+    assert written["ok"] == {"answer": "0.01"}
+    assert written["bad"].startswith("Something went wrong.")
+    assert sorted(completed) == ["bad", "ok"]
+
+
+def test_timeout(groq_server) -> None:
+    groq_server(Completion())
+    written = {}
+    entries = {
+        f"q{i}": {"provider": "groq", "model": "m", "prompt": "2"}
+        for i in range(4)
+    }
+    master = make_master()
+    counts = master.run_batch(
+        entries,
+        sink=lambda label, result, metadata: written.update({label: result}),
+        window=2,
+        timeout=0.3
+    )
+
+    assert counts == {"total": 4, "timed_out": 4}
+    assert master.elapsed_time < 1.5
+    assert all(r.startswith("Timed out.") for r in written.values())
@@ -0,0 +1,113 @@
+import os
+import time
+
+from requests.models import Response
+
+from llmmaster import LLMMaster
+from llmmaster.cache import ResponseCache
+from llmmaster.cache import cache_key
+from llmmaster.cache import is_deterministic
+from llmmaster.groq_models import GroqLLM
+
+
+COMPLETION = {
+    "id": "c1",
+    "object": "chat.completion",
+    "choices": [{"index": 0, "message": {"role": "assistant",
+                                         "content": "cached"}}]
+}
+
+
+def make_groq(store: ResponseCache, api_key: str = "dummy", **kwargs):
+    instance = GroqLLM(api_key=api_key, model="m", prompt="hi", **kwargs)
+    instance.cache = store
+    return instance
+
+
+def test_cache_key_is_canonical() -> None:
+    payload = {
+        "headers": {"Authorization": "Bearer secret-1", "X-Trace": "a"},
+        "json": {"model": "m", "temperature": 0, "messages": []}
+    }
+    same = {
+        "headers": {"authorization": "Bearer secret-2", "x-trace": "a"},
+        "json": {"messages": [], "temperature": 0, "model": "m"}
+    }
+    key = cache_key("google", "POST", "https://x/v1?key=1&alt=sse", payload)
+    assert key == cache_key("google", "POST", "https://x/v1?alt=sse&key=2",
+                            same)
+    assert key != cache_key("openai", "POST", "https://x/v1?alt=sse", same)
+    assert cache_key("x", "POST", "https://x", {"files": {"f": b""}}) is None
+
+    assert is_deterministic({"temperature": 0})
+    assert is_deterministic({"generationConfig": {"seed": 42}})
+    assert not is_deterministic({"temperature": 0.7})
+
+
+def test_deterministic_entry_served_from_cache(groq_server, tmp_path) -> None:
+    server = groq_server([(200, COMPLETION)])
+    cache = ResponseCache(path=str(tmp_path))
+    first = make_groq(cache, api_key="key-1", temperature=0)
+    first.run()
+    assert first.metadata["cache"] == "miss"
+
+    # new process: memory tier is empty, disk tier answers
+    second = make_groq(ResponseCache(path=str(tmp_path)), temperature=0)
+    second.run()
+    assert second.metadata["cache"] == "hit"
+    assert second.response == first.response == COMPLETION
+    assert server.count("POST", "/v1/chat/completions") == 1
+
+
+def test_entry_option_cache(groq_server) -> None:
+    server = groq_server([(200, COMPLETION)])
+    cache = ResponseCache()
+    for _ in range(2):
+        make_groq(cache, temperature=0.7).run()
+    assert server.count("POST", "/v1/chat/completions") == 2
+
+    for _ in range(2):
+        make_groq(cache, temperature=0.7, cache=True).run()
+    assert server.count("POST", "/v1/chat/completions") == 3
+
+    instance = make_groq(cache, temperature=0, cache=False)
+    instance.run()
+    assert "cache" not in instance.metadata
+    assert server.count("POST", "/v1/chat/completions") == 4
+
+
+def test_master_metadata(groq_server) -> None:
+    server = groq_server([(200, COMPLETION)])
+    master = LLMMaster(cache=ResponseCache())
+    entry = {"provider": "groq", "model": "m", "prompt": "hi", "seed": 1}
+    for _ in range(2):
+        master.summon({"groq": entry})
+        master.run()
+        result = master.metadata["groq"]["cache"]
+        master.dismiss()
+    assert result == "hit"
+    assert server.count("POST", "/v1/chat/completions") == 1
+
+
+def test_ttl_and_eviction(tmp_path) -> None:
+    def response(size: int) -> Response:
+        r = Response()
+        r.status_code = 200
+        r._content = b"x" * size
+        return r
+
+    cache = ResponseCache(path=str(tmp_path), max_entries=1, max_bytes=3000)
+    for i in range(3):
+        cache.put(f"k{i}", response(1000))
+        time.sleep(0.01)
+    assert len(cache._memory) == 1
+    assert cache.get("k0") is None
+    assert cache.get("k2").content == b"x" * 1000
+    assert sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path)) \
+        <= 3000
+
+    cache = ResponseCache(ttl=0.1)
+    cache.put("k", response(10))
+    assert cache.get("k") is not None
+    time.sleep(0.15)
+    assert cache.get("k") is None
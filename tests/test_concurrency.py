@@ -0,0 +1,93 @@
+import threading
+import time
+
+from requests.models import Response
+
+from llmmaster import LLMMaster
+from llmmaster.concurrency import AdaptiveConcurrency
+from llmmaster.concurrency import AdaptiveLimit
+from llmmaster.concurrency import is_throttled
+from llmmaster.ratelimit import RateLimiter
+from llmmaster.retry import RetryPolicy
+
+
+def make_response(status: int = 200, headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers if headers else {})
+    return response
+
+
+def test_additive_increase_multiplicative_decrease() -> None:
+    limit = AdaptiveLimit(initial=2, maximum=4)
+    tickets = [limit.acquire() for _ in range(2)]
+    for ticket in tickets:
+        limit.release(ticket, make_response(200))
+    # +1/2 for each success while the limit was fully used
+    assert limit.current == 2 and limit.limit == 2.5
+
+    # not fully used: no increase
+    limit.release(limit.acquire(), make_response(200))
+    assert limit.limit == 2.5
+
+    tickets = [limit.acquire() for _ in range(2)]
+    for ticket in tickets:
+        limit.release(ticket, make_response(429))
+    # only one decrease for requests sent before it
+    assert limit.limit == 1.25 and limit.throttled == 2
+    assert limit.snapshot() == {"limit": 1, "in_flight": 0, "throttled": 2}
+
+
+def test_throttle_signals_and_pause() -> None:
+    assert is_throttled(make_response(429))
+    assert is_throttled(
+        make_response(200, {"x-ratelimit-remaining-requests": "0"})
+    )
+    assert not is_throttled(
+        make_response(200, {"anthropic-ratelimit-tokens-remaining": "900"})
+    )
+
+    limit = AdaptiveLimit(initial=4)
+    limit.release(limit.acquire(), make_response(429, {"Retry-After": "0.3"}))
+    start = time.monotonic()
+    limit.acquire()
+    assert time.monotonic() - start > 0.25
+
+
+def test_batch_converges_to_capacity(groq_server) -> None:
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def completion(handler, body):
+        with lock:
+            state["in_flight"] += 1
+            busy = state["in_flight"] > 3
+        time.sleep(0.05)
+        with lock:
+            state["in_flight"] -= 1
+        if busy:
+            return (429, {"error": "busy"})
+        return (200, {"choices": []})
+
+    groq_server(completion)
+
+    master = LLMMaster(
+        executor="pool",
+        max_workers=16,
+        retry_policy=RetryPolicy(
+            max_attempts=20, backoff=0.02, max_backoff=0.1
+        ),
+        rate_limiter=RateLimiter(use_defaults=False),
+        concurrency=AdaptiveConcurrency(initial=12)
+    )
+    master.summon({
+        f"groq_{i}": {"provider": "groq", "model": "m", "prompt": "hi"}
+        for i in range(30)
+    })
+    master.run()
+
+    assert all(r == {"choices": []} for r in master.results.values())
+    limits = master.concurrency.limits()["GROQ_API_KEY"]
+    assert limits["throttled"] > 0
+    assert limits["limit"] <= 4
+    assert limits["in_flight"] == 0
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.deadline import Deadline
+from llmmaster.deadline import DeadlineExceeded
+from llmmaster.executor import LaunchPolicy
+from llmmaster.groq_models import GroqLLM
+from llmmaster.retry import RetryPolicy
+from llmmaster.root_model import RootModel
+from llmmaster.runway_models import RunwayImageToVideo
+from llmmaster.transport import Transport
+
+
+# Runway task status of tasks that never finish
+NEVER_FINISHED = [(200, {"status": "RUNNING"})]
+
+
+class SleepModel(RootModel):
+
+    def run(self) -> None:
+        time.sleep(self.parameters.get("sleep", 0.1))
+        self.response = self.parameters["prompt"]
+
+
+def make_runway(**kwargs) -> RunwayImageToVideo:
+    return RunwayImageToVideo(
+        api_key="dummy",
+        model="gen3a_turbo",
+        promptImage="https://example.com/image.png",
+        prompt="test",
+        **kwargs
+    )
+
+
+def test_deadline() -> None:
+    assert Deadline().remaining() is None
+    assert not Deadline().expired()
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert deadline.clip(30) <= 10
+    assert deadline.clip(1) == 1
+    assert deadline.timeout((5, 600))[0] == 5
+    assert deadline.timeout((5, 600))[1] <= 10
+    assert Deadline(100).earliest(deadline) is deadline
+    assert deadline.earliest(Deadline()) is deadline
+
+
+def test_transport_deadline(local_server) -> None:
+    local_server.route("GET", "/task", [(503, {"error": "unavailable"})])
+    transport = Transport()
+    attempts = []
+    response = transport.request(
+        "GET",
+        f"{local_server.url}/task",
+        retry=RetryPolicy(backoff=1.0, jitter=0.0),
+        attempts=attempts,
+        deadline=Deadline(0.5)
+    )
+    # retry waiting beyond deadline is not made
+    assert response.status_code == 503
+    assert len(attempts) == 1
+
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    with pytest.raises(DeadlineExceeded):
+        transport.request("GET", f"{local_server.url}/task", deadline=deadline)
+
+    # expire() during the wait before retry stops it at once
+    deadline = Deadline()
+    threading.Timer(0.2, deadline.expire).start()
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        transport.request(
+            "GET",
+            f"{local_server.url}/task",
+            retry=RetryPolicy(backoff=5.0, jitter=0.0),
+            deadline=deadline
+        )
+    assert time.monotonic() - start < 1.0
+    transport.close()
+
+
+def test_entry_timeout_in_polling(runway_server) -> None:
+    runway_server(NEVER_FINISHED, wait=5)
+    instance = make_runway(timeout=0.5)
+    instance.set_deadline()
+    start = time.monotonic()
+    instance.run()
+    assert time.monotonic() - start < 1.5
+    assert instance.response.startswith("Timed out. ")
+    assert instance.metadata["status"] == "timed_out"
+    assert "timeout" not in instance.parameters
+
+
+def test_run_timeout(runway_server) -> None:
+    runway_server(NEVER_FINISHED, wait=5)
+    master = LLMMaster(launch_policy=LaunchPolicy())
+    master.instances = {
+        "stuck": make_runway(),
+        "quick": SleepModel(prompt="done", sleep=0.1)
+    }
+    master.run(timeout=0.5)
+    assert master.elapsed_time < 1.5
+    assert master.results["quick"] == "done"
+    assert master.results["stuck"].startswith("Timed out. ")
+    assert master.metadata["stuck"]["status"] == "timed_out"
+
+
+def test_pool_run_timeout() -> None:
+    master = LLMMaster(executor="pool", max_workers=1)
+    master.instances = {
+        "slow": SleepModel(prompt="slow", sleep=1.0),
+        "queued": SleepModel(prompt="queued", sleep=0.1)
+    }
+    master.run(timeout=0.3)
+    assert master.elapsed_time < 0.8
+    assert master.results["slow"].startswith("Timed out. ")
+    assert master.results["queued"].startswith("Timed out. ")
+
+
+def test_arun_timeout(runway_server) -> None:
+    runway_server(NEVER_FINISHED, wait=5)
+    master = LLMMaster(launch_policy=LaunchPolicy())
+    master.instances = {
+        "stuck": make_runway(),
+        "quick": SleepModel(prompt="done", sleep=0.1)
+    }
+    asyncio.run(master.arun(timeout=0.5))
+    assert master.elapsed_time < 1.5
+    assert master.results["quick"] == "done"
+    assert master.results["stuck"].startswith("Timed out. ")
+
+
+def test_read_timeout(groq_server) -> None:
+    def slow(handler, body):
+        time.sleep(1.0)
+        return (200, {"ok": True})
+
+    groq_server(slow)
+    instance = GroqLLM(
+        api_key="dummy", model="dummy", prompt="Hello.", read_timeout=0.2
+    )
+    instance.run()
+    assert instance.response.startswith("Timed out. ")
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.ratelimit import RateLimiter
+from llmmaster.singleflight import SingleFlight
+
+
+def completion(handler, body):
+    time.sleep(0.2)
+    return (200, {"answer": "ok"})
+
+
+def run_grid(dedup: bool, temperature: float) -> LLMMaster:
+    master = LLMMaster(
+        executor="pool",
+        max_workers=2,
+        rate_limiter=RateLimiter(use_defaults=False),
+        dedup=dedup
+    )
+    master.summon({
+        f"q{i}": {"provider": "groq", "model": "m", "prompt": "same",
+                  "temperature": temperature}
+        for i in range(4)
+    })
+    master.run()
+    return master
+
+
+def test_identical_requests_share_one_call(groq_server) -> None:
+    server = groq_server(completion)
+    master = run_grid(dedup=True, temperature=0)
+
+    assert server.count("POST", "/v1/chat/completions") == 1
+    assert all(r == {"answer": "ok"} for r in master.results.values())
+    shared = [m for m in master.metadata.values() if m.get("dedup")]
+    assert len(shared) == 3
+
+
+def test_only_deterministic_requests_are_shared(groq_server) -> None:
+    server = groq_server(completion)
+    run_grid(dedup=True, temperature=0.7)
+    assert server.count("POST", "/v1/chat/completions") == 4
+
+    run_grid(dedup=False, temperature=0)
+    assert server.count("POST", "/v1/chat/completions") == 8
+
+
+def test_error_is_passed_to_waiting_callers() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fail() -> None:
+        started.set()
+        time.sleep(0.2)
+        raise ValueError("upstream")
+
+    def follow() -> None:
+        started.wait()
+        try:
+            flight.do("k", lambda: "never")
+        except ValueError as e:
+            errors.append(str(e))
+
+    follower = threading.Thread(target=follow)
+    follower.start()
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
+    follower.join()
+
+    assert errors == ["upstream"]
+    # failed call is not kept
+    assert flight.do("k", lambda: "retried") == ("retried", False)
+    assert flight.do("k", lambda: "never") == ("retried", True)
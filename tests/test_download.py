@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import os
+
+from llmmaster import LLMMaster
+from llmmaster.download import AssetStore
+from llmmaster.download import find_assets
+
+MODEL = bytes(range(256)) * 2048
+TEXTURE = b"texture" * 1000
+
+
+def serve(server, path: str, data: bytes, headers: dict = None) -> list:
+    """
+    Static file with Range support. Return list of Range headers got.
+    """
+    ranges = []
+
+    def asset(handler, body):
+        extra = dict(headers) if headers else {}
+        requested = handler.headers.get("Range")
+        ranges.append(requested)
+        if requested:
+            start = int(requested[len("bytes="):-1])
+            end = len(data) - 1
+            extra["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return (206, data[start:], extra)
+        return (200, data, extra)
+
+    server.route("GET", path, asset)
+    return ranges
+
+
+def test_find_assets() -> None:
+    meshy = {
+        "id": "task-01",
+        "model_urls": {"glb": "https://a/m.glb?Expires=1", "fbx": ""},
+        "texture_urls": [{"base_color": "https://a/t.png"}],
+        "prompt": "https://not.an/asset"
+    }
+    assert find_assets(meshy) == [
+        ("model_urls.glb", "https://a/m.glb?Expires=1"),
+        ("texture_urls.0.base_color", "https://a/t.png")
+    ]
+    tripo = {"code": 0, "data": {"output": {"model": "https://t/m.glb"}}}
+    assert find_assets(tripo) == [("data.output.model", "https://t/m.glb")]
+    image = {"created": 1, "data": [{"url": "https://o/i.png"}]}
+    assert find_assets(image) == [("data.0.url", "https://o/i.png")]
+    assert find_assets("Something went wrong.") == []
+
+
+def test_download_to_store(local_server, tmp_path) -> None:
+    serve(local_server, "/m.glb", MODEL)
+    serve(local_server, "/t.png", TEXTURE)
+    serve(local_server, "/copy.png", TEXTURE)
+    url = local_server.url
+
+    master = LLMMaster()
+    master.results = {
+        "meshy": {"model_urls": {"glb": f"{url}/m.glb?token=1"},
+                  "texture_urls": [{"base_color": f"{url}/t.png"}]},
+        "luma": {"assets": {"image": f"{url}/copy.png"}},
+        "again": {"output": [f"{url}/m.glb?token=2"]},
+        "failed": "Something went wrong."
+    }
+    assets = master.download(str(tmp_path))
+
+    assert sorted(assets) == ["again", "luma", "meshy"]
+    model = assets["meshy"][0]
+    assert model["sha256"] == hashlib.sha256(MODEL).hexdigest()
+    assert model["path"].endswith(f"{model['sha256']}.glb")
+    with open(model["path"], "rb") as file:
+        assert file.read() == MODEL
+    # same URL apart from signature is fetched once
+    assert assets["again"][0]["path"] == model["path"]
+    assert local_server.count("GET", "/m.glb") == 1
+    # same content from another URL is stored once
+    assert assets["luma"][0]["sha256"] == assets["meshy"][1]["sha256"]
+    assert master.metadata["luma"]["assets"] == assets["luma"]
+
+    # store is reused across runs without fetching again
+    assets = master.download(str(tmp_path), labels=["meshy"])
+    assert [a["fetched"] for a in assets["meshy"]] == [False, False]
+    assert len(local_server.calls) == 3
+
+
+def test_resume_and_checksum(local_server, tmp_path) -> None:
+    md5 = base64.b64encode(hashlib.md5(MODEL).digest()).decode()
+    ranges = serve(
+        local_server, "/m.glb", MODEL, {"x-goog-hash": f"md5={md5}"}
+    )
+    serve(local_server, "/bad.glb", MODEL, {"x-goog-hash": "md5=AAAA"})
+    store = AssetStore(str(tmp_path))
+
+    # the first half remains from an interrupted download
+    url = f"{local_server.url}/m.glb"
+    with open(store.partial_path(url), "wb") as file:
+        file.write(MODEL[:len(MODEL) // 2])
+    descriptor = store.fetch(url)
+
+    assert descriptor["size"] == len(MODEL)
+    assert descriptor["sha256"] == hashlib.sha256(MODEL).hexdigest()
+    assert ranges == [f"bytes={len(MODEL) // 2}-"]
+    assert not os.path.exists(store.partial_path(url))
+
+    assets = store.download({"x": {"output": f"{local_server.url}/bad.glb"}})
+    assert assets["x"][0]["error"].startswith("Something went wrong.")
+    assert "path" not in assets["x"][0]
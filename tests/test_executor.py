@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.executor import LaunchPolicy
+from llmmaster.executor import PoolExecutor
+from llmmaster.executor import ThreadExecutor
+from llmmaster.root_model import RootModel
+
+
+class SleepModel(RootModel):
+    """
+    Local model without network access, used to test executors.
+    """
+
+    def run(self) -> None:
+        time.sleep(self.parameters.get("sleep", 0.1))
+        self.response = self.parameters["prompt"]
+
+
+class FailModel(RootModel):
+
+    def run(self) -> None:
+        raise RuntimeError("failed on purpose")
+
+
+def make_instances(num: int = 4, sleep: float = 0.1) -> dict:
+    return {
+        f"entry_{i:02d}": SleepModel(prompt=f"result {i}", sleep=sleep)
+        for i in range(num)
+    }
+
+
+def test_launch_policy_no_pacing() -> None:
+    policy = LaunchPolicy()
+    start = time.monotonic()
+    for _ in range(100):
+        policy.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_launch_policy_pacing() -> None:
+    policy = LaunchPolicy(per_second=20.0, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        policy.acquire()
+    # 2 tokens at once, 4 more at 20/sec
+    assert 0.15 < time.monotonic() - start < 0.5
+
+
+def test_thread_executor() -> None:
+    instances = make_instances()
+    ThreadExecutor().execute(instances, LaunchPolicy())
+    for i, instance in enumerate(instances.values()):
+        assert instance.response == f"result {i}"
+
+
+def test_pool_executor() -> None:
+    instances = make_instances(num=8, sleep=0.2)
+    start = time.monotonic()
+    PoolExecutor(max_workers=4).execute(instances, LaunchPolicy())
+    elapsed = time.monotonic() - start
+    for i, instance in enumerate(instances.values()):
+        assert instance.response == f"result {i}"
+    # 8 jobs of 0.2 sec with 4 workers take 2 rounds
+    assert 0.35 < elapsed < 1.0
+
+
+def test_pool_executor_failure() -> None:
+    instances = {"ok": SleepModel(prompt="ok"), "ng": FailModel()}
+    PoolExecutor(max_workers=2).execute(instances, LaunchPolicy())
+    assert instances["ok"].response == "ok"
+    assert "failed on purpose" in instances["ng"].response
+
+
+def test_master_pool_mode() -> None:
+    master = LLMMaster(executor="pool", max_workers=4)
+    master.instances = make_instances(num=6)
+    master.run()
+    assert len(master.results) == 6
+    assert master.results["entry_05"] == "result 5"
+
+
+def test_master_wrong_executor() -> None:
+    with pytest.raises(ValueError):
+        LLMMaster(executor="process")
@@ -0,0 +1,189 @@
+import json
+import threading
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.gemini_files import GeminiFileRegistry
+from llmmaster.google_models import GoogleSpeechVideoToText
+from llmmaster.polling import PollingPolicy
+from llmmaster.ratelimit import RateLimiter
+
+VIDEO = bytes(range(256)) * 10
+
+
+@pytest.fixture
+def gemini_server(local_server, monkeypatch):
+    """
+    Gemini stand-in of resumable upload, file state, generateContent
+    and delete. The second chunk of each upload fails once with 503.
+    File state is taken from state["states"] in order.
+    Upload status query drops the connection while state["drop_query"].
+    """
+    state = {"uploads": 0, "received": b"", "failed": False,
+             "states": ["ACTIVE"], "drop_query": False}
+
+    def start(handler, body):
+        state["uploads"] += 1
+        state["received"] = b""
+        state["failed"] = False
+        upload_url = f"{local_server.url}/upload/session"
+        return (200, {}, {"X-Goog-Upload-URL": upload_url})
+
+    def chunk(handler, body):
+        command = handler.headers["X-Goog-Upload-Command"]
+        if command == "query" and state["drop_query"]:
+            state["drop_query"] = False
+            raise ConnectionResetError("dropped")
+        if command == "query":
+            return (200, {}, {
+                "X-Goog-Upload-Status": "active",
+                "X-Goog-Upload-Size-Received": str(len(state["received"]))
+            })
+        offset = int(handler.headers["X-Goog-Upload-Offset"])
+        if offset > 0 and not state["failed"]:
+            state["failed"] = True
+            return (503, {"error": "unavailable"})
+        state["received"] = state["received"][:offset] + body
+        if command == "upload, finalize":
+            return (200, {"file": {
+                "name": "files/video-01",
+                "uri": f"{local_server.url}/v1beta/files/video-01",
+                "mimeType": "video/mp4",
+                "expirationTime": "2099-01-01T00:00:00.123456789Z"
+            }})
+        return (200, {})
+
+    def file_state(handler, body):
+        states = state["states"]
+        current = states.pop(0) if len(states) > 1 else states[0]
+        if current == "FAILED":
+            return (200, {"state": current, "error": {"message": "bad"}})
+        return (200, {"name": "files/video-01", "state": current})
+
+    def generate(handler, body):
+        parts = json.loads(body)["contents"][0]["parts"]
+        if parts[0]["text"] == "fail":
+            return (400, {"error": "bad request"})
+        return (200, {"answer": parts[0]["text"]})
+
+    local_server.route("POST", "/upload/v1beta/files", start)
+    local_server.route("POST", "/upload/session", chunk)
+    local_server.route("POST", "/v1beta/models/*", generate)
+    local_server.route("GET", "/v1beta/files/video-01", file_state)
+    local_server.route("DELETE", "/v1beta/files/video-01", [(200, {})])
+    monkeypatch.setattr(
+        "llmmaster.google_models.GOOGLE_GEMINI_BASE_EP", local_server.url
+    )
+    monkeypatch.setattr(
+        "llmmaster.google_models.GEMINI_UPLOAD_CHUNK_SIZE", 1024
+    )
+    local_server.state = state
+    return local_server
+
+
+def make_master(path: str, questions: list, **kwargs) -> LLMMaster:
+    master = LLMMaster(
+        executor="pool", rate_limiter=RateLimiter(use_defaults=False),
+        **kwargs
+    )
+    master.set_api_keys("GOOGLE_API_KEY=dummy")
+    master.summon({
+        f"q{i}": {"provider": "google_vtt", "model": "m", "prompt": q,
+                  "file": path, "retry": None,
+                  "polling": PollingPolicy(initial=0.05, factor=1.0)}
+        for i, q in enumerate(questions)
+    })
+    return master
+
+
+def test_upload_once_and_delete_at_run_end(gemini_server, tmp_path) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(VIDEO)
+    master = make_master(str(path), ["who?", "what?", "where?"])
+    master.run()
+
+    assert master.results["q1"] == {"answer": "what?"}
+    assert gemini_server.state["uploads"] == 1
+    assert gemini_server.state["received"] == VIDEO
+    shared = [master.metadata[f"q{i}"]["file"]["shared"] for i in range(3)]
+    assert sorted(shared) == [False, True, True]
+    # resumed from the confirmed offset after 503
+    assert gemini_server.count("POST", "/upload/session") == 5
+    assert gemini_server.count("DELETE", "/v1beta/files/video-01") == 1
+    assert len(master.file_registry) == 0
+
+
+def test_registry_kept_across_runs(gemini_server, tmp_path) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(VIDEO)
+    registry = GeminiFileRegistry()
+
+    for question in ["who?", "what?"]:
+        make_master(str(path), [question], file_registry=registry).run()
+
+    assert gemini_server.state["uploads"] == 1
+    assert gemini_server.count("DELETE", "/v1beta/files/video-01") == 0
+    assert registry.release(str(path)) == 1
+    assert gemini_server.count("DELETE", "/v1beta/files/video-01") == 1
+
+    # file close to expiry is uploaded again
+    registry = GeminiFileRegistry(expiry_margin=1e12)
+    for question in ["who?", "what?"]:
+        make_master(str(path), [question], file_registry=registry).run()
+    assert gemini_server.state["uploads"] == 3
+
+
+def test_generate_once_file_is_active(gemini_server, tmp_path) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(VIDEO)
+    gemini_server.state["states"] = ["PROCESSING", "PROCESSING", "ACTIVE"]
+    master = make_master(str(path), ["who?", "fail"])
+    master.run()
+
+    assert master.results["q0"] == {"answer": "who?"}
+    assert master.metadata["q0"]["polling"]["polls"] >= 1
+    # permanent error is returned at once without resending
+    assert master.results["q1"].startswith("Something went wrong. 400")
+    assert gemini_server.count("POST", "/v1beta/models/m:generateContent") == 2
+
+    gemini_server.state["states"] = ["PROCESSING", "FAILED"]
+    master = make_master(str(path), ["who?"])
+    master.run()
+
+    assert master.results["q0"] == "Something went wrong. File FAILED. bad"
+    assert gemini_server.count("POST", "/v1beta/models/m:generateContent") == 2
+
+
+def test_generate_outside_poller(gemini_server, tmp_path,
+                                 monkeypatch) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(VIDEO)
+    gemini_server.state["states"] = ["PROCESSING", "ACTIVE"]
+    threads = []
+    generate = GoogleSpeechVideoToText._generate
+
+    def spy(self, file_response):
+        threads.append(threading.current_thread().name)
+        return generate(self, file_response)
+
+    monkeypatch.setattr(GoogleSpeechVideoToText, "_generate", spy)
+    master = make_master(str(path), ["who?", "what?"])
+    master.run()
+
+    assert master.results["q1"] == {"answer": "what?"}
+    # poller workers only check the file state
+    assert threads == ["llmmaster-result"] * 2
+
+
+def test_upload_restarts_when_query_fails(gemini_server, tmp_path) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(VIDEO)
+    gemini_server.state["drop_query"] = True
+    master = make_master(str(path), ["who?"])
+    master.run()
+
+    assert master.results["q0"] == {"answer": "who?"}
+    # offset unknown: sent again from the beginning in a new session
+    assert gemini_server.state["uploads"] == 2
+    assert gemini_server.state["received"] == VIDEO
@@ -0,0 +1,182 @@
+import json
+
+from requests.models import Response
+
+from llmmaster import LLMMaster
+from llmmaster.journal import RunJournal
+from llmmaster.polling import PollingPolicy
+from llmmaster.ratelimit import RateLimiter
+
+
+def echo(failing: list) -> any:
+    """
+    Groq stand-in answering the prompt, failing for prompts in failing.
+    """
+    def completion(handler, body):
+        prompt = json.loads(body)["messages"][-1]["content"]
+        if prompt in failing:
+            return (400, {"error": "bad request"})
+        return (200, {"answer": prompt})
+
+    return completion
+
+
+def make_master(journal: RunJournal) -> LLMMaster:
+    return LLMMaster(
+        executor="pool",
+        rate_limiter=RateLimiter(use_defaults=False),
+        journal=journal
+    )
+
+
+def groq_entries(labels: list) -> dict:
+    return {
+        label: {"provider": "groq", "model": "m", "prompt": label}
+        for label in labels
+    }
+
+
+def test_completed_entries_are_skipped(groq_server, tmp_path) -> None:
+    server = groq_server(echo([]))
+    path = tmp_path / "journal.jsonl"
+
+    master = make_master(RunJournal(path))
+    master.summon(groq_entries(["a", "b"]))
+    master.run()
+    master.journal.close()
+    assert server.count("POST", "/v1/chat/completions") == 2
+
+    # restarted with one more entry
+    master = make_master(RunJournal(path))
+    master.summon(groq_entries(["a", "b", "c"]))
+    labels = [item[0] for item in master.run_iter()]
+    master.journal.close()
+
+    assert server.count("POST", "/v1/chat/completions") == 3
+    assert sorted(labels) == ["a", "b", "c"]
+    assert master.results["a"] == {"answer": "a"}
+    assert master.results["c"] == {"answer": "c"}
+
+
+def test_failed_entries_run_again(groq_server, tmp_path) -> None:
+    failing = ["b"]
+    server = groq_server(echo(failing))
+    path = tmp_path / "journal.jsonl"
+
+    master = make_master(RunJournal(path))
+    master.summon(groq_entries(["a", "b"]))
+    master.run()
+    master.journal.close()
+    assert master.results["b"].startswith("Something went wrong.")
+
+    failing.clear()
+    master = make_master(RunJournal(path))
+    assert master.journal.state("b")["state"] == "failed"
+    master.summon(groq_entries(["a", "b"]))
+    master.run()
+    master.journal.close()
+
+    assert master.results["b"] == {"answer": "b"}
+    assert server.count("POST", "/v1/chat/completions") == 3
+
+
+def test_response_result_is_restored(tmp_path) -> None:
+    path = tmp_path / "journal.jsonl"
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "audio/mpeg"
+    response._content = b"\x00\xffaudio"
+    journal = RunJournal(path)
+    journal.completed("speech", response, {})
+    journal.close()
+
+    restored = RunJournal(path).result("speech")
+    assert isinstance(restored, Response)
+    assert restored.content == b"\x00\xffaudio"
+    assert restored.headers["content-type"] == "audio/mpeg"
+
+
+def test_submitted_task_is_polled_again(local_server, monkeypatch,
+                                        tmp_path) -> None:
+    local_server.state = {"done": False}
+
+    def task_status(handler, body):
+        if local_server.state["done"]:
+            return (200, {"status": "SUCCEEDED", "progress": 100})
+        return (200, {"status": "IN_PROGRESS", "progress": 10})
+
+    local_server.route("POST", "/v2/text-to-3d",
+                       lambda handler, body: (200, {"result": "task-01"}))
+    local_server.route("GET", "/v2/text-to-3d/*", task_status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", local_server.url
+    )
+    path = tmp_path / "journal.jsonl"
+    entry = {"cube": {
+        "provider": "meshy_tt3d",
+        "model": "meshy-4",
+        "prompt": "a cube",
+        "polling": PollingPolicy(initial=0.1, factor=1.0, max_interval=0.1)
+    }}
+
+    # stopped before the task is done
+    master = make_master(RunJournal(path))
+    master.summon(entry)
+    master.run(timeout=0.5)
+    master.journal.close()
+    assert master.metadata["cube"]["status"] == "timed_out"
+
+    local_server.state["done"] = True
+    master = make_master(RunJournal(path))
+    master.summon(entry)
+    master.run()
+    master.journal.close()
+
+    assert master.results["cube"]["status"] == "SUCCEEDED"
+    assert local_server.count("POST", "/v2/text-to-3d") == 1
+
+
+def test_broken_last_line(tmp_path) -> None:
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal(path)
+    journal.completed("a", {"answer": "a"}, {})
+    journal.queued("b")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"label": "b", "sta')
+
+    journal = RunJournal(path)
+    journal.completed("c", "done", {})
+    journal.close()
+
+    journal = RunJournal(path)
+    assert journal.is_completed("a") and journal.is_completed("c")
+    assert journal.state("b")["state"] == "queued"
+    assert journal.task("b") is None
+    journal.close()
+
+
+def test_run_batch_resume(groq_server, tmp_path) -> None:
+    server = groq_server(echo([]))
+    path = tmp_path / "journal.jsonl"
+    sink = tmp_path / "results.jsonl"
+
+    master = make_master(RunJournal(path))
+    counts = master.run_batch(groq_entries(["a", "b"]), sink=str(sink))
+    master.journal.close()
+    assert counts == {"total": 2, "timed_out": 0, "skipped": 0}
+
+    master = make_master(RunJournal(path))
+    counts = master.run_batch(groq_entries(["a", "b", "c"]),
+                              sink=str(sink))
+    master.journal.close()
+
+    assert counts == {"total": 1, "timed_out": 0, "skipped": 2}
+    assert server.count("POST", "/v1/chat/completions") == 3
+    with open(sink, "r", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert sorted(line["label"] for line in lines) == ["a", "b", "c"]
+    # result is kept in the sink only
+    journal = RunJournal(path)
+    assert "result" not in journal.state("a")
+    journal.close()
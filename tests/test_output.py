@@ -0,0 +1,77 @@
+import hashlib
+import io
+import json
+import os
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.ratelimit import RateLimiter
+
+AUDIO = bytes(range(256)) * 4096
+
+
+@pytest.fixture
+def tts_server(local_server, monkeypatch):
+    """
+    OpenAI TTS stand-in returning audio, or error for prompt "fail".
+    """
+    def speech(handler, body):
+        if json.loads(body)["input"] == "fail":
+            return (400, {"error": "bad request"})
+        return (200, AUDIO, {"Content-Type": "audio/mpeg"})
+
+    local_server.route("POST", "/v1/audio/speech", speech)
+    monkeypatch.setattr(
+        "llmmaster.openai_models.OPENAI_BASE_EP", local_server.url
+    )
+    return local_server
+
+
+def run_tts(entries: dict) -> LLMMaster:
+    master = LLMMaster(
+        executor="pool", rate_limiter=RateLimiter(use_defaults=False)
+    )
+    master.summon({
+        label: {"provider": "openai_tts", "model": "tts-1", **parameters}
+        for label, parameters in entries.items()
+    })
+    master.run()
+    return master
+
+
+def test_output_to_directory(tts_server, tmp_path) -> None:
+    directory = str(tmp_path / "audio") + os.sep
+    master = run_tts({
+        "intro": {"prompt": "hello", "output": directory},
+        "outro": {"prompt": "bye", "output": directory}
+    })
+
+    result = master.results["intro"]
+    assert result == {
+        "path": os.path.join(directory, "intro.mp3"),
+        "size": len(AUDIO),
+        "content_type": "audio/mpeg",
+        "sha256": hashlib.sha256(AUDIO).hexdigest()
+    }
+    with open(result["path"], "rb") as file:
+        assert file.read() == AUDIO
+    assert sorted(os.listdir(directory)) == ["intro.mp3", "outro.mp3"]
+
+
+def test_output_template_and_file_object(tts_server, tmp_path) -> None:
+    buffer = io.BytesIO()
+    master = run_tts({
+        "a": {"prompt": "hello",
+              "output": str(tmp_path / "{label}-{model}{ext}")},
+        "b": {"prompt": "hello", "output": buffer},
+        "c": {"prompt": "fail", "output": str(tmp_path / "c.mp3")}
+    })
+
+    assert master.results["a"]["path"] == str(tmp_path / "a-tts-1.mp3")
+    assert master.results["b"]["path"] is None
+    assert buffer.getvalue() == AUDIO
+    # errors are kept as before and no file is left
+    assert master.results["c"].startswith("Something went wrong. 400")
+    assert not os.path.exists(tmp_path / "c.mp3")
+    assert [n for n in os.listdir(tmp_path) if n.endswith(".part")] == []
@@ -0,0 +1,111 @@
+import json
+import time
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.pipeline import ref
+from llmmaster.polling import PollingPolicy
+from llmmaster.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def meshy_server(local_server, monkeypatch):
+    """
+    Meshy stand-in. Preview task takes seconds given as prompt and
+    refine task 0.1 seconds. Prompt "fail" is rejected.
+    Creation time of each task is kept in state.
+    """
+    state = {"tasks": {}}
+
+    def create(handler, body):
+        body = json.loads(body)
+        if body["mode"] == "preview":
+            if body["prompt"] == "fail":
+                return (400, {"message": "bad prompt"})
+            task_id, seconds = f"p-{body['prompt']}", float(body["prompt"])
+        else:
+            task_id, seconds = f"r-{body['preview_task_id']}", 0.1
+        state["tasks"][task_id] = (time.monotonic(), seconds)
+        return (200, {"result": task_id})
+
+    def status(handler, body):
+        task_id = handler.path.split("?")[0].rsplit("/", 1)[-1]
+        created, seconds = state["tasks"][task_id]
+        if time.monotonic() - created < seconds:
+            return (200, {"id": task_id, "status": "IN_PROGRESS"})
+        return (200, {"id": task_id, "status": "SUCCEEDED"})
+
+    local_server.route("POST", "/v2/text-to-3d", create)
+    local_server.route("GET", "/v2/text-to-3d/*", status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", local_server.url
+    )
+    local_server.state = state
+    return local_server
+
+
+def preview(prompt: str) -> dict:
+    return {"provider": "meshy_tt3d", "model": "meshy-4", "prompt": prompt,
+            "polling": PollingPolicy(initial=0.05, factor=1.0)}
+
+
+def refine(preview_task_id: any) -> dict:
+    return {"provider": "meshy_tt3d_refine", "model": "meshy-4",
+            "preview_task_id": preview_task_id,
+            "polling": PollingPolicy(initial=0.05, factor=1.0)}
+
+
+def make_master() -> LLMMaster:
+    return LLMMaster(
+        executor="pool", rate_limiter=RateLimiter(use_defaults=False)
+    )
+
+
+def test_dependents_start_when_inputs_resolve(meshy_server) -> None:
+    master = make_master()
+    completed = []
+    master.run_graph({
+        "slow": preview("0.8"),
+        "slow_refine": refine(ref("slow").id),
+        "fast": preview("0.1"),
+        "fast_refine": refine(ref("fast")["id"])
+    }, on_complete=lambda label, result, timing: completed.append(label))
+
+    assert master.results["slow_refine"]["id"] == "r-p-0.8"
+    assert master.results["fast_refine"]["id"] == "r-p-0.1"
+    assert master.instances["fast_refine"].parameters["preview_task_id"] == (
+        "p-0.1"
+    )
+    # refine of fast chain does not wait for slow preview
+    tasks = meshy_server.state["tasks"]
+    assert tasks["r-p-0.1"][0] < tasks["p-0.8"][0] + 0.8
+    assert completed.index("fast_refine") < completed.index("slow")
+    assert master.elapsed_time < 1.5
+
+
+def test_failed_dependency_and_invalid_graph(meshy_server) -> None:
+    master = make_master()
+    master.run_graph({
+        "bad": preview("fail"),
+        "bad_refine": refine(ref("bad").id),
+        "bad_refine_2": refine(ref("bad_refine").id),
+        "good": preview("0.1"),
+        "missing": refine(ref("good").model_urls.glb)
+    })
+
+    assert master.results["bad"].startswith("Something went wrong. 400")
+    assert master.results["bad_refine"] == "Skipped. Entry bad failed."
+    assert master.metadata["bad_refine_2"]["status"] == "skipped"
+    assert master.results["missing"] == (
+        "Skipped. ref('good').model_urls.glb not found in result."
+    )
+    assert "bad_refine" not in master.instances
+    assert len(meshy_server.state["tasks"]) == 1
+
+    with pytest.raises(ValueError, match="unknown"):
+        make_master().run_graph({"a": refine(ref("nothing").id)})
+    with pytest.raises(ValueError, match="Circular"):
+        make_master().run_graph({
+            "a": refine(ref("b").id), "b": refine(ref("a").id)
+        })
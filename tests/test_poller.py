@@ -0,0 +1,83 @@
+import threading
+import time
+
+from conftest import make_runway
+from llmmaster import LLMMaster
+from llmmaster.executor import LaunchPolicy
+from llmmaster.poller import Poller
+
+
+def test_poller_resolves_task(runway_server) -> None:
+    runway_server(wait=0.2)
+    poller = Poller(max_workers=1)
+    instance = make_runway()["runway_00"]
+    instance.detached = True
+    instance.run()
+    instance.detached = False
+    assert instance.task is not None
+
+    future = poller.submit(instance)
+    assert future.result(timeout=2.0)["status"] == "SUCCEEDED"
+    assert instance.response["status"] == "SUCCEEDED"
+    assert poller.pending() == 0
+    poller.close()
+
+
+def test_pool_mode_releases_workers(runway_server) -> None:
+    server = runway_server(wait=0.2)
+    """
+    Workers only submit tasks: 40 tasks with 2 workers finish
+    about as fast as 1 task.
+    """
+    master = LLMMaster(executor="pool", max_workers=2)
+    master.instances = make_runway(40)
+    master.run()
+    for result in master.results.values():
+        assert result["status"] == "SUCCEEDED"
+    assert server.count("POST", "/v1/image_to_video") == 40
+    assert master.elapsed_time < 3.0
+
+
+def test_thread_mode_threads_end_after_submission(runway_server) -> None:
+    server = runway_server(wait=0.2)
+    peak = []
+
+    def watch(stop: threading.Event) -> None:
+        while not stop.is_set():
+            peak.append(threading.active_count())
+            time.sleep(0.01)
+
+    master = LLMMaster(
+        launch_policy=LaunchPolicy(per_second=100.0),
+        poller=Poller(max_workers=2)
+    )
+    master.instances = make_runway(30)
+    before = threading.active_count()
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch, args=(stop,))
+    watcher.start()
+    master.run()
+    stop.set()
+    watcher.join()
+
+    for result in master.results.values():
+        assert result["status"] == "SUCCEEDED"
+    assert server.count("POST", "/v1/image_to_video") == 30
+    # threads of entries end right after task submission
+    assert max(peak) - before < 15
+    master.poller.close()
+
+
+def test_poller_rate(runway_server) -> None:
+    runway_server(wait=0.2)
+    master = LLMMaster(
+        executor="pool",
+        poller=Poller(max_workers=4, per_second=20.0)
+    )
+    master.instances = make_runway(10)
+    master.run()
+    for result in master.results.values():
+        assert result["status"] == "SUCCEEDED"
+    # 30 status checks at 20/sec after a burst of 20
+    assert master.elapsed_time > 0.4
+    master.poller.close()
@@ -0,0 +1,82 @@
+import time
+
+from llmmaster.meshy_models import MeshyTextTo3D
+from llmmaster.polling import PollingPolicy
+from llmmaster.runway_models import RunwayImageToVideo
+
+
+def test_interval_growth() -> None:
+    policy = PollingPolicy(initial=1.0, factor=2.0, max_interval=5.0)
+    assert policy.interval(1) == 1.0
+    assert policy.interval(2) == 2.0
+    assert policy.interval(3) == 4.0
+    assert policy.interval(10) == 5.0
+
+
+def test_interval_from_progress() -> None:
+    policy = PollingPolicy(initial=1.0, factor=2.0, max_interval=30.0)
+    # 25% done in 10 sec: 30 sec remaining, capped
+    assert policy.interval(1, elapsed=10.0, progress=0.25) == 30.0
+    # 80% done in 8 sec: 2 sec remaining
+    assert policy.interval(1, elapsed=8.0, progress=0.8) == 2.0
+    # 99% done: not shorter than initial
+    assert policy.interval(5, elapsed=99.0, progress=0.99) == 1.0
+    # no progress yet: plain growth
+    assert policy.interval(3, elapsed=5.0, progress=0.0) == 4.0
+    assert PollingPolicy(use_progress=False).interval(
+        1, elapsed=8.0, progress=0.8
+    ) == 1.0
+
+
+def test_entry_polling_option(local_server, monkeypatch) -> None:
+    started = {}
+
+    def task_status(handler, body):
+        elapsed = time.monotonic() - started["at"]
+        if elapsed < 1.0:
+            return (200, {"status": "IN_PROGRESS", "progress": 0})
+        return (200, {"status": "SUCCEEDED", "progress": 100})
+
+    def submit(handler, body):
+        started["at"] = time.monotonic()
+        return (200, {"result": "task-01"})
+
+    local_server.route("POST", "/v2/text-to-3d", submit)
+    local_server.route("GET", "/v2/text-to-3d/*", task_status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", local_server.url
+    )
+
+    instance = MeshyTextTo3D(
+        api_key="dummy",
+        model="meshy-4",
+        prompt="a cube",
+        polling=PollingPolicy(initial=0.1, factor=2.0, max_interval=5.0)
+    )
+    instance.run()
+    elapsed = time.monotonic() - started["at"]
+
+    assert instance.response["status"] == "SUCCEEDED"
+    assert "polling" not in instance.parameters
+    # checks at 0, 0.1, 0.3, 0.7 and 1.5 sec
+    assert local_server.count("GET", "/v2/text-to-3d/task-01") == 5
+    assert elapsed < 2.0
+
+
+def test_progress_of_providers() -> None:
+    class Stub:
+        def __init__(self, content: dict) -> None:
+            self.content = content
+
+        def json(self) -> dict:
+            return self.content
+
+    meshy = MeshyTextTo3D(api_key="dummy", model="meshy-4", prompt="cube")
+    assert meshy._task_progress(Stub({"progress": 40})) == 0.4
+    runway = RunwayImageToVideo(
+        api_key="dummy",
+        model="gen3a_turbo",
+        promptImage="https://example.com/image.png"
+    )
+    assert runway._task_progress(Stub({"progress": 0.4})) == 0.4
+    assert runway._task_progress(Stub({"status": "PENDING"})) is None
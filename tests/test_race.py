@@ -0,0 +1,107 @@
+import json
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.race import HedgePolicy
+from llmmaster.ratelimit import RateLimiter
+
+
+def completion(handler, body):
+    """
+    Groq stand-in answering after seconds given as prompt,
+    or failing at once for prompt "fail".
+    """
+    prompt = json.loads(body)["messages"][-1]["content"]
+    if prompt == "fail":
+        return (400, {"error": "bad request"})
+    time.sleep(float(prompt))
+    return (200, {"answer": prompt})
+
+
+def make_master(prompts: dict) -> LLMMaster:
+    master = LLMMaster(rate_limiter=RateLimiter(use_defaults=False))
+    master.summon({
+        label: {"provider": "groq", "model": "m", "prompt": prompt}
+        for label, prompt in prompts.items()
+    })
+    return master
+
+
+def test_first_success_wins(groq_server) -> None:
+    groq_server(completion)
+    master = make_master({"slow": "1.0", "bad": "fail", "fast": "0.2"})
+    start = time.monotonic()
+    label, result = master.race()
+
+    assert time.monotonic() - start < 0.8
+    assert (label, result) == ("fast", {"answer": "0.2"})
+    assert master.results["bad"].startswith("Something went wrong.")
+    assert master.results["slow"].startswith("Cancelled.")
+    assert master.metadata["slow"]["status"] == "cancelled"
+
+    # request of the loser is aborted, and its worker ends without
+    # overwriting the cancelled result
+    time.sleep(1.0)
+    slow = master.instances["slow"]
+    assert slow.metadata["attempts"][0]["elapsed"] < 0.8
+    assert slow.response == master.results["slow"]
+    assert slow.metadata["status"] == "cancelled"
+
+
+def test_no_winner_by_timeout(groq_server) -> None:
+    groq_server(completion)
+    master = make_master({"a": "1.0", "b": "fail"})
+    assert master.race(timeout=0.3) == (None, None)
+    assert master.results["a"] == "Timed out. Still running at deadline."
+    assert master.metadata["a"]["status"] == "timed_out"
+
+    # backup not started by the deadline
+    master = make_master({"a": "1.0", "b": "0.1"})
+    assert master.race(timeout=0.3, hedge=1.0) == (None, None)
+    assert master.metadata["a"]["status"] == "timed_out"
+    assert master.results["b"] == "Timed out. Deadline passed before start."
+    assert master.metadata["b"]["status"] == "timed_out"
+
+
+def test_hedged_race(groq_server) -> None:
+    server = groq_server(completion)
+    # primary answers within the hedge delay: no backup request
+    master = make_master({"primary": "0.1", "backup": "0.1"})
+    assert master.race(hedge=0.5)[0] == "primary"
+    assert server.count("POST", "/v1/chat/completions") == 1
+    assert master.results["backup"] == "Skipped. Another entry won."
+    assert master.metadata["backup"]["status"] == "skipped"
+
+    # primary is slow: backup starts after the delay and wins
+    master = make_master({"primary": "2.0", "backup": "0.1", "third": "0.1"})
+    start = time.monotonic()
+    label, _ = master.race(hedge=0.3)
+
+    assert label == "backup"
+    assert 0.3 < time.monotonic() - start < 1.0
+    assert server.count("POST", "/v1/chat/completions") == 3
+    assert master.metadata["primary"]["status"] == "cancelled"
+    assert master.metadata["third"]["status"] == "skipped"
+
+
+def test_hedge_records_cancelled_latency(groq_server) -> None:
+    groq_server(completion)
+    hedge = HedgePolicy(initial=0.3, min_samples=10)
+    master = make_master({"primary": "2.0", "backup": "0.1"})
+    assert master.race(hedge=hedge)[0] == "backup"
+
+    # primary was cancelled after the delay and the backup answer
+    samples = sorted(hedge.samples)
+    assert len(samples) == 2
+    assert samples[0] < 0.3 < samples[1]
+
+
+def test_hedge_delay_from_percentile() -> None:
+    hedge = HedgePolicy(percentile=95, initial=2.0, min_samples=10)
+    for i in range(1, 10):
+        hedge.record(i / 10)
+    assert hedge.delay() == 2.0
+
+    for i in range(10, 101):
+        hedge.record(i / 10)
+    assert hedge.delay() == 9.5
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.deadline import Deadline
+from llmmaster.deadline import DeadlineExceeded
+from llmmaster.ratelimit import RateLimit
+from llmmaster.ratelimit import RateLimiter
+from llmmaster.ratelimit import estimate_tokens
+
+
+def test_requests_per_minute() -> None:
+    limit = RateLimit(rpm=600)
+    start = time.monotonic()
+    waits = [limit.acquire() for _ in range(603)]
+    elapsed = time.monotonic() - start
+    # a full bucket of 600, then one request per 0.1 sec
+    assert waits[:600] == [0.0] * 600
+    assert 0.25 < elapsed < 0.5
+
+
+def test_tokens_per_minute() -> None:
+    limit = RateLimit(tpm=6000)
+    assert limit._reserve(tokens=6000) == 0.0
+    # 100 tokens per second refill
+    assert limit._reserve(tokens=50) == pytest.approx(0.5, abs=0.05)
+    # larger than bucket: waits for a full bucket
+    assert limit._reserve(tokens=99999) == pytest.approx(60.5, abs=0.1)
+
+
+def test_deadline_does_not_use_quota() -> None:
+    limit = RateLimit(rpm=60)
+    for _ in range(60):
+        limit.acquire()
+    with pytest.raises(DeadlineExceeded):
+        limit.acquire(deadline=Deadline(0.5))
+    assert limit.acquire(deadline=Deadline(1.5)) == pytest.approx(1.0, 0.05)
+
+
+def test_cancel_during_wait(groq_server) -> None:
+    server = groq_server([(200, {})])
+    master = LLMMaster(
+        executor="pool",
+        rate_limiter=RateLimiter({"GROQ_API_KEY": {"rpm": 6}})
+    )
+    master.rate_limiter.get("GROQ_API_KEY")._requests = 0
+    master.summon({
+        "groq": {"provider": "groq", "model": "m", "prompt": "hi"}
+    })
+    instance = master.instances["groq"]
+    threading.Timer(0.3, instance.cancel).start()
+    start = time.monotonic()
+    master.run()
+
+    # quota comes in 10 sec, cancel ends the wait at once
+    assert time.monotonic() - start < 2.0
+    assert server.count("POST", "/v1/chat/completions") == 0
+
+
+def test_registry() -> None:
+    limiter = RateLimiter(
+        {("GROQ_API_KEY", "fast"): {"rpm": 100}}, use_defaults=False
+    )
+    assert limiter.get("GROQ_API_KEY", "slow") is None
+    assert limiter.get("GROQ_API_KEY", "fast").rpm == 100
+    limiter.set("GROQ_API_KEY", rpm=10)
+    shared = limiter.get("GROQ_API_KEY", "slow")
+    assert shared is limiter.get("GROQ_API_KEY")
+    # lowest-tier defaults are opt-in
+    assert RateLimiter().get("GROQ_API_KEY") is None
+    assert RateLimiter(use_defaults=True).get("GROQ_API_KEY").rpm == 30
+
+    body = {"messages": [{"content": "x" * 400}], "data": "y" * 9999,
+            "image": "data:image/png;base64,zzzz", "max_tokens": 100}
+    assert estimate_tokens(body) == 100
+
+
+def test_entries_share_provider_quota(groq_server) -> None:
+    groq_server([(200, {})])
+    master = LLMMaster(
+        executor="pool",
+        rate_limiter=RateLimiter({"GROQ_API_KEY": {"rpm": 300}})
+    )
+    master.rate_limiter.get("GROQ_API_KEY")._requests = 1
+    master.summon({
+        f"groq_{i}": {"provider": "groq", "model": "m", "prompt": "hi"}
+        for i in range(3)
+    })
+    master.run()
+
+    # one from bucket, then one per 0.2 sec
+    assert 0.35 < master.elapsed_time < 1.0
+    waits = [m.get("rate_wait", 0.0) for m in master.metadata.values()]
+    assert sorted(waits)[0] == 0.0
+    assert sorted(waits)[-1] == pytest.approx(0.4, abs=0.05)
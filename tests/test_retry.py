@@ -0,0 +1,146 @@
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.groq_models import GroqLLM
+from llmmaster.retry import RetryPolicy
+from llmmaster.retry import parse_reset
+from llmmaster.transport import Transport
+
+
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff=0.01, max_backoff=1.0)
+
+
+def test_parse_reset() -> None:
+    assert parse_reset("20") == 20.0
+    assert parse_reset("1.5") == 1.5
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("2m59.56s") == 179.56
+    assert parse_reset("20ms") == 0.02
+    assert 9 < parse_reset(str(time.time() + 10)) <= 10
+    assert parse_reset("invalid") is None
+    assert parse_reset("2000-01-01T00:00:00Z") == 0.0
+
+
+def test_wait_time() -> None:
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0, jitter=0.0)
+    assert policy.wait_time(1) == 1.0
+    assert policy.wait_time(2) == 2.0
+    assert policy.wait_time(5) == 5.0
+    policy = RetryPolicy(backoff=1.0, jitter=1.0)
+    assert 0.0 <= policy.wait_time(2) <= 2.0
+
+
+def test_retry_status_and_retry_after(local_server) -> None:
+    local_server.route("GET", "/task", [
+        (429, {"error": "rate limit"}, {"Retry-After": "0.2"}),
+        (503, {"error": "unavailable"}),
+        (200, {"ok": True})
+    ])
+    attempts = []
+    start = time.monotonic()
+    response = Transport().request(
+        "GET", f"{local_server.url}/task?key=secret",
+        retry=FAST_RETRY, attempts=attempts
+    )
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert [a["status"] for a in attempts] == [429, 503, 200]
+    assert attempts[0]["wait"] == 0.2
+    assert "secret" not in attempts[0]["url"]
+
+
+def test_no_retry_for_client_error(local_server) -> None:
+    local_server.route("GET", "/task", [(400, {"error": "bad request"})])
+    attempts = []
+    response = Transport().request(
+        "GET", f"{local_server.url}/task",
+        retry=FAST_RETRY, attempts=attempts
+    )
+    assert response.status_code == 400
+    assert len(attempts) == 1
+
+
+def test_server_error_retry_by_method(local_server) -> None:
+    local_server.route("GET", "/task", [(500, {}), (200, {"ok": True})])
+    local_server.route(
+        "POST", "/generate", [(502, {}), (502, {}), (200, {"ok": True})]
+    )
+    transport = Transport()
+
+    attempts = []
+    transport.request(
+        "GET", f"{local_server.url}/task",
+        retry=FAST_RETRY, attempts=attempts
+    )
+    assert [a["status"] for a in attempts] == [500, 200]
+
+    # paid generation may have started, not sent again by default
+    attempts = []
+    response = transport.request(
+        "POST", f"{local_server.url}/generate",
+        retry=FAST_RETRY, attempts=attempts
+    )
+    assert response.status_code == 502
+    assert len(attempts) == 1
+
+    attempts = []
+    transport.request(
+        "POST", f"{local_server.url}/generate",
+        retry=RetryPolicy(backoff=0.01, retry_unsafe=True),
+        attempts=attempts
+    )
+    assert [a["status"] for a in attempts] == [502, 200]
+
+
+def test_give_up_on_long_retry_after(local_server) -> None:
+    local_server.route("GET", "/task", [
+        (429, {"error": "rate limit"}, {"Retry-After": "30"}),
+        (200, {"ok": True})
+    ])
+    attempts = []
+    start = time.monotonic()
+    response = Transport().request(
+        "GET", f"{local_server.url}/task",
+        retry=FAST_RETRY, attempts=attempts
+    )
+    assert response.status_code == 429
+    assert "wait" not in attempts[0]
+    assert time.monotonic() - start < 1.0
+
+
+def test_retry_connection_error() -> None:
+    attempts = []
+    try:
+        Transport().request(
+            "GET", "http://127.0.0.1:9/unreachable",
+            retry=FAST_RETRY, attempts=attempts
+        )
+    except Exception as e:
+        assert "Connection" in type(e).__name__
+    assert len(attempts) == 3
+    assert attempts[-1]["error"]
+
+
+def test_retry_policy_per_provider_and_entry(groq_server):
+    groq_server([
+        (503, {"error": "unavailable"}),
+        (200, {"ok": True})
+    ])
+    no_retry = RetryPolicy(max_attempts=1)
+    master = LLMMaster(retry_policies={"groq": FAST_RETRY})
+    master.summon({
+        "by_provider": master.pack_parameters(provider="groq", prompt="Hi"),
+        "by_entry": master.pack_parameters(
+            provider="groq", prompt="Hi", retry=no_retry
+        )
+    })
+    assert master.instances["by_provider"].retry_policy is FAST_RETRY
+    assert master.instances["by_entry"].retry_policy is no_retry
+    assert "retry" not in master.instances["by_entry"].parameters
+
+    instance = GroqLLM(
+        api_key="dummy", model="dummy", prompt="Hi", retry=FAST_RETRY
+    )
+    instance.run()
+    assert instance.response == {"ok": True}
+    assert len(instance.metadata["attempts"]) == 2
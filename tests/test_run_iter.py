@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.ratelimit import RateLimiter
+
+
+def completion(handler, body):
+    """
+    Groq stand-in answering after seconds given as prompt.
+    """
+    prompt = json.loads(body)["messages"][-1]["content"]
+    time.sleep(float(prompt))
+    return (200, {"answer": prompt})
+
+
+def make_master(delays: dict) -> LLMMaster:
+    master = LLMMaster(
+        executor="pool", rate_limiter=RateLimiter(use_defaults=False)
+    )
+    master.summon({
+        label: {"provider": "groq", "model": "m", "prompt": str(delay)}
+        for label, delay in delays.items()
+    })
+    return master
+
+
+def test_run_iter_in_completion_order(groq_server) -> None:
+    groq_server(completion)
+    master = make_master({"slow": 0.6, "fast": 0.05, "mid": 0.3})
+    start = time.monotonic()
+    items = []
+    for label, result, timing in master.run_iter():
+        items.append((label, result, timing, time.monotonic() - start))
+
+    assert [item[0] for item in items] == ["fast", "mid", "slow"]
+    assert items[0][1] == {"answer": "0.05"}
+    assert items[0][3] < 0.3
+    assert items[0][2]["elapsed"] < items[2][2]["elapsed"]
+    assert list(master.results) == ["fast", "mid", "slow"]
+    assert master.elapsed_time >= 0.6
+
+
+def test_callbacks_and_release(groq_server) -> None:
+    groq_server(completion)
+    master = make_master({"a": 0.1, "b": 0.2})
+    received = []
+    master.run(on_complete=lambda *item: received.append(item[0]))
+    assert received == ["a", "b"]
+    assert master.results == {"a": {"answer": "0.1"}, "b": {"answer": "0.2"}}
+
+    for label, result, _ in master.run_iter(keep_results=False):
+        assert result == {"answer": "0.1" if label == "a" else "0.2"}
+    assert master.results == {} and master.metadata == {}
+    assert master.instances["a"].response == ''
+
+
+def test_arun_iter_with_timeout(groq_server) -> None:
+    groq_server(completion)
+    master = make_master({"slow": 3.0, "fast": 0.05})
+
+    async def consume() -> list:
+        return [item async for item in master.arun_iter(timeout=0.5)]
+
+    start = time.monotonic()
+    items = asyncio.run(consume())
+
+    assert time.monotonic() - start < 1.5
+    assert [item[0] for item in items] == ["fast", "slow"]
+    assert items[0][1] == {"answer": "0.05"}
+    assert items[1][1].startswith("Timed out.")
+    assert master.metadata["slow"]["status"] == "timed_out"
+
+
+def test_polled_entry_does_not_block_others(groq_server, monkeypatch):
+    server = groq_server(completion)
+    started = {}
+
+    def submit(handler, body):
+        started["at"] = time.monotonic()
+        return (200, {"result": "task-01"})
+
+    def task_status(handler, body):
+        if time.monotonic() - started["at"] < 0.8:
+            return (200, {"status": "IN_PROGRESS", "progress": 0})
+        return (200, {"status": "SUCCEEDED", "progress": 100})
+
+    server.route("POST", "/v2/text-to-3d", submit)
+    server.route("GET", "/v2/text-to-3d/*", task_status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", server.url
+    )
+
+    master = make_master({"groq": 0.1})
+    master.summon({"meshy": {
+        "provider": "meshy_tt3d", "model": "meshy-4", "prompt": "a cube"
+    }})
+    items = list(master.run_iter())
+
+    assert [item[0] for item in items] == ["groq", "meshy"]
+    assert items[0][2]["elapsed"] < 0.5
+    assert items[1][1]["status"] == "SUCCEEDED"
@@ -0,0 +1,154 @@
+import json
+import threading
+
+from llmmaster import LLMMaster
+from llmmaster.anthropic_models import AnthropicLLM
+from llmmaster.google_models import GoogleLLM
+from llmmaster.groq_models import GroqLLM
+from llmmaster.streaming import TokenStream
+
+
+def sse(events: list, done: bool = False) -> tuple:
+    body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+    body += "data: [DONE]\n\n" if done else ""
+    return (200, body, {"Content-Type": "text/event-stream"})
+
+
+GROQ_CHUNKS = [
+    {"id": "c1", "object": "chat.completion.chunk", "model": "m",
+     "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""},
+                  "finish_reason": None}]},
+    {"id": "c1", "object": "chat.completion.chunk", "model": "m",
+     "choices": [{"index": 0, "delta": {"content": "Hello"},
+                  "finish_reason": None}]},
+    {"id": "c1", "object": "chat.completion.chunk", "model": "m",
+     "choices": [{"index": 0, "delta": {"content": ", world"},
+                  "finish_reason": "stop"}]}
+]
+
+ANTHROPIC_EVENTS = [
+    {"type": "message_start",
+     "message": {"id": "msg_1", "role": "assistant", "content": [],
+                 "usage": {"input_tokens": 5, "output_tokens": 1}}},
+    {"type": "content_block_start", "index": 0,
+     "content_block": {"type": "text", "text": ""}},
+    {"type": "content_block_delta", "index": 0,
+     "delta": {"type": "text_delta", "text": "Hi"}},
+    {"type": "content_block_delta", "index": 0,
+     "delta": {"type": "text_delta", "text": " there"}},
+    {"type": "content_block_start", "index": 1,
+     "content_block": {"type": "tool_use", "id": "t1", "name": "f",
+                       "input": {}}},
+    {"type": "content_block_delta", "index": 1,
+     "delta": {"type": "input_json_delta", "partial_json": "{\"a\": "}},
+    {"type": "content_block_delta", "index": 1,
+     "delta": {"type": "input_json_delta", "partial_json": "1}"}},
+    {"type": "message_delta", "delta": {"stop_reason": "tool_use"},
+     "usage": {"output_tokens": 7}},
+    {"type": "message_stop"}
+]
+
+GOOGLE_CHUNKS = [
+    {"candidates": [{"content": {"parts": [{"text": "Good"}],
+                                 "role": "model"}, "index": 0}]},
+    {"candidates": [{"content": {"parts": [{"text": " day"}],
+                                 "role": "model"},
+                     "finishReason": "STOP", "index": 0}],
+     "usageMetadata": {"totalTokenCount": 9}}
+]
+
+
+def test_openai_compatible_stream(groq_server) -> None:
+    server = groq_server([sse(GROQ_CHUNKS, done=True)])
+    deltas = []
+    instance = GroqLLM(
+        api_key="dummy", model="m", prompt="hello", stream=deltas.append
+    )
+    instance.run()
+
+    body = json.loads(server.calls[0][2])
+    assert body["stream"] is True
+    assert "stream" not in instance.parameters
+    assert "".join(deltas) == "Hello, world"
+    message = instance.response["choices"][0]
+    assert message["message"]["content"] == "Hello, world"
+    assert message["finish_reason"] == "stop"
+    assert instance.response["object"] == "chat.completion"
+    assert "first_token" in instance.metadata
+
+
+def test_stream_iterated_while_running(groq_server) -> None:
+    groq_server([sse(GROQ_CHUNKS, done=True)])
+    master = LLMMaster()
+    master.summon({"groq": {
+        "provider": "groq", "model": "m", "prompt": "hi", "stream": True
+    }})
+    stream = master.instances["groq"].stream
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(stream))
+    reader.start()
+    master.run()
+    reader.join(timeout=5.0)
+
+    assert not reader.is_alive()
+    assert "".join(received) == stream.text == "Hello, world"
+    result = master.results["groq"]
+    assert result["choices"][0]["message"]["content"] == "Hello, world"
+
+
+def test_stream_error_status(groq_server) -> None:
+    groq_server([(400, {"error": {"message": "bad request"}})])
+    stream = TokenStream()
+    instance = GroqLLM(
+        api_key="dummy", model="m", prompt="hi", stream=stream
+    )
+    instance.run()
+
+    assert instance.response.startswith("Something went wrong.")
+    assert list(stream) == []
+
+
+def test_anthropic_stream(local_server, monkeypatch) -> None:
+    local_server.route("POST", "/v1/messages", [sse(ANTHROPIC_EVENTS)])
+    monkeypatch.setattr(
+        "llmmaster.anthropic_models.ANTHROPIC_TTT_EP",
+        local_server.url + "/v1/messages"
+    )
+    stream = TokenStream()
+    instance = AnthropicLLM(
+        api_key="dummy", model="m", prompt="hi", stream=stream
+    )
+    instance.run()
+
+    assert stream.text == "Hi there"
+    assert instance.response["content"] == [
+        {"type": "text", "text": "Hi there"},
+        {"type": "tool_use", "id": "t1", "name": "f", "input": {"a": 1}}
+    ]
+    assert instance.response["stop_reason"] == "tool_use"
+    assert instance.response["usage"] == {
+        "input_tokens": 5, "output_tokens": 7
+    }
+
+
+def test_google_stream(local_server, monkeypatch) -> None:
+    path = "/v1beta/models/gemini-1.5-flash:streamGenerateContent"
+    local_server.route("POST", path, [sse(GOOGLE_CHUNKS)])
+    monkeypatch.setattr(
+        "llmmaster.google_models.GOOGLE_GEMINI_BASE_EP", local_server.url
+    )
+    stream = TokenStream()
+    instance = GoogleLLM(
+        api_key="dummy",
+        model="gemini-1.5-flash",
+        prompt="hi",
+        stream=stream
+    )
+    instance.run()
+
+    assert local_server.count("POST", path) == 1
+    assert stream.text == "Good day"
+    candidate = instance.response["candidates"][0]
+    assert candidate["content"]["parts"] == [{"text": "Good day"}]
+    assert candidate["finishReason"] == "STOP"
+    assert instance.response["usageMetadata"] == {"totalTokenCount": 9}
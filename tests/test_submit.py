@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from llmmaster import LLMMaster
+from llmmaster.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def servers(groq_server, monkeypatch):
+    """
+    Meshy stand-in finishing tasks when state "done" is set,
+    and Groq stand-in answering at once.
+    """
+    server = groq_server([(200, {"answer": "ok"})])
+    server.state = {"done": False}
+
+    def task_status(handler, body):
+        if server.state["done"]:
+            return (200, {"status": "SUCCEEDED", "progress": 100})
+        return (200, {"status": "IN_PROGRESS", "progress": 10})
+
+    server.route("POST", "/v2/text-to-3d",
+                 lambda handler, body: (200, {"result": "task-01"}))
+    server.route("GET", "/v2/text-to-3d/*", task_status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", server.url
+    )
+    return server
+
+
+def make_master() -> LLMMaster:
+    return LLMMaster(
+        executor="pool", rate_limiter=RateLimiter(use_defaults=False)
+    )
+
+
+def test_submit_returns_handles(servers) -> None:
+    master = make_master()
+    master.summon({
+        "cube": {"provider": "meshy_tt3d", "model": "meshy-4",
+                 "prompt": "a cube"},
+        "chat": {"provider": "groq", "model": "m", "prompt": "hi"}
+    })
+    handles = master.submit()
+
+    assert list(handles) == ["cube"]
+    assert handles["cube"]["provider"] == "meshy_tt3d"
+    assert handles["cube"]["task"]["url"].endswith("/v2/text-to-3d/task-01")
+    assert master.results == {"chat": {"answer": "ok"}}
+    assert servers.count("GET", "/v2/text-to-3d/task-01") == 0
+
+    # collected by another master, e.g. in another process
+    handles = json.loads(json.dumps(handles))
+    servers.state["done"] = True
+    results = make_master().collect(handles)
+
+    assert results["cube"]["status"] == "SUCCEEDED"
+    assert servers.count("POST", "/v2/text-to-3d") == 1
+
+
+def test_collect_again_after_timeout(servers) -> None:
+    master = make_master()
+    master.summon({
+        "cube": {"provider": "meshy_tt3d", "model": "meshy-4",
+                 "prompt": "a cube"}
+    })
+    handles = master.submit()
+
+    collector = make_master()
+    results = collector.collect(handles, timeout=0.3)
+    assert results["cube"].startswith("Timed out.")
+    assert collector.metadata["cube"]["status"] == "timed_out"
+
+    servers.state["done"] = True
+    results = collector.collect(handles)
+    assert results["cube"]["status"] == "SUCCEEDED"
+    assert servers.count("POST", "/v2/text-to-3d") == 1
+
+
+def test_collect_without_input_file(local_server, monkeypatch) -> None:
+    """
+    Image of tripo_it3d was uploaded at submit and is not needed here.
+    """
+    local_server.route("GET", "/task/task-02", [
+        (200, {"code": 0, "data": {"status": "success"}})
+    ])
+    monkeypatch.setattr(
+        "llmmaster.tripo_models.TRIPO_BASE_EP", local_server.url
+    )
+    task = {"url": f"{local_server.url}/task/task-02", "wait_time": 0.1}
+    handles = {
+        "statue": {
+            "provider": "tripo_it3d",
+            "parameters": {"provider": "tripo_it3d", "model": "v2.5",
+                           "prompt": "dummy", "file": "/gone/statue.png"},
+            "task": task
+        },
+        "unknown": {
+            "provider": "nothing",
+            "parameters": {"provider": "nothing", "prompt": "hi"},
+            "task": task
+        }
+    }
+    results = make_master().collect(handles)
+
+    assert results["statue"]["data"]["status"] == "success"
+    assert results["unknown"].startswith("Something went wrong.")
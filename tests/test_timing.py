@@ -0,0 +1,106 @@
+import json
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.meshy_models import MeshyTextTo3D
+from llmmaster.polling import PollingPolicy
+from llmmaster.ratelimit import RateLimiter
+from llmmaster.transport import Transport
+
+
+def test_entry_timing_and_trace(groq_server, tmp_path) -> None:
+    def completion(handler, body):
+        time.sleep(0.2)
+        return (200, {"answer": "ok"})
+
+    groq_server(completion)
+
+    master = LLMMaster(
+        executor="pool",
+        max_workers=1,
+        transport=Transport(),
+        rate_limiter=RateLimiter(use_defaults=False)
+    )
+    master.summon({
+        label: {"provider": "groq", "model": "m", "prompt": label}
+        for label in ["first", "second"]
+    })
+    master.run()
+
+    first = master.metadata["first"]["timing"]
+    second = master.metadata["second"]["timing"]
+    assert first["queue_wait"] < 0.1
+    assert second["queue_wait"] >= 0.2
+    # connection opened by the first entry is reused by the second
+    assert first["connect"] >= 0 and second["connect"] == 0
+    assert 0.2 <= first["ttfb"] <= first["total"]
+    assert first["retries"] == 0 and first["polls"] == 0
+    assert master.metadata["first"]["attempts"][0]["transfer"] is not None
+
+    path = tmp_path / "trace.json"
+    master.export_trace(str(path))
+    with open(path, "r", encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+    names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert names == {"first", "second"}
+    http = [e for e in events if e.get("cat") == "http"]
+    assert len(http) == 2 and all(e["dur"] >= 200000 for e in http)
+
+
+def test_polling_timing(local_server, monkeypatch) -> None:
+    started = {}
+
+    def task_status(handler, body):
+        if time.monotonic() - started["at"] < 0.5:
+            return (200, {"status": "IN_PROGRESS", "progress": 0})
+        return (200, {"status": "SUCCEEDED", "progress": 100})
+
+    def submit(handler, body):
+        started["at"] = time.monotonic()
+        return (200, {"result": "task-01"})
+
+    local_server.route("POST", "/v2/text-to-3d", submit)
+    local_server.route("GET", "/v2/text-to-3d/*", task_status)
+    monkeypatch.setattr(
+        "llmmaster.meshy_models.MESHY_BASE_EP", local_server.url
+    )
+
+    instance = MeshyTextTo3D(
+        api_key="dummy",
+        model="meshy-4",
+        prompt="a cube",
+        polling=PollingPolicy(initial=0.2, factor=1.0, max_interval=0.2)
+    )
+    instance.set_deadline()
+    instance.run()
+    instance.complete()
+
+    timing = instance.metadata["timing"]
+    assert instance.response["status"] == "SUCCEEDED"
+    assert timing["polls"] == local_server.count(
+        "GET", "/v2/text-to-3d/task-01"
+    )
+    assert timing["polls"] >= 3
+    assert timing["poll_wait"] >= 0.4
+
+
+def test_dropped_retry_not_counted(groq_server) -> None:
+    groq_server([
+        (429, {"error": "rate limit"}, {"Retry-After": "5"}),
+        (200, {"answer": "ok"})
+    ])
+
+    master = LLMMaster(
+        transport=Transport(),
+        rate_limiter=RateLimiter(use_defaults=False)
+    )
+    master.summon({
+        "groq": {"provider": "groq", "model": "m", "prompt": "hello"}
+    })
+    start = time.monotonic()
+    master.run(timeout=2.0)
+
+    # Retry-After is beyond the deadline, so the 429 is given up on
+    assert time.monotonic() - start < 1.0
+    assert len(master.metadata["groq"]["attempts"]) == 1
+    assert master.metadata["groq"]["timing"]["retries"] == 0
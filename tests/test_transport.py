@@ -0,0 +1,68 @@
+import time
+
+from llmmaster import LLMMaster
+from llmmaster.groq_models import GroqLLM
+from llmmaster.transport import Transport
+from llmmaster.transport import base_endpoint
+from llmmaster.transport import get_transport
+
+
+def record_port(ports: list):
+    def responder(handler, body):
+        ports.append(handler.client_address[1])
+        return (200, {"ok": True})
+    return responder
+
+
+def test_base_endpoint() -> None:
+    url = "https://api.openai.com/v1/chat/completions?x=1"
+    assert base_endpoint(url) == "https://api.openai.com"
+
+
+def test_connection_reused(local_server) -> None:
+    ports = []
+    local_server.route("GET", "/ping", record_port(ports))
+    transport = Transport()
+    for _ in range(5):
+        response = transport.request("GET", f"{local_server.url}/ping")
+        assert response.json() == {"ok": True}
+    assert len(ports) == 5
+    assert len(set(ports)) == 1
+    transport.close()
+
+
+def test_connection_recycled(local_server) -> None:
+    ports = []
+    local_server.route("GET", "/ping", record_port(ports))
+    transport = Transport(max_age=0.1)
+    transport.request("GET", f"{local_server.url}/ping")
+    time.sleep(0.2)
+    transport.request("GET", f"{local_server.url}/ping")
+    assert len(set(ports)) == 2
+    transport.close()
+
+
+def test_rest_api_through_transport(groq_server) -> None:
+    ports = []
+    groq_server(record_port(ports))
+    transport = Transport()
+    for _ in range(3):
+        instance = GroqLLM(api_key="dummy", model="dummy", prompt="Hello.")
+        instance.transport = transport
+        instance.run()
+        assert instance.response == {"ok": True}
+    assert len(set(ports)) == 1
+    transport.close()
+
+
+def test_master_shares_transport() -> None:
+    master = LLMMaster()
+    assert master.transport is get_transport()
+
+    transport = Transport()
+    master = LLMMaster(transport=transport)
+    for i in range(3):
+        entry = master.pack_parameters(provider="groq", prompt="Hello.")
+        master.summon({f"groq_{i}": entry})
+    for instance in master.instances.values():
+        assert instance.transport is transport
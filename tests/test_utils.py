@@ -0,0 +1,62 @@
+import base64
+import os
+
+import pytest
+
+from llmmaster import utils
+from llmmaster.utils import _Base64Cache
+from llmmaster.utils import _encode_base64
+from llmmaster.utils import iter_base64
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(os.urandom(10000))
+    return str(path)
+
+
+def test_chunked_encoder(image) -> None:
+    expected = base64.b64encode(open(image, "rb").read())
+    assert b"".join(iter_base64(image, chunk_size=1000)) == expected
+    assert _encode_base64(image) == expected.decode("utf-8")
+
+
+def test_encoding_cache(image, monkeypatch) -> None:
+    cache = _Base64Cache(max_bytes=30000)
+    monkeypatch.setattr(utils, "_BASE64_CACHE", cache)
+    reads = []
+    original = utils.iter_base64
+
+    def counting(file_path: str = '', **kwargs):
+        reads.append(file_path)
+        return original(file_path, **kwargs)
+
+    monkeypatch.setattr(utils, "iter_base64", counting)
+
+    prompts = [
+        utils.anthropic_vision_prompt("hi", [image]),
+        utils.google_vision_prompt("hi", [image]),
+        utils.common_vision_prompt("hi", [image])
+    ]
+    assert len(reads) == 1
+    assert prompts[0][1]["source"]["data"] == prompts[1][1]["inline_data"][
+        "data"
+    ]
+
+    # modified file is encoded again and replaces the old one
+    with open(image, "wb") as f:
+        f.write(b"new content")
+    os.utime(image, ns=(0, 0))
+    assert _encode_base64(image) == base64.b64encode(b"new content").decode()
+    assert len(reads) == 2
+    assert len(cache._entries) == 1
+
+    # LRU eviction by total size
+    for i in range(3):
+        path = os.path.join(os.path.dirname(image), f"{i}.wav")
+        with open(path, "wb") as f:
+            f.write(os.urandom(9000))
+        _encode_base64(path)
+    assert cache.size <= 30000
+    assert len(cache._entries) == 2
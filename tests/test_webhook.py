@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from llmmaster import LLMMaster
+from llmmaster.executor import LaunchPolicy
+from llmmaster.skybox_models import SkyboxTextToPanorama
+from llmmaster.webhook import WebhookServer
+
+
+@pytest.fixture
+def skybox_server(local_server, monkeypatch):
+    """
+    Skybox stand-in: calls back webhook_url 0.3 sec after submission.
+    Status endpoint always says complete for fallback polling.
+    """
+    counter = iter(range(1, 1000))
+
+    def call_back(url: str, request_id: int) -> None:
+        time.sleep(0.3)
+        for status in ["processing", "complete"]:
+            requests.post(url, json={"id": request_id, "status": status})
+
+    def submit(handler, body):
+        request_id = next(counter)
+        url = json.loads(body).get("webhook_url")
+        if url and "no-callback" not in url:
+            threading.Thread(
+                target=call_back, args=(url, request_id), daemon=True
+            ).start()
+        return (200, {"id": request_id, "status": "pending"})
+
+    local_server.route("POST", "/skybox", submit)
+    local_server.route("GET", "/imagine/requests/*", [
+        (200, {"request": {"id": 0, "status": "complete"}})
+    ])
+    monkeypatch.setattr(
+        "llmmaster.skybox_models.SKYBOX_BASE_EP", local_server.url
+    )
+    return local_server
+
+
+@pytest.fixture
+def webhook():
+    server = WebhookServer(fallback_after=30.0)
+    yield server
+    server.close()
+
+
+def make_skybox(webhook: WebhookServer = None) -> SkyboxTextToPanorama:
+    instance = SkyboxTextToPanorama(
+        api_key="dummy", prompt="a beach", skybox_style_id=2
+    )
+    instance.webhook = webhook
+    return instance
+
+
+def test_callback_to_unknown_token(webhook) -> None:
+    webhook.register()
+    response = requests.post(webhook.url("unknown"), json={})
+    assert response.status_code == 404
+    response = requests.post(f"{webhook.base_url}/x", data="not json")
+    assert response.status_code == 400
+
+
+def test_run_completed_by_callback(skybox_server, webhook) -> None:
+    instance = make_skybox(webhook)
+    start = time.monotonic()
+    instance.run()
+    assert time.monotonic() - start < 2.0
+    assert instance.response["request"]["status"] == "complete"
+    assert skybox_server.count("GET", "/imagine/requests/1") == 0
+    assert instance.webhook_token not in webhook._inbox
+
+
+def test_master_completed_by_callback(skybox_server, webhook) -> None:
+    master = LLMMaster(executor="pool", webhook=webhook)
+    master.instances = {
+        f"skybox_{i:02d}": SkyboxTextToPanorama(
+            api_key="dummy", prompt="a beach", skybox_style_id=2
+        )
+        for i in range(10)
+    }
+    for instance in master.instances.values():
+        master._configure_instance(instance)
+    master.run()
+    assert master.elapsed_time < 2.0
+    for result in master.results.values():
+        assert result["request"]["status"] == "complete"
+    assert not [c for c in skybox_server.calls if c[0] == "GET"]
+
+
+def test_arun_completed_by_callback(skybox_server, webhook) -> None:
+    master = LLMMaster(launch_policy=LaunchPolicy(), webhook=webhook)
+    master.instances = {"skybox": make_skybox(webhook)}
+    asyncio.run(master.arun())
+    assert master.elapsed_time < 2.0
+    assert master.results["skybox"]["request"]["status"] == "complete"
+    assert skybox_server.count("GET", "/imagine/requests/1") == 0
+
+
+def test_polling_fallback(skybox_server) -> None:
+    webhook = WebhookServer(
+        public_url="http://127.0.0.1:9/no-callback", fallback_after=0.3
+    )
+    instance = make_skybox(webhook)
+    start = time.monotonic()
+    instance.run()
+    elapsed = time.monotonic() - start
+    assert 0.3 < elapsed < 2.0
+    assert instance.response["request"]["status"] == "complete"
+    assert skybox_server.count("GET", "/imagine/requests/1") == 1
+    webhook.close()